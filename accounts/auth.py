@@ -0,0 +1,33 @@
+# accounts/auth.py
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import User
+
+
+def resolve_login_user(login):
+    """
+    Email ba username (case-insensitive) diye user khuje ber kore, EK query te.
+    LOWER(email) / LOWER(username) functional index e match kore
+    (iexact er LIKE/UPPER() index use korte pare na).
+    Dutoi match korle ("@" thakle) email match age.
+    """
+    value = (login or "").strip().lower()
+    if not value:
+        return None
+
+    candidates = list(
+        User.objects.alias(email_lower=Lower("email"), username_lower=Lower("username"))
+        .filter(Q(email_lower=value) | Q(username_lower=value))[:2]
+    )
+    if not candidates:
+        return None
+    if "@" in value:
+        for user in candidates:
+            if user.email.lower() == value:
+                return user
+    for user in candidates:
+        if user.username.lower() == value:
+            return user
+    return candidates[0]
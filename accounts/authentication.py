@@ -0,0 +1,151 @@
+# accounts/authentication.py
+
+"""
+Stateless JWT authentication.
+
+Login e access token e `role`, `username`, `is_active` claim boshai
+(CustomTokenObtainPairSerializer.get_token). Request e token theke
+ClaimsUser banai -- IsAuthenticated / IsStaffOrReadOnly er jonno kono
+User query lage na.
+
+Puro User instance lagle (onno field, .profile ...) ClaimsUser nijei
+UserCache theke ane: per-process, TTL bounded, User save/delete e baad
+(accounts/signals.py).
+
+Claim e bhorsha shudhu token issue (iat) er por ACCOUNTS_CLAIMS_TRUST_SECONDS
+porjonto; tar por (ba claim chara purono token e) role/is_active UserCache
+er User theke. Tai demote / deactivate sorbochcho trust window +
+ACCOUNTS_USER_CACHE_TTL por sob process e dhora pore (ei process e save e
+cache baad, tokhoni) -- access token er 90 din na.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+CLAIMS = ("role", "username", "is_active")
+
+
+def claims_fresh(token):
+    """Token er claim ekhono bhorshajoggo? iat theke trust window er moddhe."""
+    iat = token.get("iat")
+    if iat is None:
+        return False
+    return time.time() - iat <= getattr(settings, "ACCOUNTS_CLAIMS_TRUST_SECONDS", 300)
+
+
+def add_user_claims(token, user):
+    for claim in CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class UserCache:
+    """Chhoto LRU + TTL, user id -> User."""
+
+    def __init__(self, ttl=None, max_size=None):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries = OrderedDict()  # pk -> (expires_at, user)
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "ACCOUNTS_USER_CACHE_TTL", 60)
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, "ACCOUNTS_USER_CACHE_SIZE", 1024)
+
+    def get(self, pk):
+        pk = str(pk)  # token e user_id string
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pk)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(pk)
+                user = entry[1]
+            else:
+                user = None
+        if user is None:
+            user = get_user_model()._default_manager.filter(pk=pk).first()
+            if user is None:
+                return None
+            with self._lock:
+                self._entries[pk] = (now + self.ttl, user)
+                self._entries.move_to_end(pk)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        # copy: request er bhitor set kora attribute/related cache onno request e na jay
+        return copy.copy(user)
+
+    def invalidate(self, pk):
+        with self._lock:
+            self._entries.pop(str(pk), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class ClaimsUser(TokenUser):
+    """
+    Token claim theke user. Claim e na thaka attribute puro User instance
+    theke (cache hoye) ase.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+    @cached_property
+    def instance(self):
+        user = user_cache.get(self.id)
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        return user
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr == "token":
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.instance, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        if claims_fresh(validated_token) and all(claim in validated_token for claim in CLAIMS):
+            user = ClaimsUser(validated_token)
+        else:
+            # claim purono (trust window par) ba nai: DB er bodole cache
+            user = user_cache.get(validated_token[api_settings.USER_ID_CLAIM])
+            if user is None:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
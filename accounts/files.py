@@ -0,0 +1,75 @@
+# accounts/files.py
+
+"""
+Purono media file delete request er baire.
+
+`delete_on_commit(name)` transaction commit er pore nam ta queue e dey
+(rollback hole file thake). Ekta background thread queue theke ek sathe
+joto gulo jome ache (FILE_CLEANUP_BATCH porjonto) tule delete kore -- request
+thread disk I/O te atke na.
+
+Process bondho hoye gele queue e pore thaka file theke jay (orphan), delete
+hoy na -- data haray na.
+"""
+
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class FileCleanupQueue:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def batch_size(self):
+        return getattr(settings, "FILE_CLEANUP_BATCH", 100)
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="file-cleanup", daemon=True
+                    )
+                    self._thread.start()
+
+    def put(self, name, storage=None):
+        self._ensure_worker()
+        self._queue.put((storage or default_storage, name))
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for storage, name in batch:
+                try:
+                    storage.delete(name)  # na thakle storage nijei ignore kore
+                except Exception:
+                    logger.exception("Could not delete %s", name)
+                finally:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Queue khali howa porjonto wait (test / shutdown)."""
+        self._queue.join()
+
+
+file_cleanup = FileCleanupQueue()
+
+
+def delete_on_commit(name, storage=None):
+    if name:
+        transaction.on_commit(lambda: file_cleanup.put(name, storage))
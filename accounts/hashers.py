@@ -0,0 +1,64 @@
+# accounts/hashers.py
+
+"""
+settings.PASSWORD_HASHING theke cost parameter pora hasher.
+Algorithm name same (scrypt / argon2 / pbkdf2_sha256), tai purono hash
+verify hoy; parameter ba preferred algorithm bodlale must_update() True
+dey ar login e hash notun policy te upgrade hoy.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+SCRYPT_MIN_MAXMEM = 256 * 1024 * 1024
+
+
+def _policy(name, key, default):
+    return getattr(settings, "PASSWORD_HASHING", {}).get(name, {}).get(key, default)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return _policy("scrypt", "work_factor", 2**14)
+
+    @property
+    def block_size(self):
+        return _policy("scrypt", "block_size", 8)
+
+    @property
+    def parallelism(self):
+        return _policy("scrypt", "parallelism", 1)
+
+    @property
+    def maxmem(self):
+        # shudhu upor seema, allocate kore na. OpenSSL default 32 MiB e boro
+        # work_factor fail kore; cost komale purono (boro) hash verify er
+        # jonno o jayga rakhi
+        return max(2 * 128 * self.work_factor * self.block_size * self.parallelism, SCRYPT_MIN_MAXMEM)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """argon2-cffi install thakle kaj kore."""
+
+    @property
+    def time_cost(self):
+        return _policy("argon2", "time_cost", 2)
+
+    @property
+    def memory_cost(self):
+        return _policy("argon2", "memory_cost", 102400)
+
+    @property
+    def parallelism(self):
+        return _policy("argon2", "parallelism", 8)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _policy("pbkdf2", "iterations", PBKDF2PasswordHasher.iterations)
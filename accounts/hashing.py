@@ -0,0 +1,62 @@
+"""
+Password hashing event loop / request thread er baire, bounded thread pool e.
+
+Login / register view coroutine (accounts/views.py): DB kaj sync_to_async e,
+hash/verify ekhane `await` kore. ASGI e shared sync thread ar event loop
+hash er somoy free thake -- onno sync view atke na. (Django r nijer
+`acheck_password` verify ta event loop ei chalay.)
+
+hashlib er pbkdf2/scrypt GIL chere dey, tai pool er N worker N core e
+cholte pare; ar login spike e eksathe N er beshi hash hoy na, baki request
+er jonno CPU thake (memory-hard scrypt e RAM o bound).
+
+Sync path (admin login, createsuperuser, shell) Django r default, pool chara:
+pool e pathiye `.result()` e bose thakle thread free hoy na, shudhu queue
+wait jog hoy.
+
+DB write (hash upgrade save) caller e, pool e na.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = getattr(settings, "PASSWORD_HASHING", {}).get("workers") or os.cpu_count() or 1
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+    return _executor
+
+
+def _verify(raw_password, encoded):
+    is_correct, must_update = verify_password(raw_password, encoded)
+    # upgrade hash o pool ei banai
+    new_hash = make_password(raw_password) if is_correct and must_update else None
+    return is_correct, new_hash
+
+
+async def ahash_password(raw_password):
+    return await asyncio.wrap_future(get_executor().submit(make_password, raw_password))
+
+
+async def acheck_password(user, raw_password):
+    """Verify + dorkar hole hash upgrade (notun policy), save caller e."""
+    is_correct, new_hash = await asyncio.wrap_future(
+        get_executor().submit(_verify, raw_password, user.password)
+    )
+    if new_hash:
+        user.password = new_hash
+        user._password = None
+        await user.asave(update_fields=["password"])
+    return is_correct
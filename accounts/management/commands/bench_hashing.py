@@ -0,0 +1,72 @@
+# accounts/management/commands/bench_hashing.py
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from accounts.hashers import (
+    TunedArgon2PasswordHasher,
+    TunedPBKDF2PasswordHasher,
+    TunedScryptPasswordHasher,
+)
+
+PASSWORD = "bench-pass-123"
+POLICIES = {
+    "pbkdf2": TunedPBKDF2PasswordHasher,
+    "scrypt": TunedScryptPasswordHasher,
+    "argon2": TunedArgon2PasswordHasher,
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark password verify (= login) throughput per hashing policy, serial vs pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=3.0, help="Run time per measurement.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            "--policy", action="append", choices=list(POLICIES),
+            help="Repeatable; default all installed.",
+        )
+
+    def handle(self, *args, **options):
+        cores = os.cpu_count() or 1
+        self.stdout.write(f"cores={cores} workers={options['workers']}")
+        for name in options["policy"] or list(POLICIES):
+            hasher = POLICIES[name]
+            try:
+                if hasher.library:
+                    hasher()._load_library()
+            except ValueError:
+                self.stdout.write(f"{name:<8} skipped (library not installed)")
+                continue
+            # ei policy preferred dhore hash/verify
+            path = f"{hasher.__module__}.{hasher.__name__}"
+            with override_settings(PASSWORD_HASHERS=[path]):
+                encoded = make_password(PASSWORD)
+                serial = self._measure(encoded, 1, options["seconds"])
+                pooled = self._measure(encoded, options["workers"], options["seconds"])
+            self.stdout.write(
+                f"{name:<8} serial={serial:7.1f}/s  pool={pooled:7.1f}/s  "
+                f"per core={pooled / cores:7.1f}/s  ({encoded.split('$', 2)[1]})"
+            )
+
+    def _measure(self, encoded, workers, seconds):
+        deadline = time.perf_counter() + seconds
+
+        def worker():
+            done = 0
+            while time.perf_counter() < deadline:
+                ok, _ = verify_password(PASSWORD, encoded)
+                assert ok
+                done += 1
+            return done
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            total = sum(f.result() for f in [pool.submit(worker) for _ in range(workers)])
+        return total / (time.perf_counter() - started)
@@ -0,0 +1,88 @@
+# accounts/management/commands/bench_login.py
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+
+PREFIX = "bench-login-"
+PASSWORD = "bench-pass-123"
+
+
+class Command(BaseCommand):
+    help = "Benchmark POST /api/accounts/login/ latency under concurrent requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--by", choices=["email", "username"], default="email",
+            help="Identifier sent in the login field.",
+        )
+
+    def handle(self, *args, **options):
+        users = self._create_users(options["users"])
+        try:
+            self._run(users, options)
+        finally:
+            User.objects.filter(username__startswith=PREFIX).delete()
+
+    def _create_users(self, count):
+        User.objects.filter(username__startswith=PREFIX).delete()
+        users = []
+        for i in range(count):
+            users.append(User.objects.create_user(
+                username=f"{PREFIX}{i}", email=f"{PREFIX}{i}@example.com", password=PASSWORD,
+            ))
+        return users
+
+    def _login(self, client, user, by):
+        # mixed case, jate case-insensitive path test hoy
+        login = (user.email if by == "email" else user.username).upper()
+        started = time.perf_counter()
+        response = client.post(
+            "/api/accounts/login/",
+            {"login": login, "password": PASSWORD},
+            content_type="application/json",
+            HTTP_HOST="localhost",
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise RuntimeError(f"login failed: {response.status_code} {response.content[:200]}")
+        return elapsed
+
+    def _run(self, users, options):
+        by = options["by"]
+        client = Client()
+
+        with CaptureQueriesContext(connection) as ctx:
+            self._login(client, users[0], by)
+        self.stdout.write(f"queries per login: {len(ctx.captured_queries)}")
+        for query in ctx.captured_queries:
+            self.stdout.write(f"  {query['sql'][:110]}")
+
+        def worker(i):
+            try:
+                return self._login(Client(), users[i % len(users)], by)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+            samples = sorted(pool.map(worker, range(options["requests"])))
+        wall = time.perf_counter() - started
+
+        p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+        self.stdout.write(
+            f"{len(samples)} logins, {options['threads']} threads: "
+            f"{len(samples) / wall:.1f} logins/sec, "
+            f"mean {statistics.mean(samples):.1f} ms, p50 {statistics.median(samples):.1f} ms, "
+            f"p95 {p95:.1f} ms"
+        )
@@ -0,0 +1,53 @@
+# accounts/management/commands/purge_expired_tokens.py
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding tokens (and their blacklist rows) in chunks. "
+        "Schedule it, e.g. daily from cron: manage.py purge_expired_tokens"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int,
+            default=getattr(settings, "ACCOUNTS_TOKEN_PURGE_CHUNK", 5000),
+        )
+        parser.add_argument(
+            "--pause", type=float, default=0.0,
+            help="Seconds to sleep between chunks, to leave room for other writers.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+        now = timezone.now()
+        total = chunks = 0
+        started = time.perf_counter()
+
+        while True:
+            # id order e: lifetime fixed, tai purono id agei expire kore
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by("id").values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            # chhoto transaction, lock beshikkhon dhore rakhi na
+            with transaction.atomic():
+                OutstandingToken.objects.filter(id__in=ids).delete()
+            total += len(ids)
+            chunks += 1
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {total} expired tokens in {chunks} chunks "
+            f"({time.perf_counter() - started:.2f}s)."
+        ))
@@ -1,12 +1,15 @@
 # accounts/models.py
 
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.utils import timezone
-from django.core.files.storage import default_storage
 
+from core.images import delete_with_variants_on_commit, generate_variants_on_commit
+
+from . import hashing
 from .constants import ROLE_CHOICES, DEFAULT_ROLE
-from .utils import generate_unique_slug
+from .utils import save_with_unique_slug
 
 
 class TimeStampedModel(models.Model):
@@ -18,7 +21,7 @@ class TimeStampedModel(models.Model):
 
 
 class UserManager(BaseUserManager):
-    def create_user(self, username, email, password=None, **extra_fields):
+    def create_user(self, username, email, password=None, encoded_password=None, **extra_fields):
         if not email:
             raise ValueError("Users must have an email address")
         if not username:
@@ -34,7 +37,11 @@ class UserManager(BaseUserManager):
             email=email,
             **extra_fields,
         )
-        user.set_password(password)
+        if encoded_password is not None:
+            # already hash kora (register er async path, accounts.hashing pool e)
+            user.password = encoded_password
+        else:
+            user.set_password(password)
         user.save(using=self._db)
         return user
 
@@ -67,9 +74,20 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    class Meta:
+        indexes = [
+            # login e case-insensitive lookup (accounts.auth.resolve_login_user)
+            models.Index(Lower("email"), name="user_email_lower_idx"),
+            models.Index(Lower("username"), name="user_username_lower_idx"),
+        ]
+
     def __str__(self):
         return self.email
 
+    # async verify event loop e na, accounts.hashing er pool e
+    async def acheck_password(self, raw_password):
+        return await hashing.acheck_password(self, raw_password)
+
 
 class UserProfile(TimeStampedModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
@@ -94,18 +112,25 @@ class UserProfile(TimeStampedModel):
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip() or self.user.username
 
-    def save(self, *args, **kwargs):
-        # Delete old image if replaced
-        if self.pk:
-            try:
-                old = UserProfile.objects.get(pk=self.pk)
-                if old.profile_picture and old.profile_picture != self.profile_picture:
-                    if default_storage.exists(old.profile_picture.path):
-                        default_storage.delete(old.profile_picture.path)
-            except UserProfile.DoesNotExist:
-                pass
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # load er somoy er picture, save e abar query na kore compare
+        instance._loaded_picture = instance.__dict__.get("profile_picture")
+        return instance
 
+    def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = generate_unique_slug(UserProfile, self.full_name)
-
-        super().save(*args, **kwargs)
+            save_with_unique_slug(self, self.full_name, super().save, *args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+
+        # Picture change: notun tar variant, purono + tar variant delete --
+        # commit er pore, background e
+        old = getattr(self, "_loaded_picture", None)
+        old_name = getattr(old, "name", old)
+        if (old_name or None) != (self.profile_picture.name or None):
+            generate_variants_on_commit(self.profile_picture)
+            if old_name:
+                delete_with_variants_on_commit(old_name, self.profile_picture.storage)
+        self._loaded_picture = self.profile_picture.name
@@ -1,22 +1,31 @@
 # accounts/serializers.py
 
-from rest_framework import serializers
-from django.contrib.auth import authenticate
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions, serializers
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_login_failed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .auth import resolve_login_user
+from .authentication import add_user_claims
 from .models import User, UserProfile
+from .tokens import RefreshToken
+from core.metrics import TimedSerializerMixin
+from core.serializers import ImageVariantsField
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email", "role", "date_joined"]
         read_only_fields = ["id", "date_joined", "role"]
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     profile_picture = serializers.ImageField(required=False, allow_null=True)
+    profile_picture_variants = ImageVariantsField(source="profile_picture")
 
     class Meta:
         model = UserProfile
@@ -26,6 +35,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "first_name",
             "last_name",
             "profile_picture",
+            "profile_picture_variants",
             "gender",
             "date_of_birth",
             "address",
@@ -41,7 +51,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ["slug", "created_at", "updated_at"]
 
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
     first_name = serializers.CharField(write_only=True, required=False, allow_blank=True)
     last_name = serializers.CharField(write_only=True, required=False, allow_blank=True)
@@ -54,10 +64,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         first_name = validated_data.pop("first_name", "")
         last_name = validated_data.pop("last_name", "")
 
+        # register view age thekei pool e hash kore dey (encoded_password)
         user = User.objects.create_user(
             username=validated_data["username"],
             email=validated_data["email"],
             password=validated_data["password"],
+            encoded_password=validated_data.get("encoded_password"),
         )
 
         UserProfile.objects.create(
@@ -80,6 +92,12 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
 
     login = serializers.CharField(write_only=True)
+    token_class = RefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        # role/username/is_active claim e -- request e User load lage na
+        return add_user_claims(super().get_token(user), user)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -87,30 +105,92 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         self.fields["email"].required = False
 
     def validate(self, attrs):
+        user = self.resolve_user(attrs)
+        # check_password hash purono hole nijei rehash kore save kore
+        if not user.check_password(attrs["password"]) or not api_settings.USER_AUTHENTICATION_RULE(user):
+            self.login_failed(attrs)
+        return self.token_data(user)
+
+    async def avalidate(self, data):
+        """
+        validate() er async rup (login view): hash verify accounts.hashing
+        pool e await, DB kaj sync_to_async e.
+        """
+        attrs = await sync_to_async(self.to_internal_value)(data)
+        user = await sync_to_async(self.resolve_user)(attrs)
+        if not await user.acheck_password(attrs["password"]) or not api_settings.USER_AUTHENTICATION_RULE(user):
+            await sync_to_async(self.login_failed)(attrs)
+        return await sync_to_async(self.token_data)(user)
+
+    def resolve_user(self, attrs):
         login = attrs.get("login")
         password = attrs.get("password")
 
         if not login or not password:
             raise serializers.ValidationError({"detail": "Login and password required."})
 
-        # Find user by email or username
-        user = None
-        if "@" in login:
-            user = User.objects.filter(email__iexact=login).first()
-        if user is None:
-            user = User.objects.filter(username__iexact=login).first()
+        # Email ba username, ek query te (parent authenticate() r abar load kore na)
+        user = resolve_login_user(login)
 
         if user is None:
             raise serializers.ValidationError({"detail": "Invalid credentials."})
+        return user
 
-        # set email in attrs so parent validate() can work normally
-        attrs["email"] = user.email
+    def login_failed(self, attrs):
+        user_login_failed.send(
+            sender=__name__,
+            credentials={"login": attrs.get("login")},
+            request=self.context.get("request"),
+        )
+        raise exceptions.AuthenticationFailed(
+            self.error_messages["no_active_account"],
+            "no_active_account",
+        )
 
-        # call parent to actually create tokens (it uses email + password)
-        data = super().validate(attrs)
+    def token_data(self, user):
+        # resolved user theke shoja token
+        self.user = user
+        refresh = self.get_token(user)
+        data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
 
         # include user info in response
-        from .serializers import UserSerializer  # avoid circular at top
         data["user"] = UserSerializer(user).data
 
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    POST /api/accounts/token/refresh/
+    Blacklist check in-memory set e (accounts/tokens.py); notun access
+    token e user er ekhonkar role/username/is_active claim.
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+
+        data = {"access": str(add_user_claims(refresh.access_token, user))}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
@@ -1,3 +1,461 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import IntegrityError, connection, connections
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.models import Category, Product
+from core.images import variant_name, variant_pool
+
+from . import utils
+from .files import file_cleanup
+from .authentication import ClaimsUser, user_cache
+from .constants import ROLE_CUSTOMER, ROLE_STAFF
+from .models import User, UserProfile
+from .tokens import RefreshToken, blacklist_cache
+
+
+class SlugAllocationTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Fever")
+
+    def make(self, name, **extra):
+        return Product.objects.create(category=self.category, name=name, price=Decimal("1"), **extra)
+
+    def test_collisions_get_deterministic_numeric_suffixes(self):
+        slugs = [self.make("Paracetamol 500mg").slug for _ in range(3)]
+        self.assertEqual(slugs, ["paracetamol-500mg", "paracetamol-500mg-2", "paracetamol-500mg-3"])
+
+    def test_single_allocation_is_one_query(self):
+        self.make("Napa")
+        self.make("Napa")
+        with self.assertNumQueries(1):
+            self.assertEqual(utils.generate_unique_slug(Product, "Napa"), "napa-3")
+
+    def test_batch_allocation_is_one_query_and_unique_within_batch(self):
+        self.make("Napa")
+        self.make("Napa Extend", slug="napa-extend")
+        with self.assertNumQueries(1):
+            slugs = utils.allocate_unique_slugs(Product, ["Napa", "Napa", "Ace", "Napa Extend"])
+        self.assertEqual(slugs, ["napa-2", "napa-3", "ace", "napa-extend-2"])
+
+    def test_slug_is_truncated_to_field_length(self):
+        slug = utils.generate_unique_slug(Category, "x" * 500)
+        self.assertLessEqual(len(slug) + utils.SLUG_SUFFIX_ROOM, 160)
+
+    def test_save_retries_when_a_concurrent_writer_takes_the_slug(self):
+        self.make("Seclo")
+        real = utils.allocate_unique_slugs
+        calls = []
+
+        def stale_allocator(model, values, slug_field_name="slug"):
+            calls.append(values)
+            # prothom bar onno writer er moto, already-taken slug dei
+            return ["seclo"] if len(calls) == 1 else real(model, values, slug_field_name)
+
+        with mock.patch.object(utils, "allocate_unique_slugs", side_effect=stale_allocator):
+            product = self.make("Seclo")
+        self.assertEqual(product.slug, "seclo-2")
+        self.assertEqual(len(calls), 2)
+
+    def test_unrelated_integrity_errors_are_not_retried(self):
+        with self.assertRaises(IntegrityError):
+            Category.objects.create(name="Fever")
+
+
+class LoginTests(TestCase):
+    url = "/api/accounts/login/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user("Rahim", "Rahim@Example.com", "s3cret-pass")
+
+    def login(self, login, password="s3cret-pass"):
+        return self.client.post(self.url, {"login": login, "password": password}, format="json")
+
+    def test_login_with_email_or_username_any_case(self):
+        for login in ("rahim@example.com", "RAHIM@EXAMPLE.COM", "rahim", "RaHiM"):
+            response = self.login(login)
+            self.assertEqual(response.status_code, 200, login)
+            self.assertEqual(response.data["user"]["id"], self.user.id)
+            self.assertIn("access", response.data)
+            self.assertIn("refresh", response.data)
+
+    def test_single_user_lookup(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.login("rahim").status_code, 200)
+        user_selects = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and '"accounts_user"' in q["sql"]
+        ]
+        self.assertEqual(len(user_selects), 1, user_selects)
+
+    def test_email_match_wins_over_username_match(self):
+        other = User.objects.create_user("rahim@example.org", "other@example.com", "pw-other-1")
+        User.objects.filter(pk=self.user.pk).update(email="rahim@example.org")
+        response = self.login("rahim@example.org")
+        self.assertEqual(response.data["user"]["id"], self.user.id)
+        self.assertNotEqual(other.id, self.user.id)
+
+    def test_bad_credentials(self):
+        self.assertEqual(self.login("nobody").status_code, 400)
+        self.assertEqual(self.login("rahim", "wrong").status_code, 401)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login("rahim").status_code, 401)
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user("karim", "karim@example.com", "s3cret-pass")
+
+    def login(self):
+        return self.client.post(
+            "/api/accounts/login/", {"login": "karim", "password": "s3cret-pass"}, format="json"
+        )
+
+    def test_new_passwords_use_preferred_hasher(self):
+        self.assertEqual(identify_hasher(self.user.password).algorithm, "scrypt")
+        self.assertTrue(self.user.check_password("s3cret-pass"))
+        self.assertFalse(self.user.check_password("wrong"))
+
+    def test_legacy_hash_upgraded_on_login(self):
+        legacy = make_password("s3cret-pass", hasher="pbkdf2_sha1")
+        User.objects.filter(pk=self.user.pk).update(password=legacy)
+
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, "scrypt")
+        self.assertTrue(self.user.check_password("s3cret-pass"))
+
+    def test_cost_change_triggers_rehash(self):
+        old = self.user.password
+        policy = {"scrypt": {"work_factor": 2 ** 12, "block_size": 8, "parallelism": 1}}
+        with override_settings(PASSWORD_HASHING=policy):
+            self.assertEqual(self.login().status_code, 200)
+            self.user.refresh_from_db()
+            self.assertNotEqual(self.user.password, old)
+            self.assertIn("$4096$", self.user.password)
+
+    def test_failed_login_keeps_hash(self):
+        legacy = make_password("s3cret-pass", hasher="pbkdf2_sha1")
+        User.objects.filter(pk=self.user.pk).update(password=legacy)
+        self.client.post(
+            "/api/accounts/login/", {"login": "karim", "password": "wrong"}, format="json"
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, legacy)
+
+    def test_login_and_register_hash_in_pool(self):
+        import threading
+        from asgiref.sync import iscoroutinefunction
+        from django.urls import resolve
+        from . import hashing
+
+        threads = []
+
+        def record(func):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.current_thread().name)
+                return func(*args, **kwargs)
+            return wrapper
+
+        for url in ("/api/accounts/login/", "/api/accounts/register/"):
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+        with mock.patch.object(hashing, "verify_password", record(hashing.verify_password)), \
+                mock.patch.object(hashing, "make_password", record(hashing.make_password)):
+            self.assertEqual(self.login().status_code, 200)
+            response = self.client.post("/api/accounts/register/", {
+                "username": "salma", "email": "salma@example.com", "password": "s3cret-pass",
+            }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(name.startswith("pwhash") for name in threads), threads)
+        self.assertTrue(User.objects.get(username="salma").check_password("s3cret-pass"))
+
+    async def test_async_check_runs_in_pool(self):
+        user = await User.objects.aget(pk=self.user.pk)
+        self.assertTrue(await user.acheck_password("s3cret-pass"))
+        self.assertFalse(await user.acheck_password("wrong"))
+
+
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.staff = User.objects.create_user("staffer", "staff@example.com", "s3cret-pass", role=ROLE_STAFF)
+        UserProfile.objects.create(user=self.staff, first_name="Staff")
+        response = self.client.post(
+            "/api/accounts/login/", {"login": "staffer", "password": "s3cret-pass"}, format="json"
+        )
+        self.access = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def user_selects(self, ctx):
+        return [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and q["sql"].split(" WHERE")[0].endswith('"accounts_user"')
+        ]
+
+    def test_token_carries_claims(self):
+        token = AccessToken(self.access)
+        self.assertEqual(token["role"], ROLE_STAFF)
+        self.assertEqual(token["username"], "staffer")
+        self.assertTrue(token["is_active"])
+
+    def test_staff_write_without_user_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                "/api/catalog/categories/", {"name": "Vitamins"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.user_selects(ctx), [])
+
+    def test_profile_me_single_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/accounts/profile/me/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user"]["username"], "staffer")
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_non_claim_attribute_uses_user_cache(self):
+        user = ClaimsUser(AccessToken(self.access))
+        self.assertEqual(user.role, ROLE_STAFF)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(user.email, "staff@example.com")
+            self.assertEqual(ClaimsUser(AccessToken(self.access)).email, "staff@example.com")
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        self.staff.email = "new@example.com"
+        self.staff.save()
+        self.assertEqual(ClaimsUser(AccessToken(self.access)).email, "new@example.com")
+
+    def test_inactive_claim_rejected(self):
+        token = AccessToken.for_user(self.staff)
+        token["role"], token["username"], token["is_active"] = ROLE_STAFF, "staffer", False
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.get("/api/accounts/profile/me/").status_code, 401)
+
+    def stale_token(self):
+        # trust window er ager issue kora, login er moto claim soho
+        token = AccessToken(self.access)
+        token["iat"] = int(time.time()) - 3600
+        return str(token)
+
+    def test_stale_claims_of_demoted_user_are_not_trusted(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.stale_token()}")
+        User.objects.filter(pk=self.staff.pk).update(role=ROLE_CUSTOMER)
+        user_cache.clear()
+        response = self.client.post("/api/catalog/categories/", {"name": "Vitamins"}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_stale_claims_of_deactivated_user_are_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.stale_token()}")
+        self.staff.is_active = False
+        self.staff.save()
+        self.assertEqual(self.client.get("/api/accounts/profile/me/").status_code, 401)
+
+    def test_token_without_claims_falls_back_to_cache(self):
+        token = AccessToken.for_user(self.staff)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.get("/api/accounts/profile/me/").status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get("/api/accounts/profile/me/").status_code, 200)
+        self.assertEqual(self.user_selects(ctx), [])
+
+
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        blacklist_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user("jamal", "jamal@example.com", "s3cret-pass")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/accounts/login/", {"login": "jamal", "password": "s3cret-pass"}, format="json"
+            )
+        self.access, self.refresh = response.data["access"], response.data["refresh"]
+
+    def do_refresh(self, refresh=None):
+        return self.client.post(
+            "/api/accounts/token/refresh/", {"refresh": refresh or self.refresh}, format="json"
+        )
+
+    def blacklist_queries(self, ctx):
+        return [q["sql"] for q in ctx.captured_queries if "token_blacklist_blacklistedtoken" in q["sql"]]
+
+    def test_logout_blocks_refresh(self):
+        self.assertEqual(self.do_refresh().status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/accounts/logout/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(self.do_refresh().status_code, 401)
+
+    def test_refresh_skips_blacklist_table_once_loaded(self):
+        self.do_refresh()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.do_refresh().status_code, 200)
+        self.assertEqual(self.blacklist_queries(ctx), [])
+
+    @override_settings(ACCOUNTS_BLACKLIST_SYNC_SECONDS=0)
+    def test_blacklist_from_other_process_picked_up_by_delta(self):
+        self.do_refresh()
+        # signal chara insert = onno process er logout
+        token = OutstandingToken.objects.get(jti=RefreshToken(self.refresh)["jti"])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token)])
+        self.assertEqual(self.do_refresh().status_code, 401)
+
+    @override_settings(ACCOUNTS_BLACKLIST_SYNC_SECONDS=0)
+    def test_late_commit_with_lower_id_is_picked_up(self):
+        # Postgres: id 400 er transaction, id 500 er porer commit hoy
+        other = RefreshToken.for_user(self.user)
+        other_row = OutstandingToken.objects.get(jti=other["jti"])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(id=500, token=other_row)])
+        self.assertEqual(self.do_refresh().status_code, 200)
+
+        token = OutstandingToken.objects.get(jti=RefreshToken(self.refresh)["jti"])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(id=400, token=token)])
+        self.assertEqual(self.do_refresh().status_code, 401)
+
+    def test_refreshed_access_gets_current_claims(self):
+        User.objects.filter(pk=self.user.pk).update(role=ROLE_STAFF)
+        access = AccessToken(self.do_refresh().data["access"])
+        self.assertEqual(access["role"], ROLE_STAFF)
+
+    def test_purge_expired_tokens(self):
+        past = timezone.now() - timezone.timedelta(days=1)
+        for i in range(5):
+            token = OutstandingToken.objects.create(jti=f"old-{i}", token="x", expires_at=past)
+            BlacklistedToken.objects.create(token=token)
+        call_command("purge_expired_tokens", chunk_size=2, stdout=io.StringIO())
+        self.assertFalse(OutstandingToken.objects.filter(jti__startswith="old-").exists())
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+        self.assertTrue(OutstandingToken.objects.filter(jti=RefreshToken(self.refresh)["jti"]).exists())
+
+
+def make_image(name="pic.png", size=(8, 8), fmt="PNG"):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, fmt)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f"image/{fmt.lower()}")
+
+
+class ProfilePictureTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user("nadia", "nadia@example.com", "s3cret-pass")
+        self.profile = UserProfile.objects.create(user=self.user, first_name="Nadia")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def patch(self, data, fmt="multipart"):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch("/api/accounts/profile/me/", data, format=fmt)
+        variant_pool.wait()
+        file_cleanup.flush()
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_replaced_picture_deleted_after_commit(self):
+        self.patch({"profile_picture": make_image("one.png")})
+        first = UserProfile.objects.get(pk=self.profile.pk).profile_picture.path
+        self.assertTrue(os.path.exists(first))
+
+        self.patch({"profile_picture": make_image("two.png")})
+        second = UserProfile.objects.get(pk=self.profile.pk).profile_picture.path
+        self.assertFalse(os.path.exists(first))
+        self.assertFalse(os.path.exists(variant_name(first, "thumb")))
+        self.assertTrue(os.path.exists(second))
+
+    def test_upload_generates_webp_variants(self):
+        from PIL import Image
+
+        response = self.patch({"profile_picture": make_image("big.jpg", size=(1600, 1200), fmt="JPEG")})
+        path = UserProfile.objects.get(pk=self.profile.pk).profile_picture.path
+        with Image.open(variant_name(path, "thumb")) as thumb:
+            self.assertEqual(thumb.format, "WEBP")
+            self.assertEqual(max(thumb.size), 200)
+        with Image.open(variant_name(path, "medium")) as medium:
+            self.assertEqual(medium.size, (800, 600))
+        # PATCH er response variant banar age: original
+        self.assertEqual(
+            response.data["profile_picture_variants"]["thumb"], response.data["profile_picture"]
+        )
+        variants = self.client.get("/api/accounts/profile/me/").data["profile_picture_variants"]
+        self.assertTrue(variants["thumb"].endswith(".thumb.webp"))
+
+    def test_backfill_command(self):
+        self.patch({"profile_picture": make_image("one.png")})
+        path = UserProfile.objects.get(pk=self.profile.pk).profile_picture.path
+        os.remove(variant_name(path, "thumb"))
+        out = io.StringIO()
+        call_command("generate_image_variants", "--source", "profile", "--workers", "2", stdout=out)
+        self.assertTrue(os.path.exists(variant_name(path, "thumb")))
+        self.assertIn("1 variants written", out.getvalue())
+
+    def test_save_without_picture_change_no_extra_query(self):
+        self.patch({"profile_picture": make_image("one.png")})
+        with CaptureQueriesContext(connection) as ctx:
+            self.patch({"bio": "hello"}, fmt="json")
+        profile_selects = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and "accounts_userprofile" in q["sql"]
+        ]
+        self.assertEqual(len(profile_selects), 1, profile_selects)
+        self.assertTrue(os.path.exists(UserProfile.objects.get(pk=self.profile.pk).profile_picture.path))
+
+    def test_rollback_keeps_old_file(self):
+        self.patch({"profile_picture": make_image("one.png")})
+        profile = UserProfile.objects.get(pk=self.profile.pk)
+        old = profile.profile_picture.path
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            profile.profile_picture = make_image("two.png")
+            profile.save()
+        self.assertTrue(callbacks)  # commit na hole delete hoy na
+        self.assertTrue(os.path.exists(old))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ProfileReplicaTests(TestCase):
+    # replica mirror alada connection, TestCase er uncommitted row dekhe na
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("nadia", "nadia@example.com", "s3cret-pass")
+        self.profile = UserProfile.objects.create(user=self.user, first_name="Nadia")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_public_profile_reads_replica_until_own_write(self):
+        url = f"/api/accounts/profile/{self.profile.slug}/"
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            self.assertEqual(APIClient().get(url).status_code, 404)  # replica e ekhono nai
+        self.assertEqual(len(replica), 1)
+
+        response = self.client.patch("/api/accounts/profile/me/", {"first_name": "Nadia R"})
+        self.assertEqual(response.status_code, 200)
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.get(url)
+        self.assertEqual((response.status_code, response.data["first_name"], len(replica)), (200, "Nadia R", 0))
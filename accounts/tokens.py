@@ -0,0 +1,108 @@
+# accounts/tokens.py
+
+"""
+Refresh token + in-memory blacklist.
+
+simplejwt protita refresh e BlacklistedToken JOIN OutstandingToken query
+kore. Ekhane blacklisted jti gulo ekta set e (shudhu jegulo ekhono expire
+hoy ni -- expired token emnitei reject hoy). Set prothom check e load hoy,
+tarpor:
+  - ei process e blacklist -> commit e set e add (signals.py)
+  - onno process er blacklist -> protiti ACCOUNTS_BLACKLIST_SYNC_SECONDS
+    por por `id > last_id - ACCOUNTS_BLACKLIST_SYNC_OVERLAP` delta query
+    (PK range, table size er upor nirbhor kore na)
+  - ACCOUNTS_BLACKLIST_RELOAD_SECONDS por por puro reload
+
+Overlap keno: Postgres e id insert er somoy ashe, commit pore. Boro id
+ta age commit hole delta `id > last_id` chhoto id er row (pore commit)
+kokhono dekhto na. Overlap window er moddhe pore abar pora hoy; tar
+cheye o deri hole (khub lomba transaction) full reload dhore.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+
+class BlacklistCache:
+    def __init__(self):
+        self._jtis = set()
+        self._last_id = None  # None = ekhono load hoy ni
+        self._synced_at = 0.0
+        self._rebuilt_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def sync_seconds(self):
+        return getattr(settings, "ACCOUNTS_BLACKLIST_SYNC_SECONDS", 5)
+
+    @property
+    def overlap(self):
+        return getattr(settings, "ACCOUNTS_BLACKLIST_SYNC_OVERLAP", 1000)
+
+    @property
+    def reload_seconds(self):
+        return getattr(settings, "ACCOUNTS_BLACKLIST_RELOAD_SECONDS", 600)
+
+    def _rows(self, queryset):
+        return queryset.order_by("id").values_list("id", "token__jti")
+
+    def rebuild(self):
+        rows = self._rows(BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()))
+        jtis, last_id = set(), 0
+        for pk, jti in rows.iterator():
+            jtis.add(jti)
+            last_id = pk
+        # expired gulo set e na, kintu delta sekhan theke shuru na hoy
+        last_id = max(last_id, BlacklistedToken.objects.order_by("-id").values_list("id", flat=True).first() or 0)
+        with self._lock:
+            self._jtis = jtis
+            self._last_id = last_id
+            self._synced_at = self._rebuilt_at = time.monotonic()
+
+    def sync(self):
+        now = time.monotonic()
+        if self._last_id is None or now - self._rebuilt_at >= self.reload_seconds:
+            return self.rebuild()
+        if now - self._synced_at < self.sync_seconds:
+            return
+        # set e add idempotent, tai overlap er row abar porle somossa nai
+        since = max(self._last_id - self.overlap, 0)
+        rows = list(self._rows(BlacklistedToken.objects.filter(id__gt=since)))
+        with self._lock:
+            for pk, jti in rows:
+                self._jtis.add(jti)
+                self._last_id = max(self._last_id, pk)
+            self._synced_at = now
+
+    def add(self, jti):
+        with self._lock:
+            self._jtis.add(jti)
+
+    def contains(self, jti):
+        self.sync()
+        return jti in self._jtis
+
+    def clear(self):
+        with self._lock:
+            self._jtis = set()
+            self._last_id = None
+
+    def __len__(self):
+        return len(self._jtis)
+
+
+blacklist_cache = BlacklistCache()
+
+
+class RefreshToken(BaseRefreshToken):
+    def check_blacklist(self):
+        if blacklist_cache.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
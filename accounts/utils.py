@@ -2,21 +2,92 @@
 
 import random
 import string
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.utils.text import slugify
 
+# "-" + numeric suffix er jonno jayga rakhi
+SLUG_SUFFIX_ROOM = 8
+# ek query te koyta base slug er OR (SQLite variable limit er niche)
+SLUG_LOOKUP_BATCH = 200
+
 
 def generate_random_string(length=6):
     return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
 
 
+def _base_slug(value, max_length):
+    base = slugify(value or "")
+    if max_length:
+        base = base[:max_length - SLUG_SUFFIX_ROOM].strip("-")
+    return base or generate_random_string(6)
+
+
+def allocate_unique_slugs(model, values, slug_field_name='slug'):
+    """
+    `values` er protita r jonno unique slug, sob mile ek query te
+    (SLUG_LOOKUP_BATCH er beshi alada base hole batch e).
+
+    Existing "<base>" / "<base>-<n>" gulo ene numeric suffix beche nei:
+      paracetamol-500mg, paracetamol-500mg-2, paracetamol-500mg-3 ...
+    `values` er bhitor duplicate thakle o alada slug pay.
+    """
+    max_length = model._meta.get_field(slug_field_name).max_length
+    bases = [_base_slug(value, max_length) for value in values]
+    unique_bases = sorted(set(bases))
+
+    taken = set()
+    for i in range(0, len(unique_bases), SLUG_LOOKUP_BATCH):
+        batch = unique_bases[i:i + SLUG_LOOKUP_BATCH]
+        condition = reduce(or_, (
+            Q(**{slug_field_name: b}) | Q(**{f"{slug_field_name}__startswith": f"{b}-"})
+            for b in batch
+        ))
+        taken.update(model.objects.filter(condition).values_list(slug_field_name, flat=True))
+
+    # ek pass e protita base er sob theke boro numeric suffix
+    next_suffix = dict.fromkeys(unique_bases, 2)
+    for slug in taken:
+        prefix, _, suffix = slug.rpartition("-")
+        if suffix.isdigit() and prefix in next_suffix:
+            next_suffix[prefix] = max(next_suffix[prefix], int(suffix) + 1)
+
+    slugs = []
+    for base in bases:
+        if base not in taken:
+            slug = base
+        else:
+            slug = f"{base}-{next_suffix[base]}"
+            next_suffix[base] += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
 def generate_unique_slug(model, field_value, slug_field_name='slug'):
     """
     Generate unique slug for given model+field.
     """
-    base_slug = slugify(field_value) or generate_random_string(6)
-    slug = base_slug
+    return allocate_unique_slugs(model, [field_value], slug_field_name)[0]
 
-    while model.objects.filter(**{slug_field_name: slug}).exists():
-        slug = f"{base_slug}-{generate_random_string(4)}"
 
-    return slug
+def save_with_unique_slug(instance, field_value, save, *args, slug_field_name='slug', attempts=3, **kwargs):
+    """
+    Slug allocate kore save kore. Concurrent write e onno keu eki slug age
+    niye nile IntegrityError -- tokhon notun slug niye abar chesta.
+    """
+    model = type(instance)
+    for attempt in range(attempts):
+        slug = generate_unique_slug(model, field_value, slug_field_name)
+        setattr(instance, slug_field_name, slug)
+        try:
+            with transaction.atomic(using=kwargs.get("using")):
+                return save(*args, **kwargs)
+        except IntegrityError:
+            setattr(instance, slug_field_name, None)
+            slug_taken = model._default_manager.filter(**{slug_field_name: slug}).exists()
+            if not slug_taken or attempt == attempts - 1:
+                raise
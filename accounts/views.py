@@ -1,34 +1,85 @@
 # accounts/views.py
 
-from rest_framework import generics, permissions
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .serializers import (
     RegisterSerializer,
     UserProfileSerializer,
     CustomTokenObtainPairSerializer,
 )
+from .hashing import ahash_password
 from .models import UserProfile
+from .tokens import RefreshToken
+from core.db import ReplicaReadMixin
+
 
+class AsyncPasswordView(APIView):
+    """
+    Password hash kora view (login / register), coroutine hisebe.
 
-class RegisterView(generics.CreateAPIView):
+    DRF 3.16 e async view nai, tai dispatch ta ekhane: auth/permission/
+    throttle sync_to_async e, handler coroutine. Handler DB kaj
+    sync_to_async e kore ar hash `await` kore accounts.hashing er pool e --
+    ASGI e shared sync thread / event loop hash er somoy atke na.
+    """
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class RegisterView(AsyncPasswordView, generics.CreateAPIView):
     """
     POST /api/accounts/register/
     """
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
 
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        encoded = await ahash_password(serializer.validated_data["password"])
+        await sync_to_async(serializer.save)(encoded_password=encoded)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-class CustomTokenObtainPairView(TokenObtainPairView):
+
+class CustomTokenObtainPairView(AsyncPasswordView, TokenObtainPairView):
     """
     POST /api/accounts/login/
     body: {"login": "<email or username>", "password": "..."}
     """
     serializer_class = CustomTokenObtainPairSerializer
 
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        return Response(await serializer.avalidate(request.data), status=status.HTTP_200_OK)
+
 
 class LogoutView(APIView):
     """
@@ -56,10 +107,13 @@ class MeProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user.profile
+        # user row alada load na kore profile + user ek query te
+        return generics.get_object_or_404(
+            UserProfile.objects.select_related("user"), user_id=self.request.user.pk
+        )
 
 
-class ProfileDetailView(generics.RetrieveAPIView):
+class ProfileDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
     """
     GET /api/accounts/profile/<slug>/
     slug based profile detail (public view)
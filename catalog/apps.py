@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search_index(sender, using, **kwargs):
+    # migration e table remake hole SQLite trigger hariye jay, abar boshai
+    from django.db import connections
+    from .search import install
+
+    install(connections[using])
 
 
 class CatalogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'catalog'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+
+        post_migrate.connect(install_search_index, sender=self)
@@ -0,0 +1,110 @@
+# catalog/async_views.py
+
+"""
+Async (ASGI) read endpoint, /api/catalog/async/...
+
+Sync viewset ASGI te chalale puro request (DB, serialize, slow client e
+response lekha) ekta thread dhore rakhe. Ekhane view coroutine: row ase
+`aiterator(chunk_size=...)` / `aget()` diye -- queryset er prefetch_related
+(images) Django nijei protita chunk er sathe oi thread hop e chalay, alada
+`aprefetch_related_objects` lage na. Serializer already-loaded object theke
+dict banay (DB hit nai), kintu image variant URL e storage stat lagte pare
+(core/images.py), tai serialize shared sync thread na, executor thread e.
+
+Read replica: sync viewset er ReplicaReadMixin er moto -- GET e pinned user
+chara replica; context var sync_to_async er ORM thread e o jay.
+
+Filter, sparse field, compact view, keyset cursor -- sob sync viewset er
+code ei (get_queryset / get_serializer reuse), tai payload eki.
+Response cache / ETag ei path e nai.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.renderers import JSONRenderer
+
+from core.db import start_replica_reads, stop_replica_reads, use_replica
+
+from .models import Product
+from .views import CategoryViewSet, DisplayedCategoryViewSet, ProductViewSet
+
+
+def _json(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+async def _viewset(viewset_class, request, action, **kwargs):
+    # viewset shudhu queryset/serializer/paginator banate; dispatch kori na
+    view = viewset_class(action_map={"get": action, "head": action}, args=(), kwargs=kwargs)
+    # authenticator soho (pinned JWT user er jonno)
+    view.request = view.initialize_request(request)
+    view.format_kwarg = None
+    # user cache / pin cache lookup, tai thread e
+    if await sync_to_async(use_replica)(view.request):
+        request._replica_token = start_replica_reads()
+    return view
+
+
+async def _serialize(view, instance, many=False):
+    return await sync_to_async(
+        lambda: view.get_serializer(instance, many=many).data, thread_sensitive=False
+    )()
+
+
+def api_view(func):
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return _json({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+        try:
+            return await func(request, *args, **kwargs)
+        except APIException as exc:
+            return _json({"detail": exc.detail} if isinstance(exc.detail, str) else exc.detail,
+                         status=exc.status_code)
+        finally:
+            token = getattr(request, "_replica_token", None)
+            if token is not None:
+                stop_replica_reads(token)
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+async def _paginated(view):
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    page = None
+    if paginator is not None:
+        page = await paginator.apaginate_queryset(queryset, view.request, view)
+    if page is None:
+        items = [obj async for obj in queryset.aiterator(chunk_size=200)]
+        return await _serialize(view, items, many=True)
+    return paginator.get_paginated_response(await _serialize(view, page, many=True)).data
+
+
+@api_view
+async def product_list(request):
+    """GET /api/catalog/async/products/ -- /products/ er same params."""
+    return _json(await _paginated(await _viewset(ProductViewSet, request, "list")))
+
+
+@api_view
+async def product_detail(request, slug):
+    """GET /api/catalog/async/products/<slug>/"""
+    view = await _viewset(ProductViewSet, request, "retrieve", slug=slug)
+    try:
+        product = await view.get_queryset().aget(slug=slug)
+    except Product.DoesNotExist:
+        raise NotFound("No Product matches the given query.")
+    return _json(await _serialize(view, product))
+
+
+@api_view
+async def category_list(request):
+    """GET /api/catalog/async/categories/"""
+    return _json(await _paginated(await _viewset(CategoryViewSet, request, "list")))
+
+
+@api_view
+async def home_category_list(request):
+    """GET /api/catalog/async/home-categories/"""
+    return _json(await _paginated(await _viewset(DisplayedCategoryViewSet, request, "list")))
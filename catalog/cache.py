@@ -0,0 +1,165 @@
+# catalog/cache.py
+
+"""
+Read-only catalog endpoint er response cache.
+
+Key = generation + host + path + sorted query params. Catalog er kono
+model change hole (signals.py) generation bump hoy, tai purono sob key
+eksathe invalid -- delete_pattern lagbe na, locmem/file dutoi chole.
+
+Detail request er key e object version o thake (object_version): stock er
+moto field change e shudhu oi object er detail entry baad, puro catalog na.
+
+Backend: settings.CACHES["catalog"] (CATALOG_CACHE_BACKEND = locmem | file)
+  - locmem: generation process er memory te, tai shudhu ek process (runserver,
+    ek worker). Onek worker e ek worker er bump onno worker jane na, tara
+    purono data serve kore -- WEB_CONCURRENCY > 1 hole check warning dey.
+  - file: sob worker share kore. Bump incr (read + write) na kore protibar
+    notun unique value set kore, tai duto process eksathe bump korleo dujon
+    alada generation pay; ekta bump "haray" na.
+
+Read replica: bump er pore miss hole view replica theke pore, replica
+ekhono purono hote pare -- sei body/ETag notun generation e TTL porjonto
+thakto (pinned user o oi HIT pabe). Tai replica read hole generation /
+object version DATABASE_REPLICA_LAG_SECONDS er cheye notun hole store kori
+na (cache_fill_allowed). Primary read (pinned user, replica nai) sob somoy
+store.
+"""
+
+import hashlib
+import random
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from core.db import reading_replica
+from core.metrics import RESPONSE_CACHE
+
+CACHE_ALIAS = "catalog"
+GENERATION_KEY = "catalog:generation"
+VERSION_KEY = "catalog:version:%s:%s"  # model label, lookup value
+DEFAULT_TIMEOUT = 60 * 10
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def current_generation():
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # evict hoye gele 1 theke shuru korle purono key abar match korte pare,
+        # tai time based seed
+        generation = _new_generation()
+        cache.add(GENERATION_KEY, generation, timeout=None)
+        generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def _new_generation():
+    # microsecond time + random, onno process er bump er sathe mile na;
+    # value (~ns) thekei kokhon banano jana jay (_settled)
+    return time.time_ns() // 1000 * 1000 + random.randrange(1000)
+
+
+def _settled(value):
+    """Generation / version replica lag window er age banano?"""
+    lag = getattr(settings, "DATABASE_REPLICA_LAG_SECONDS", 10)
+    return time.time_ns() - value >= lag * 1_000_000_000
+
+
+def cache_fill_allowed(version=None):
+    if not reading_replica():
+        return True
+    return _settled(current_generation()) and (version is None or _settled(version))
+
+
+def bump_generation():
+    """
+    Notun generation. Read-modify-write nai: file backend e incr = get + set,
+    duto process eksathe incr korle dujon e same value likhto, majhe fill hoya
+    stale entry notun generation e theke jeto.
+    """
+    generation = _new_generation()
+    get_cache().set(GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def object_version(label, lookup):
+    cache = get_cache()
+    key = VERSION_KEY % (label, lookup)
+    version = cache.get(key)
+    if version is None:
+        # generation er moto: evict hole notun seed, purono entry match kore na
+        cache.add(key, _new_generation(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_object_versions(label, lookups):
+    get_cache().set_many(
+        {VERSION_KEY % (label, lookup): _new_generation() for lookup in lookups}, timeout=None
+    )
+
+
+def _count(request, result):
+    # process local counter, /api/metrics/ e; cache e rakhle locmem e onno
+    # process dekhe na ar file e protita GET e disk write
+    match = request.resolver_match
+    RESPONSE_CACHE.inc((match.view_name if match else "unmatched", result))
+
+
+def request_cache_key(request, prefix="response", version=None):
+    params = sorted(
+        (k, v) for k, values in request.query_params.lists() for v in values
+    )
+    raw = f"{request.get_host()}|{request.path}|{urlencode(params)}|{version}"
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"catalog:{prefix}:{current_generation()}:{digest}"
+
+
+class CachedResponseMixin:
+    """
+    ViewSet er list/retrieve GET response data cache kore.
+    Response header e X-Cache: HIT / MISS; count /api/metrics/ e
+    (http_response_cache_total).
+    """
+    cache_timeout = DEFAULT_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(request, super().list, False, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(request, super().retrieve, True, *args, **kwargs)
+
+    def get_cache_version(self, detail, **kwargs):
+        """Detail e object er version (bump_object_versions), list e None."""
+        if not detail:
+            return None
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return object_version(self.queryset.model._meta.label_lower, kwargs[lookup_url_kwarg])
+
+    def _cached_response(self, request, handler, detail, *args, **kwargs):
+        if request.method != "GET":
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        version = self.get_cache_version(detail, **kwargs)
+        key = request_cache_key(request, version=version)
+        data = cache.get(key)
+        if data is not None:
+            _count(request, "hit")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        _count(request, "miss")
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and cache_fill_allowed(version):
+            cache.set(key, response.data, timeout=self.cache_timeout)
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,26 @@
+# catalog/checks.py
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .cache import CACHE_ALIAS
+
+LOCMEM_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@register()
+def check_catalog_cache_workers(app_configs, **kwargs):
+    """locmem catalog cache shudhu ek process e; onek worker e invalidation pouchay na."""
+    backend = settings.CACHES.get(CACHE_ALIAS, {}).get("BACKEND")
+    workers = getattr(settings, "WEB_CONCURRENCY", 1)
+    if backend == LOCMEM_BACKEND and workers > 1:
+        return [Warning(
+            f"The '{CACHE_ALIAS}' cache uses LocMemCache but WEB_CONCURRENCY={workers}.",
+            hint=(
+                "Each worker keeps its own cache generation, so a catalog change only "
+                "invalidates the worker that handled it. Set CATALOG_CACHE_BACKEND=file "
+                "(or another shared cache) when running more than one worker."
+            ),
+            id="catalog.W001",
+        )]
+    return []
@@ -0,0 +1,103 @@
+# catalog/conditional.py
+
+"""
+ETag / Last-Modified conditional GET.
+
+Validator = ek aggregate query: max(updated_at) + row count, sathe filter
+params, accepted media type ar catalog cache generation (image/position er
+moto updated_at chara change o dhore). Validator o generation-keyed cache e
+thake, tai 304 path e kono query lage na.
+
+Last-Modified shudhu detail e. List er max(updated_at) row delete /
+deactivate e bodlay na (purono max e thake), tai If-Modified-Since bhul
+304 dito; list e shudhu ETag (generation soho).
+"""
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .cache import cache_fill_allowed, current_generation, get_cache, request_cache_key
+
+
+def compute_validators(queryset, last_modified_field, extra=""):
+    """
+    (etag, last_modified_timestamp | None, count) -- ek query.
+    """
+    aggregates = {"row_count": Count("pk")}
+    if last_modified_field:
+        aggregates["last_modified"] = Max(last_modified_field)
+    result = queryset.order_by().aggregate(**aggregates)
+
+    last_modified = result.get("last_modified")
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    raw = f"{current_generation()}|{result['row_count']}|{timestamp}|{extra}"
+    etag = 'W/"%s"' % hashlib.sha1(raw.encode("utf-8")).hexdigest()[:32]
+    return etag, timestamp, result["row_count"]
+
+
+class ConditionalGetMixin:
+    """
+    list/retrieve e ETag (retrieve e Last-Modified o) pathay, If-None-Match /
+    If-Modified-Since match korle serializer chara 304.
+    """
+    last_modified_field = "updated_at"
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(request, super().list, False, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(request, super().retrieve, True, *args, **kwargs)
+
+    def get_validator_queryset(self, detail, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_validators(self, request, detail, **kwargs):
+        cache = get_cache()
+        # CachedResponseMixin er object version, stock change e detail validator o notun
+        get_version = getattr(self, "get_cache_version", None)
+        version = get_version(detail, **kwargs) if get_version else None
+        key = request_cache_key(request, prefix="validators", version=version)
+        validators = cache.get(key)
+        if validators is None:
+            params = urlencode(sorted(
+                (k, v) for k, values in request.query_params.lists() for v in values
+            ))
+            validators = compute_validators(
+                self.get_validator_queryset(detail, **kwargs),
+                self.last_modified_field,
+                extra=f"{request.path}|{params}|{request.accepted_media_type}|{version}",
+            )
+            if cache_fill_allowed(version):
+                cache.set(key, validators, timeout=getattr(self, "cache_timeout", None))
+        return validators
+
+    def _conditional_response(self, request, handler, detail, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified, row_count = self.get_validators(request, detail, **kwargs)
+        if detail and not row_count:
+            return handler(request, *args, **kwargs)  # 404 handler dibe
+        if not detail:
+            last_modified = None
+
+        not_modified = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
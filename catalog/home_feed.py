@@ -0,0 +1,139 @@
+# catalog/home_feed.py
+
+"""
+Home page feed snapshot.
+
+Age home page: /home-categories/ + protita category r jonno /products/?category=
+(N+1 round trip). Ekhon ekta payload: DisplayedCategories position order e,
+protita category r first K active product (name order) soho.
+
+Snapshot catalog cache e, response cache er moto generation er key te
+thake; admin position change ba product/category change hole commit er pore
+rebuild hoy (signals.py), tai request path e shudhu ekta cache read. Build
+er AGE generation pori: build cholar somoy write commit hole (bump) purono
+data er snapshot purono key te pore, serve hoy na.
+
+Commit er rebuild CATALOG_HOME_FEED_DEBOUNCE sec e ekbar: autocommit e
+(import, admin e ek ek kore save) protita write e puro rebuild na; majher
+write gulor por snapshot nai, porer request build kore.
+"""
+
+import threading
+import weakref
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .cache import bump_generation, current_generation, get_cache
+from .models import DisplayedCategories, Product
+from .serializers import DisplayedCategorySerializer, ProductSerializer
+
+HOME_FEED_KEY = "catalog:home-feed:%s"  # generation
+REBUILT_KEY = "catalog:home-feed:rebuilt"
+
+# thread -> {db alias: weakref(PendingRefresh)}
+_local = threading.local()
+
+
+def products_per_category():
+    return getattr(settings, "CATALOG_HOME_FEED_PRODUCTS", 8)
+
+
+def build_home_feed():
+    per_category = products_per_category()
+    displayed = list(
+        DisplayedCategories.objects.select_related("category")
+        .filter(category__is_active=True)
+        .order_by("position", "id")
+    )
+    category_ids = {d.category_id for d in displayed}
+
+    # protita category r top K ek query te (ROW_NUMBER() OVER PARTITION BY)
+    products = (
+        Product.objects.filter(is_active=True, category_id__in=category_ids)
+        .annotate(row_number=Window(
+            RowNumber(),
+            partition_by=F("category_id"),
+            order_by=[F("name").asc(), F("id").asc()],
+        ))
+        .filter(row_number__lte=per_category)
+        .select_related("category")
+        .prefetch_related("images")
+        .order_by("category_id", "name", "id")
+    )
+    by_category = defaultdict(list)
+    for item in ProductSerializer(products, many=True).data:
+        by_category[item["category"]].append(item)
+
+    feed = []
+    for entry, data in zip(displayed, DisplayedCategorySerializer(displayed, many=True).data):
+        data["products"] = by_category.get(entry.category.slug, [])
+        feed.append(data)
+    return feed
+
+
+def refresh_home_feed(generation=None):
+    if generation is None:
+        generation = current_generation()
+    feed = build_home_feed()
+    get_cache().set(
+        HOME_FEED_KEY % generation, feed, timeout=getattr(settings, "CATALOG_HOME_FEED_TTL", 300)
+    )
+    return feed
+
+
+def get_home_feed():
+    generation = current_generation()
+    feed = get_cache().get(HOME_FEED_KEY % generation)
+    if feed is None:
+        feed = refresh_home_feed(generation)
+    return feed
+
+
+class PendingRefresh:
+    """
+    on_commit callback: generation bump, tarpor home feed rebuild; ekbar
+    cholle `done`.
+    """
+
+    def __init__(self):
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        # commit e abar bump: commit er age onno request purono data notun
+        # generation e cache kore fellele seta o baad jabe. Rebuild er age,
+        # tai snapshot sheshe generation e thake
+        bump_generation()
+        debounce = getattr(settings, "CATALOG_HOME_FEED_DEBOUNCE", 2)
+        # add: window e ager rebuild thakle False (file cache e sob worker jure)
+        if not debounce or get_cache().add(REBUILT_KEY, 1, timeout=debounce):
+            refresh_home_feed()
+
+
+def schedule_home_feed_refresh():
+    """
+    Commit er pore ekbar generation bump + rebuild. Admin list_editable ba
+    category delete (cascade) ek transaction e onek row save/delete kore --
+    tai ek transaction e ekta callback.
+
+    Flag thread-local, weakref e: rollback e Django callback list fele dey,
+    PendingRefresh collect hoye weakref None, porer transaction notun
+    callback pay.
+    """
+    conn = transaction.get_connection()
+    pending_by_alias = getattr(_local, "pending", None)
+    if pending_by_alias is None:
+        pending_by_alias = _local.pending = {}
+
+    ref = pending_by_alias.get(conn.alias)
+    pending = ref() if ref is not None else None
+    if pending is not None and not pending.done and conn.in_atomic_block:
+        return
+    pending = PendingRefresh()
+    if conn.in_atomic_block:
+        pending_by_alias[conn.alias] = weakref.ref(pending)
+    transaction.on_commit(pending)
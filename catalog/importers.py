@@ -0,0 +1,276 @@
+# catalog/importers.py
+
+"""
+Bulk product import (CSV / JSONL), streaming.
+
+  - file line by line pori, memory te shudhu ekta chunk thake
+  - category slug -> id map shurutei ekbar load
+  - notun product er slug chunk dhore ek query te allocate
+  - chunk e bulk_create / bulk_update, protita chunk nijer transaction e
+  - kharap row report e jay, baki batch cholte thake
+
+Columns: name, category (slug), price, + optional slug, generic_name,
+brand_name, description, dosage_info, stock, unit, prescription_required,
+is_active. `slug` dile ar seta age theke thakle row ta update hoy.
+"""
+
+import csv
+import io
+import json
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from accounts.utils import allocate_unique_slugs
+
+from .models import Category, Product
+from .signals import notify_catalog_changed
+from .stats import refresh_category_stats
+from .suggest import suggest_index
+
+FORMATS = ("csv", "jsonl")
+
+TEXT_FIELDS = ("generic_name", "brand_name", "description", "dosage_info", "unit")
+BOOL_FIELDS = ("prescription_required", "is_active")
+UPDATE_FIELDS = (
+    "name", "category", "generic_name", "brand_name", "description", "dosage_info",
+    "price", "stock", "unit", "prescription_required", "is_active",
+)
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+FALSE_VALUES = {"0", "false", "no", "n", "f", ""}
+MAX_REPORTED_ERRORS = 1000
+PRICE_LIMIT = Decimal("100000000")  # Product.price max_digits=10, decimal_places=2
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.errors = []   # [(line, message)]
+        self.error_count = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, str(message)))
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.error_count,
+            "errors": [{"line": line, "error": msg} for line, msg in self.errors],
+            "seconds": round(self.elapsed, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
+
+
+def detect_format(filename, default="csv"):
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def iter_rows(stream, fmt):
+    """
+    Text stream theke (line_no, dict) yield kore, ek row kore.
+    JSONL e parse error holeo (line_no, RowError) yield kori, import thame na.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_no, RowError(f"invalid JSON: {exc}")
+                continue
+            if not isinstance(row, dict):
+                yield line_no, RowError("expected a JSON object")
+                continue
+            yield line_no, row
+    else:
+        raise ValueError(f"Unsupported format '{fmt}', use one of {FORMATS}.")
+
+
+def open_text(fileobj):
+    # binary upload/file ke text stream banai, puro file memory te na ene
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RowError(f"not a boolean: {value!r}")
+
+
+class ProductImporter:
+    def __init__(self, chunk_size=500, update_existing=True):
+        self.chunk_size = max(1, chunk_size)
+        self.update_existing = update_existing
+        self.report = None
+        self.categories = dict(Category.objects.values_list("slug", "id"))
+        self._max_lengths = {
+            f.name: f.max_length
+            for f in Product._meta.concrete_fields
+            if getattr(f, "max_length", None)
+        }
+
+    def run(self, rows):
+        # stream majhe fail korle (e.g. UnicodeDecodeError) o caller partial
+        # count pay
+        report = self.report = ImportReport()
+        chunk = []
+        try:
+            for line, row in rows:
+                report.rows += 1
+                if isinstance(row, Exception):
+                    report.add_error(line, row)
+                    continue
+                try:
+                    chunk.append((line, self.clean(row)))
+                except RowError as exc:
+                    report.add_error(line, exc)
+                    continue
+                if len(chunk) >= self.chunk_size:
+                    self._flush(chunk, report)
+                    chunk = []
+            if chunk:
+                self._flush(chunk, report)
+        finally:
+            report.elapsed = time.perf_counter() - report.started
+            # age commit hoye jaoa chunk er jonno o stats/cache/index
+            if report.created or report.updated:
+                self._after_import()
+        return report
+
+    def clean(self, row):
+        data = {}
+        name = (row.get("name") or "").strip()
+        if not name:
+            raise RowError("name is required")
+        data["name"] = name
+
+        category_slug = (row.get("category") or "").strip()
+        if category_slug not in self.categories:
+            raise RowError(f"unknown category '{category_slug}'")
+        data["category_id"] = self.categories[category_slug]
+
+        try:
+            price = Decimal(str(row.get("price", "")).strip())
+            if not price.is_finite() or price < 0 or price >= PRICE_LIMIT:
+                raise InvalidOperation
+            data["price"] = price.quantize(Decimal("0.01"))
+        except InvalidOperation:
+            raise RowError(f"invalid price {row.get('price')!r}")
+
+        stock = row.get("stock")
+        if stock not in (None, ""):
+            try:
+                data["stock"] = int(stock)
+            except (TypeError, ValueError):
+                raise RowError(f"invalid stock {stock!r}")
+            if data["stock"] < 0:
+                raise RowError("stock cannot be negative")
+
+        for field in TEXT_FIELDS:
+            value = row.get(field)
+            if value not in (None, ""):
+                data[field] = str(value)
+        for field in BOOL_FIELDS:
+            if row.get(field) not in (None, ""):
+                data[field] = _as_bool(row[field])
+
+        slug = (row.get("slug") or "").strip()
+        if slug:
+            data["slug"] = slug
+
+        for field, value in data.items():
+            limit = self._max_lengths.get(field)
+            if limit and isinstance(value, str) and len(value) > limit:
+                raise RowError(f"{field} longer than {limit} characters")
+        return data
+
+    def _flush(self, chunk, report):
+        try:
+            with transaction.atomic():
+                created, updated = self._write(chunk)
+        except DatabaseError:
+            # chunk e kono row DB te fail -- row by row abar chalai, kharap ta report
+            created = updated = 0
+            for line, data in chunk:
+                try:
+                    with transaction.atomic():
+                        c, u = self._write([(line, data)])
+                except DatabaseError as exc:
+                    report.add_error(line, exc)
+                else:
+                    created += c
+                    updated += u
+        report.created += created
+        report.updated += updated
+
+    def _write(self, chunk):
+        given = [data["slug"] for _, data in chunk if "slug" in data]
+        existing = Product.objects.in_bulk(given, field_name="slug") if given else {}
+
+        to_create, to_update = [], []
+        for _, data in chunk:
+            product = existing.get(data.get("slug"))
+            if product is not None and self.update_existing:
+                for field, value in data.items():
+                    setattr(product, field, value)
+                to_update.append(product)
+            else:
+                to_create.append(Product(**data))
+
+        missing = [p for p in to_create if not p.slug]
+        for product, slug in zip(missing, allocate_unique_slugs(Product, [p.name for p in missing])):
+            product.slug = slug
+
+        if to_create:
+            Product.objects.bulk_create(to_create, batch_size=self.chunk_size)
+        if to_update:
+            now = timezone.now()  # bulk_update auto_now chalay na
+            for product in to_update:
+                product.updated_at = now
+            Product.objects.bulk_update(
+                to_update, [*UPDATE_FIELDS, "updated_at"], batch_size=self.chunk_size
+            )
+        return len(to_create), len(to_update)
+
+    def _after_import(self):
+        # bulk_create/bulk_update signal pathay na; search index DB trigger e
+        # sync thake, baki gulo nije invalid kori
+        refresh_category_stats()
+        notify_catalog_changed()
+        suggest_index.clear()
+
@@ -0,0 +1,112 @@
+# catalog/inventory.py
+
+"""
+Atomic stock reservation.
+
+Protita line ekta conditional UPDATE:
+    UPDATE catalog_product SET stock = stock - :qty
+    WHERE slug = :slug AND is_active AND stock >= :qty
+Row update na hole line fail -- read-modify-write nai, tai concurrent
+checkout e oversell ba negative stock hoy na. Sob line ek transaction e,
+slug order e (Postgres e row lock deadlock edate).
+
+Cache: stock change e global generation bump na (puro catalog cache + home
+feed rebuild hoto) -- shudhu product er detail version. List / home feed
+e stock TTL porjonto purono thakte pare; stock 0 paar hole (in stock <->
+out of stock, category in_stock_count) tokhon puro invalidate.
+"""
+
+from collections import OrderedDict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import bump_object_versions
+from .models import Product
+from .signals import notify_catalog_changed
+from .stats import refresh_category_stats
+
+ERROR_NOT_FOUND = "not_found"
+ERROR_INSUFFICIENT = "insufficient_stock"
+ERROR_ROLLED_BACK = "rolled_back"
+
+
+def _merge(lines):
+    # eki slug duibar ashle quantity jog kori, ek UPDATE e jay
+    merged = OrderedDict()
+    for slug, quantity in lines:
+        merged[slug] = merged.get(slug, 0) + quantity
+    return merged
+
+
+def reserve_stock(lines, all_or_nothing=False):
+    """
+    lines: [(slug, quantity), ...]
+    Return: (ok, [{"slug", "quantity", "reserved", "error"}])
+    all_or_nothing=True hole kono line fail korle puro batch rollback.
+    """
+    return _adjust(lines, -1, all_or_nothing)
+
+
+def release_stock(lines):
+    """
+    Reserve kora stock ferot (order cancel). Shudhu product na thakle fail.
+    """
+    return _adjust(lines, 1, all_or_nothing=False)
+
+
+def _adjust(lines, sign, all_or_nothing):
+    merged = _merge(lines)
+    results = {}
+    now = timezone.now()
+
+    with transaction.atomic():
+        for slug in sorted(merged):
+            quantity = merged[slug]
+            qs = Product.objects.filter(slug=slug, is_active=True)
+            if sign < 0:
+                qs = qs.filter(stock__gte=quantity)
+            updated = qs.update(stock=F("stock") + sign * quantity, updated_at=now)
+
+            error = None
+            if not updated:
+                exists = Product.objects.filter(slug=slug, is_active=True).exists()
+                error = ERROR_INSUFFICIENT if exists else ERROR_NOT_FOUND
+            results[slug] = error
+
+        ok = not any(results.values())
+        if all_or_nothing and not ok:
+            transaction.set_rollback(True)
+            results = {slug: error or ERROR_ROLLED_BACK for slug, error in results.items()}
+        elif any(error is None for error in results.values()):
+            changed = [slug for slug, error in results.items() if error is None]
+            _stock_changed(changed, merged, sign)
+
+    return ok, [
+        {
+            "slug": slug,
+            "quantity": quantity,
+            "reserved" if sign < 0 else "released": results[slug] is None,
+            "error": results[slug],
+        }
+        for slug, quantity in merged.items()
+    ]
+
+
+def _stock_changed(slugs, merged, sign):
+    label = Product._meta.label_lower
+    # ekhon + commit e, notify_catalog_changed er moto
+    bump_object_versions(label, slugs)
+    transaction.on_commit(lambda: bump_object_versions(label, slugs))
+
+    # stock 0 paar holo kina: reserve e ekhon 0, release e ekhon == quantity (chilo 0)
+    rows = Product.objects.filter(slug__in=slugs).values_list("slug", "stock", "category_id")
+    crossed = {
+        category_id for slug, stock, category_id in rows
+        if stock == (0 if sign < 0 else merged[slug])
+    }
+    if crossed:
+        # queryset.update() signal pathay na; in_stock_count bodlay
+        refresh_category_stats(crossed)
+        notify_catalog_changed()
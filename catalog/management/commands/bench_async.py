@@ -0,0 +1,204 @@
+# catalog/management/commands/bench_async.py
+
+"""
+Product list er load test, teen bhabe:
+
+  wsgi        -- WSGIHandler, --threads ta worker thread (gunicorn sync er moto)
+  asgi-sync   -- ASGIHandler, sync /products/ view (shared thread e chole)
+  asgi-async  -- ASGIHandler, /async/products/ coroutine view
+
+Server chara in-process: WSGI app thread pool theke, ASGI app ek event
+loop e --concurrency ta connection. --client-delay: client response body
+pore eto second dhore (slow mobile); WSGI te oi somoy worker thread atke
+thake, ASGI te thake na.
+"""
+
+import asyncio
+import io
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from catalog.models import Category, Product
+from catalog.stats import refresh_category_stats
+
+PREFIX = "bench-async-"
+MODES = ("wsgi", "asgi-sync", "asgi-async")
+PATHS = {
+    "wsgi": "/api/catalog/products/",
+    "asgi-sync": "/api/catalog/products/",
+    "asgi-async": "/api/catalog/async/products/",
+}
+
+
+def _report(samples, wall):
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    return (
+        f"{len(samples) / wall:7.1f} req/s, p50 {statistics.median(samples):7.1f} ms, "
+        f"p95 {p95:7.1f} ms, p99 {p99:7.1f} ms"
+    )
+
+
+class Command(BaseCommand):
+    help = "Load test the product list: sync WSGI vs sync view under ASGI vs async view."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=MODES + ("all",), default="all")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--threads", type=int, default=4, help="WSGI worker threads.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients.")
+        parser.add_argument("--client-delay", type=float, default=0.05,
+                            help="Seconds each client spends reading the response.")
+        parser.add_argument("--query", default="page_size=24&view=compact")
+        parser.add_argument(
+            "--warm", action="store_true",
+            help="Allow response cache hits on the sync path (default: every request misses).",
+        )
+        parser.add_argument(
+            "--synthetic", type=int, default=0,
+            help="Insert N fake products for the run (deleted afterwards).",
+        )
+
+    def handle(self, *args, **options):
+        if options["synthetic"]:
+            self._seed(options["synthetic"])
+        try:
+            modes = MODES if options["mode"] == "all" else (options["mode"],)
+            self.stdout.write(
+                f"{options['requests']} requests, {options['concurrency']} clients, "
+                f"client delay {options['client_delay'] * 1000:.0f} ms"
+            )
+            for mode in modes:
+                urls = self._urls(mode, options)
+                if mode == "wsgi":
+                    samples, wall = self._run_wsgi(urls, options)
+                else:
+                    samples, wall = asyncio.run(self._run_asgi(urls, options))
+                self.stdout.write(f"{mode:<11} {_report(samples, wall)}")
+        finally:
+            if options["synthetic"]:
+                Product.objects.filter(slug__startswith=PREFIX).delete()
+                Category.objects.filter(slug=f"{PREFIX}category").delete()
+
+    def _seed(self, count):
+        category, _ = Category.objects.get_or_create(
+            slug=f"{PREFIX}category", defaults={"name": "Bench Async"}
+        )
+        rng = random.Random(42)
+        Product.objects.bulk_create([
+            Product(
+                category=category,
+                name=f"Bench Async {i}",
+                slug=f"{PREFIX}{i}",
+                generic_name=f"generic {rng.randint(1, 50)}",
+                price=Decimal(rng.randint(1, 500)),
+                stock=rng.randint(0, 100),
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        # bulk_create e signal nai; delete er somoy stats negative na hoy
+        refresh_category_stats([category.pk])
+
+    def _urls(self, mode, options):
+        # async path e response cache nai; sync path eo miss korai, tulona shoman.
+        # prothom ta warm-up (import, serializer field build), report e dhore na
+        url = f"{PATHS[mode]}?{options['query']}"
+        if options["warm"]:
+            return [url] * (options["requests"] + 1)
+        return [f"{url}&_={mode}-{i}" for i in range(options["requests"] + 1)]
+
+    # --- WSGI ---
+
+    def _run_wsgi(self, urls, options):
+        handler = WSGIHandler()
+        delay = options["client_delay"]
+        workers = threading.BoundedSemaphore(options["threads"])
+
+        def request(url):
+            parts = urlsplit(url)
+            environ = {
+                "REQUEST_METHOD": "GET", "PATH_INFO": parts.path, "QUERY_STRING": parts.query,
+                "SERVER_NAME": "localhost", "SERVER_PORT": "80", "HTTP_HOST": "localhost",
+                "SERVER_PROTOCOL": "HTTP/1.1", "wsgi.url_scheme": "http",
+                "wsgi.input": io.BytesIO(b""), "wsgi.errors": sys.stderr,
+            }
+            status = []
+            started = time.perf_counter()
+            # latency te free worker er jonno wait o dhora
+            with workers:
+                body = handler(environ, lambda s, headers: status.append(s))
+                try:
+                    b"".join(body)
+                    # slow client: worker thread ei somoy arekta request dhorte pare na
+                    time.sleep(delay)
+                finally:
+                    getattr(body, "close", lambda: None)()
+            if not status[0].startswith("200"):
+                raise RuntimeError(f"{url}: {status[0]}")
+            return (time.perf_counter() - started) * 1000
+
+        request(urls[0])
+        # --concurrency ta client, server e kaj kore --threads ta
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            started = time.perf_counter()
+            samples = list(pool.map(request, urls[1:]))
+        return samples, time.perf_counter() - started
+
+    # --- ASGI ---
+
+    async def _run_asgi(self, urls, options):
+        application = get_asgi_application()
+        delay = options["client_delay"]
+        slots = asyncio.Semaphore(options["concurrency"])
+
+        async def request(url):
+            parts = urlsplit(url)
+            done = asyncio.Event()
+            sent = False
+            status = []
+
+            async def receive():
+                nonlocal sent
+                if not sent:
+                    sent = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+                elif not message.get("more_body"):
+                    await asyncio.sleep(delay)
+                    done.set()
+
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": "GET", "scheme": "http", "path": parts.path,
+                "raw_path": parts.path.encode(), "query_string": parts.query.encode(),
+                "root_path": "", "headers": [(b"host", b"localhost")],
+                "client": ("127.0.0.1", 50000), "server": ("localhost", 80),
+            }
+            async with slots:
+                started = time.perf_counter()
+                await application(scope, receive, send)
+                elapsed = (time.perf_counter() - started) * 1000
+            if status != [200]:
+                raise RuntimeError(f"{url}: {status}")
+            return elapsed
+
+        await request(urls[0])
+        started = time.perf_counter()
+        samples = await asyncio.gather(*(request(url) for url in urls[1:]))
+        return samples, time.perf_counter() - started
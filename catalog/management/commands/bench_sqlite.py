@@ -0,0 +1,182 @@
+# catalog/management/commands/bench_sqlite.py
+
+"""
+SQLite concurrent read/write benchmark.
+
+Reader thread: anonymous GET /api/catalog/products/ (cache miss).
+Writer thread: admin er moto product save (transaction e, signal soho).
+Current SQLITE_TUNING e chole; --compare dile "off" ar "tuned" duto
+profile alada process e, notun temp DB te chalay.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.test import Client
+
+from catalog.models import Category, Product
+from catalog.stats import refresh_category_stats
+
+PREFIX = "bench-sqlite-"
+PROFILES = ("off", "tuned")
+PRAGMAS = ("journal_mode", "synchronous", "mmap_size", "cache_size", "busy_timeout", "temp_store")
+
+
+def _report(name, samples, errors, wall):
+    if not samples:
+        return f"{name:<7} 0 ok, {errors} errors"
+    samples = sorted(samples)
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    return (
+        f"{name:<7} {len(samples) / wall:7.1f}/s, p50 {statistics.median(samples):7.1f} ms, "
+        f"p99 {p99:7.1f} ms, {errors} errors"
+    )
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent catalog reads against admin-style product writes on SQLite."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--products", type=int, default=2000)
+        parser.add_argument("--write-pause", type=float, default=0.01,
+                            help="Seconds a writer waits between saves.")
+        parser.add_argument("--compare", action="store_true",
+                            help="Run every SQLITE_TUNING profile on a fresh temporary database.")
+        parser.add_argument("--migrate", action="store_true", help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stderr.write("bench_sqlite needs the SQLite backend.")
+            return
+        if options["compare"]:
+            return self._compare(options)
+        if options["migrate"]:
+            call_command("migrate", verbosity=0, interactive=False)
+
+        with connection.cursor() as cursor:
+            pragmas = []
+            for name in PRAGMAS:
+                cursor.execute(f"PRAGMA {name}")
+                pragmas.append(f"{name}={cursor.fetchone()[0]}")
+        self.stdout.write(f"SQLITE_TUNING={settings.SQLITE_TUNING}: {', '.join(pragmas)}")
+
+        ids = self._seed(options["products"])
+        try:
+            self._run(ids, options)
+        finally:
+            Product.objects.filter(slug__startswith=PREFIX).delete()
+            Category.objects.filter(slug=f"{PREFIX}category").delete()
+
+    def _compare(self, options):
+        manage = os.path.join(settings.BASE_DIR, "manage.py")
+        passthrough = [
+            f"--readers={options['readers']}", f"--writers={options['writers']}",
+            f"--seconds={options['seconds']}", f"--products={options['products']}",
+            f"--write-pause={options['write_pause']}",
+        ]
+        for profile in PROFILES:
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(os.environ, SQLITE_TUNING=profile, SQLITE_PATH=os.path.join(tmp, "bench.sqlite3"))
+                result = subprocess.run(
+                    [sys.executable, manage, "bench_sqlite", "--migrate", *passthrough],
+                    env=env, capture_output=True, text=True,
+                )
+                self.stdout.write(result.stdout.rstrip())
+                if result.returncode:
+                    self.stderr.write(result.stderr)
+
+    def _seed(self, count):
+        category, _ = Category.objects.get_or_create(
+            slug=f"{PREFIX}category", defaults={"name": "Bench SQLite"}
+        )
+        rng = random.Random(42)
+        Product.objects.bulk_create([
+            Product(
+                category=category,
+                name=f"Bench SQLite {i}",
+                slug=f"{PREFIX}{i}",
+                price=Decimal(rng.randint(1, 500)),
+                stock=rng.randint(0, 100),
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        refresh_category_stats([category.pk])
+        return list(Product.objects.filter(slug__startswith=PREFIX).values_list("pk", flat=True))
+
+    def _run(self, ids, options):
+        deadline = time.perf_counter() + options["seconds"]
+        results = {"reads": [], "writes": []}
+        errors = {"reads": 0, "writes": 0}
+        lock = threading.Lock()
+        url = f"/api/catalog/products/?page_size=24&category={PREFIX}category"
+
+        def record(kind, started, ok):
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if ok:
+                    results[kind].append(elapsed)
+                else:
+                    errors[kind] += 1
+
+        def reader(n):
+            client = Client()
+            i = 0
+            try:
+                while time.perf_counter() < deadline:
+                    i += 1
+                    started = time.perf_counter()
+                    try:
+                        # _= : response cache e hit na hoy
+                        response = client.get(f"{url}&_={n}-{i}", HTTP_HOST="localhost")
+                        ok = response.status_code == 200
+                    except OperationalError:
+                        ok = False
+                    record("reads", started, ok)
+            finally:
+                connection.close()
+
+        def writer(n):
+            rng = random.Random(n)
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic():
+                            product = Product.objects.get(pk=rng.choice(ids))
+                            product.price = Decimal(rng.randint(1, 500))
+                            product.stock = rng.randint(0, 100)
+                            product.save()
+                        ok = True
+                    except OperationalError:
+                        ok = False
+                    record("writes", started, ok)
+                    time.sleep(options["write_pause"])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(options["readers"])]
+        threads += [threading.Thread(target=writer, args=(n,)) for n in range(options["writers"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        self.stdout.write(_report("reads", results["reads"], errors["reads"], wall))
+        self.stdout.write(_report("writes", results["writes"], errors["writes"], wall))
@@ -0,0 +1,99 @@
+# catalog/management/commands/bench_suggest.py
+
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from catalog.models import Category, Product
+from catalog.suggest import SuggestIndex
+
+DEFAULT_QUERIES = ["paracitamol", "omeprazol", "napa", "esomep", "cetrizin", "monteluk"]
+WORDS = [
+    "paracetamol", "omeprazole", "esomeprazole", "cetirizine", "montelukast",
+    "metformin", "amoxicillin", "azithromycin", "losartan", "amlodipine",
+]
+
+
+def _stats(samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1]
+    return statistics.mean(samples), statistics.median(samples), p95
+
+
+class Command(BaseCommand):
+    help = "Benchmark /products/suggest/ trigram index against the DB icontains path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", default=",".join(DEFAULT_QUERIES))
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument(
+            "--synthetic", type=int, default=0,
+            help="Insert N fake products for the run (rolled back afterwards).",
+        )
+
+    def handle(self, *args, **options):
+        queries = [q.strip() for q in options["queries"].split(",") if q.strip()]
+
+        with transaction.atomic():
+            if options["synthetic"]:
+                self._seed(options["synthetic"])
+            self._run(queries, options["repeat"])
+            transaction.set_rollback(True)
+
+    def _seed(self, count):
+        category, _ = Category.objects.get_or_create(name="Bench", defaults={"slug": "bench"})
+        rng = random.Random(42)
+        products = []
+        for i in range(count):
+            generic = rng.choice(WORDS)
+            products.append(Product(
+                category=category,
+                name=f"{generic.title()} {rng.randint(5, 500)}mg",
+                slug=f"bench-{i}",
+                generic_name=generic,
+                brand_name=f"Brand{rng.randint(1, 300)}",
+                price=Decimal("1.00"),
+            ))
+        Product.objects.bulk_create(products, batch_size=1000)
+
+    def _run(self, queries, repeat):
+        total = Product.objects.filter(is_active=True).count()
+        index = SuggestIndex(ttl=0)
+
+        started = time.perf_counter()
+        index.build()
+        build_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f"{total} active products, index built in {build_ms:.1f} ms")
+
+        index_times, db_times = [], []
+        for _ in range(repeat):
+            for q in queries:
+                t0 = time.perf_counter()
+                index.suggest(q)
+                index_times.append((time.perf_counter() - t0) * 1000)
+
+                t0 = time.perf_counter()
+                list(
+                    Product.objects.filter(is_active=True)
+                    .filter(
+                        Q(name__icontains=q)
+                        | Q(generic_name__icontains=q)
+                        | Q(brand_name__icontains=q)
+                    )
+                    .values("id", "slug", "name")[:10]
+                )
+                db_times.append((time.perf_counter() - t0) * 1000)
+
+        for label, samples in (("trigram index", index_times), ("db icontains", db_times)):
+            mean, p50, p95 = _stats(samples)
+            self.stdout.write(f"{label:14s} mean {mean:7.2f} ms  p50 {p50:7.2f} ms  p95 {p95:7.2f} ms")
+
+        self.stdout.write("")
+        for q in queries:
+            hits = [r["name"] for r in index.suggest(q, limit=3)]
+            self.stdout.write(f"  {q!r:16s} -> {hits}")
@@ -0,0 +1,24 @@
+# catalog/management/commands/catalog_cache.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from catalog import cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the catalog response cache generation, or invalidate the cache. "
+        "Hit/miss counters are per worker, on /api/metrics/ (http_response_cache_total)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--invalidate", action="store_true", help="Bump the cache generation.")
+
+    def handle(self, *args, **options):
+        if options["invalidate"]:
+            cache.bump_generation()
+            self.stdout.write(self.style.SUCCESS("Catalog cache invalidated."))
+
+        self.stdout.write(f"backend     {settings.CATALOG_CACHE_BACKEND}")
+        self.stdout.write(f"generation  {cache.current_generation()}")
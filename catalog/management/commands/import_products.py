@@ -0,0 +1,41 @@
+# catalog/management/commands/import_products.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.importers import FORMATS, ProductImporter, detect_format, iter_rows, open_text
+
+
+class Command(BaseCommand):
+    help = "Stream products from a CSV or JSONL file into the catalog in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="Default: from file extension.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--no-update", action="store_true",
+            help="Do not update products whose slug already exists.",
+        )
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["path"])
+        importer = ProductImporter(
+            chunk_size=options["chunk_size"],
+            update_existing=not options["no_update"],
+        )
+        try:
+            with open(options["path"], "rb") as fh:
+                report = importer.run(iter_rows(open_text(fh), fmt))
+        except OSError as exc:
+            raise CommandError(exc)
+
+        for line, message in report.errors:
+            self.stderr.write(f"line {line}: {message}")
+        if report.error_count > len(report.errors):
+            self.stderr.write(f"... {report.error_count - len(report.errors)} more errors")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.rows} rows: {report.created} created, {report.updated} updated, "
+            f"{report.error_count} failed in {report.elapsed:.2f}s "
+            f"({report.rows_per_sec:.0f} rows/sec)"
+        ))
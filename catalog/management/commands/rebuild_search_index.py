@@ -0,0 +1,30 @@
+# catalog/management/commands/rebuild_search_index.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from catalog import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product full-text search index (SQLite FTS5 / Postgres GIN)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        conn = connections[options["database"]]
+        started = time.perf_counter()
+        vendor = search.rebuild(conn)
+        elapsed = time.perf_counter() - started
+
+        if vendor not in ("sqlite", "postgresql"):
+            self.stdout.write(self.style.WARNING(
+                f"No full-text index for '{vendor}', search falls back to icontains."
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt product search index on {vendor} in {elapsed:.2f}s."
+        ))
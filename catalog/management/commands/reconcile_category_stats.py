@@ -0,0 +1,25 @@
+# catalog/management/commands/reconcile_category_stats.py
+
+from django.core.management.base import BaseCommand
+
+from catalog.signals import notify_catalog_changed
+from catalog.stats import reconcile_category_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute Category product/in-stock counts and price range in one grouped query."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report drifted categories.")
+
+    def handle(self, *args, **options):
+        drifted = reconcile_category_stats(dry_run=options["dry_run"])
+        for category in drifted:
+            self.stdout.write(
+                f"{category.pk:>6}  count={category.product_count} in_stock={category.in_stock_count} "
+                f"price={category.min_price}..{category.max_price}"
+            )
+        if drifted and not options["dry_run"]:
+            notify_catalog_changed()
+        verb = "would fix" if options["dry_run"] else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"{len(drifted)} categories {verb}."))
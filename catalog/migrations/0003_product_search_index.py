@@ -0,0 +1,27 @@
+# Product full-text search index (SQLite FTS5 / Postgres GIN)
+
+from django.db import migrations
+
+
+def forwards(apps, schema_editor):
+    from catalog import search
+
+    search.install(schema_editor.connection)
+    search.rebuild(schema_editor.connection)
+
+
+def backwards(apps, schema_editor):
+    from catalog import search
+
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_product_name_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
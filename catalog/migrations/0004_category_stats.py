@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:34
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+
+
+def backfill(apps, schema_editor):
+    # existing data: ek grouped query, tarpor bulk_update
+    Category = apps.get_model("catalog", "Category")
+    Product = apps.get_model("catalog", "Product")
+    active = Q(is_active=True)
+    rows = (
+        Product.objects.order_by().values("category_id").annotate(
+            product_count=Count("pk", filter=active),
+            in_stock_count=Count("pk", filter=active & Q(stock__gt=0)),
+            min_price=Min("price", filter=active),
+            max_price=Max("price", filter=active),
+        )
+    )
+    stats = {row.pop("category_id"): row for row in rows}
+    categories = list(Category.objects.filter(pk__in=stats))
+    for category in categories:
+        for field, value in stats[category.pk].items():
+            setattr(category, field, value)
+    Category.objects.bulk_update(
+        categories, ["product_count", "in_stock_count", "min_price", "max_price"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='in_stock_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='max_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='min_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='product_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,7 @@
 # catalog/models.py
 
 from django.db import models
-from accounts.utils import generate_unique_slug
+from accounts.utils import save_with_unique_slug
 
 
 class TimeStampedModel(models.Model):
@@ -18,6 +18,12 @@ class Category(TimeStampedModel):
     description = models.TextField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
 
+    # active product er aggregate, catalog/stats.py maintain kore
+    product_count = models.PositiveIntegerField(default=0, editable=False)
+    in_stock_count = models.PositiveIntegerField(default=0, editable=False)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, editable=False)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True, editable=False)
+
     class Meta:
         ordering = ["name"]
 
@@ -26,7 +32,7 @@ class Category(TimeStampedModel):
 
     def save(self, *args, **kwargs):
         if not self.slug and self.name:
-            self.slug = generate_unique_slug(Category, self.name)
+            return save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
         super().save(*args, **kwargs)
 
 
@@ -75,14 +81,26 @@ class Product(TimeStampedModel):
             models.Index(fields=["name"]),
             models.Index(fields=["generic_name"]),
             models.Index(fields=["brand_name"]),
+            # keyset pagination: WHERE (name, id) > (...) ORDER BY name, id
+            models.Index(fields=["name", "id"], name="catalog_prod_name_id_idx"),
         ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # load er somoy er category/price/stock -- save e category stats delta
+        from .stats import snapshot
+        instance._stats_snapshot = snapshot(instance)
+        # image er nam, save e variant job shudhu bodlale (signals.py)
+        instance._loaded_image = instance.__dict__.get("image")
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.slug and self.name:
-            self.slug = generate_unique_slug(Product, self.name)
+            return save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
         super().save(*args, **kwargs)
 
 
@@ -98,6 +116,12 @@ class ProductImage(models.Model):
     def __str__(self):
         return f"Image for {self.product.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = instance.__dict__.get("image")
+        return instance
+
 
 # 🔹 HOME PAGE DISPLAY CATEGORY ORDER
 class DisplayedCategories(models.Model):
@@ -0,0 +1,160 @@
+# catalog/pagination.py
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def _reverse_ordering(ordering):
+    return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a composite ordering (default: name, id).
+
+    DRF er CursorPagination sudhu ordering[0] diye filter kore, baki tie
+    gulo OFFSET diye skip kore. Ekhane cursor e puro key tuple rakhi, tai
+    page 1 ar page 1000 dutoi eki index range scan:
+        WHERE (name, id) > (:name, :id) ORDER BY name, id LIMIT :size
+
+    Query params:
+      ?cursor=<opaque>      next/previous link theke
+      ?page_size=10         lighter page (max_page_size porjonto)
+    """
+    ordering = ("name", "id")
+    page_size = 24
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # view chaile nijer keyset dite pare (e.g. search rank)
+        ordering = getattr(view, "cursor_ordering", None) or self.ordering
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        # ekta extra row ani, next page ache kina bujhar jonno
+        return self._set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async view er jonno: same page, rows aiterator() diye."""
+        queryset = self._page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self._set_page([obj async for obj in queryset.aiterator(chunk_size=self.page_size + 1)])
+
+    def _page_queryset(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(
+                self._keyset_filter(ordering, self._decode_position(current_position))
+            )
+        self._reverse, self._current_position = reverse, current_position
+        return queryset[:self.page_size + 1]
+
+    def _set_page(self, results):
+        reverse, current_position = self._reverse, self._current_position
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.next_position
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.previous_position
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _decode_position(self, position):
+        try:
+            values = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    @staticmethod
+    def _keyset_filter(ordering, values):
+        """
+        (a, b, c) > (x, y, z) ke OR-of-ANDs e expand kori, jate sob DB te chole:
+          a > x  OR  (a = x AND b > y)  OR  (a = x AND b = y AND c > z)
+        Prothom column er >= bound ta alada rakhi jate index range scan hoy.
+        """
+        first = ordering[0]
+        first_lookup = "lte" if first.startswith("-") else "gte"
+        bound = Q(**{f"{first.lstrip('-')}__{first_lookup}": values[0]})
+
+        expanded = Q()
+        for i, field in enumerate(ordering):
+            lookup = "lt" if field.startswith("-") else "gt"
+            cond = Q(**{f"{field.lstrip('-')}__{lookup}": values[i]})
+            for prev_field, prev_value in zip(ordering[:i], values[:i]):
+                cond &= Q(**{prev_field.lstrip("-"): prev_value})
+            expanded |= cond
+
+        return bound & expanded
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip("-")
+            values.append(instance[name] if isinstance(instance, dict) else getattr(instance, name))
+        return json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
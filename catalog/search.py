@@ -0,0 +1,179 @@
+# catalog/search.py
+
+"""
+Product full-text search.
+
+SQLite  -> FTS5 virtual table (external content = catalog_product),
+           sync hoy DB trigger diye, tai save()/delete()/bulk_create/update()
+           sob path e index thik thake.
+Postgres -> tsvector expression er upor GIN functional index,
+           index nijei row er sathe update hoy.
+
+Ranking: name/generic_name > brand_name > description.
+Prefix: "napa ext" -> "napa*" AND "ext*"
+"""
+
+import re
+
+from django.db import connection, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "catalog_product_fts"
+PG_INDEX = "catalog_product_search_gin"
+
+# bm25 column weights: name, generic_name, brand_name, description
+SQLITE_WEIGHTS = (10.0, 8.0, 5.0, 1.0)
+
+# {t} = table prefix. Index e khali, query te "catalog_product". (category
+# join e o name/description column ache). Postgres duto expression ke eki
+# dhore, tai query GIN index use kore.
+PG_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({t}name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({t}generic_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({t}brand_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce({t}description, '')), 'D')"
+)
+
+_COLUMNS = "name, generic_name, brand_name, description"
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_COLUMNS},
+        content='catalog_product',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON catalog_product BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS})
+        VALUES (new.id, new.name, new.generic_name, new.brand_name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON catalog_product BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.generic_name, old.brand_name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON catalog_product BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.generic_name, old.brand_name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS})
+        VALUES (new.id, new.name, new.generic_name, new.brand_name, new.description);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+PG_DDL = [
+    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON catalog_product USING GIN (({PG_VECTOR.format(t='')}))",
+]
+
+PG_DROP = [
+    f"DROP INDEX IF EXISTS {PG_INDEX}",
+]
+
+
+def _tokens(term):
+    return re.findall(r"\w+", (term or "").lower())
+
+
+def install(conn=None):
+    """
+    Search index er table/trigger/index toiri kore (idempotent).
+    SQLite e Django kono migration e catalog_product table remake korle
+    trigger gulo drop hoye jay, tai post_migrate eo eta call kori.
+    """
+    conn = conn or connection
+    statements = {"sqlite": SQLITE_DDL, "postgresql": PG_DDL}.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def uninstall(conn=None):
+    conn = conn or connection
+    statements = {"sqlite": SQLITE_DROP, "postgresql": PG_DROP}.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def rebuild(conn=None):
+    """
+    Puro index notun kore banay. Return: vendor name.
+    """
+    conn = conn or connection
+    install(conn)
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif conn.vendor == "postgresql":
+            cursor.execute(f"REINDEX INDEX {PG_INDEX}")
+    return conn.vendor
+
+
+def search_products(queryset, term):
+    """
+    queryset ke `term` diye filter kore, `search_rank` annotate kore
+    (beshi = better match). Caller `-search_rank, id` diye order korbe.
+    """
+    tokens = _tokens(term)
+    if not tokens:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    table = queryset.model._meta.db_table
+
+    if vendor == "sqlite":
+        match = " ".join(f'"{t}"*' for t in tokens)
+        weights = ", ".join(str(w) for w in SQLITE_WEIGHTS)
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{t}:*" for t in tokens)
+        vector = PG_VECTOR.format(t=f'"{table}".')
+        return queryset.filter(
+            RawSQL(
+                f"({vector}) @@ to_tsquery('simple', %s)",
+                (tsquery,),
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank(({vector}), to_tsquery('simple', %s))",
+                (tsquery,),
+                output_field=FloatField(),
+            )
+        )
+
+    # onno DB: purono icontains, kintu sob name field e
+    cond = Q()
+    for t in tokens:
+        cond &= (
+            Q(name__icontains=t)
+            | Q(generic_name__icontains=t)
+            | Q(brand_name__icontains=t)
+            | Q(description__icontains=t)
+        )
+    return queryset.filter(cond).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -1,10 +1,15 @@
 # catalog/serializers.py
 
+from django.conf import settings
 from rest_framework import serializers
+
+from core.metrics import TimedSerializerMixin
+from core.serializers import ImageVariantsField
 from .models import Category, Product, ProductImage, DisplayedCategories
+from .sparse import SparseFieldsSerializerMixin
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = [
@@ -13,27 +18,36 @@ class CategorySerializer(serializers.ModelSerializer):
             "slug",
             "description",
             "is_active",
+            # "N products, ৳X theke ৳Y" -- active product er aggregate
+            "product_count",
+            "in_stock_count",
+            "min_price",
+            "max_price",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "slug", "created_at", "updated_at"]
 
 
-class ProductImageSerializer(serializers.ModelSerializer):
+class ProductImageSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField(source="image")
+
     class Meta:
         model = ProductImage
-        fields = ["id", "image"]
+        fields = ["id", "image", "image_variants"]
         read_only_fields = ["id"]
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin, serializers.ModelSerializer):
     # Category slug diye create/update
     category = serializers.SlugRelatedField(
         slug_field="slug",
         queryset=Category.objects.all()
     )
-    # multiple images read-only list (create via admin or separate endpoint)
+    # multiple images read-only list (create via admin or POST products/<slug>/images/)
     images = ProductImageSerializer(many=True, read_only=True)
+    # thumb/medium WebP (list e original er bodole egulo use korun)
+    image_variants = ImageVariantsField(source="image")
 
     class Meta:
         model = Product
@@ -51,6 +65,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "unit",
             "prescription_required",
             "image",              # main image
+            "image_variants",
             "images",             # extra images
             "is_active",
             "created_at",
@@ -59,10 +74,54 @@ class ProductSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "slug", "created_at", "updated_at"]
 
 
-class DisplayedCategorySerializer(serializers.ModelSerializer):
+class ProductListSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    """
+    Grid/list view er jonno chhoto representation (?view=compact):
+    description/dosage HTML, images list, timestamp nai.
+    """
+    category = serializers.SlugRelatedField(slug_field="slug", read_only=True)
+    image_variants = ImageVariantsField(source="image")
+
+    class Meta:
+        model = Product
+        fields = [
+            "id",
+            "name",
+            "slug",
+            "category",
+            "price",
+            "unit",
+            "stock",
+            "prescription_required",
+            "image_variants",
+        ]
+        read_only_fields = fields
+
+
+class DisplayedCategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     # home page er jonno category details o pathabo
     category = CategorySerializer()
 
     class Meta:
         model = DisplayedCategories
         fields = ["id", "position", "category"]
+
+
+class StockLineSerializer(serializers.Serializer):
+    slug = serializers.SlugField(max_length=220)
+    quantity = serializers.IntegerField(min_value=1)
+
+    def validate_quantity(self, value):
+        # ek order e realistic poriman; boro adjustment admin / import diye
+        limit = getattr(settings, "CATALOG_STOCK_MAX_LINE_QUANTITY", 100)
+        if value > limit:
+            raise serializers.ValidationError(f"Ensure this value is less than or equal to {limit}.")
+        return value
+
+
+class StockAdjustmentSerializer(serializers.Serializer):
+    """
+    {"lines": [{"slug": "napa-500mg", "quantity": 2}, ...], "all_or_nothing": false}
+    """
+    lines = StockLineSerializer(many=True, allow_empty=False, max_length=50)
+    all_or_nothing = serializers.BooleanField(default=False)
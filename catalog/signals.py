@@ -0,0 +1,98 @@
+# catalog/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.images import generate_variants_on_commit
+
+from .cache import bump_generation
+from .home_feed import schedule_home_feed_refresh
+from .models import Category, DisplayedCategories, Product, ProductImage
+from .stats import apply_product_change, refresh_category_stats, snapshot
+from .suggest import suggest_index
+
+
+def notify_catalog_changed():
+    """
+    Response cache + home feed invalid kore. Signal chara path (bulk_create,
+    queryset.update) theke o call kori.
+    """
+    # ekhon bump: ei transaction er nijer read gulo fresh pabe.
+    # commit er bump + home feed rebuild transaction e ekbar (home_feed.py)
+    bump_generation()
+    schedule_home_feed_refresh()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=DisplayedCategories)
+@receiver(post_delete, sender=DisplayedCategories)
+def invalidate_catalog_cache(sender, **kwargs):
+    notify_catalog_changed()
+
+
+@receiver(post_save, sender=Product)
+def refresh_suggest_entry(sender, instance, **kwargs):
+    # commit er pore, rollback hole index e phantom thakbe na
+    transaction.on_commit(lambda: suggest_index.upsert(instance))
+
+
+@receiver(post_delete, sender=Product)
+def drop_suggest_entry(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: suggest_index.remove(pk))
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def touch_product_for_image(sender, instance, **kwargs):
+    # image change o product er change -- updated_at bump, jate
+    # Last-Modified / ETag e dhora pore
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=ProductImage)
+def generate_image_variants(sender, instance, **kwargs):
+    # thumb/medium WebP commit er pore pool e -- shudhu image er nam bodlale
+    # (from_db snapshot), price/stock save e job na
+    old = getattr(instance, "_loaded_image", None)
+    old_name = getattr(old, "name", old) or None
+    if old_name != (instance.image.name or None):
+        generate_variants_on_commit(instance.image)
+    instance._loaded_image = instance.image.name
+
+
+@receiver(pre_save, sender=Product)
+def remember_stats_category(sender, instance, **kwargs):
+    # snapshot nai (load chara/deferred instance): save er age DB er category,
+    # post_save e shudhu oi + notun category recompute
+    if instance.pk and getattr(instance, "_stats_snapshot", None) is None:
+        instance._stats_old_category = (
+            Product.objects.filter(pk=instance.pk).values_list("category_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Product)
+def update_category_stats(sender, instance, created, **kwargs):
+    current = snapshot(instance)
+    if created:
+        apply_product_change(None, current)
+    elif getattr(instance, "_stats_snapshot", None) is None or current is None:
+        # purono state jana nai -- affected category gulo puro recompute
+        old_category = instance.__dict__.pop("_stats_old_category", None)
+        refresh_category_stats({old_category, instance.category_id} - {None})
+    else:
+        apply_product_change(instance._stats_snapshot, current)
+    instance._stats_snapshot = current
+
+
+@receiver(post_delete, sender=Product)
+def remove_from_category_stats(sender, instance, **kwargs):
+    apply_product_change(getattr(instance, "_stats_snapshot", None) or snapshot(instance), None)
@@ -0,0 +1,108 @@
+# catalog/sparse.py
+
+"""
+Sparse fieldset: ?fields=name,price,image_variants / ?omit=description,images
+
+Output er sathe SQL o chhoto hoy:
+  - shudhu dorkari column only() te (cursor ordering er column soho)
+  - category na chaile JOIN nai, images na chaile prefetch query nai
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import ForeignKey
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def _split(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Serializer(..., fields=[...]) / (..., omit=[...]) -- baki field baad.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+
+class SparseFieldsViewMixin:
+    """
+    GET e ?fields= / ?omit= serializer + queryset dutotei lagay.
+    Queryset e `select_related` / `prefetch_related` gulo field na chaile
+    baad pore.
+    """
+    always_load = ("id",)
+
+    def get_sparse_fields(self):
+        """Serializer field name er list, ba None (sob)."""
+        if getattr(self, "_sparse_fields", False) is not False:
+            return self._sparse_fields
+        self._sparse_fields = None
+        request = getattr(self, "request", None)
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None
+
+        fields, omit = _split(request.query_params.get("fields")), _split(request.query_params.get("omit"))
+        if not fields and not omit:
+            return None
+        available = list(self.get_serializer_class()().fields)
+        unknown = sorted(set(fields + omit) - set(available))
+        if unknown:
+            raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+        selected = [name for name in available if (not fields or name in fields) and name not in omit]
+        self._sparse_fields = selected
+        return selected
+
+    def get_serializer(self, *args, **kwargs):
+        selected = self.get_sparse_fields()
+        if selected is not None:
+            kwargs.setdefault("fields", selected)
+        return super().get_serializer(*args, **kwargs)
+
+    def narrow_queryset(self, queryset, selected):
+        model = queryset.model
+        serializer_fields = self.get_serializer_class()().fields
+        columns = set(self.always_load)
+        ordering = getattr(self, "cursor_ordering", None) or getattr(self.pagination_class, "ordering", ())
+        # annotation (search_rank) only() te jay na
+        columns.update(
+            name for name in (field.lstrip("-") for field in ordering)
+            if name not in queryset.query.annotations
+        )
+        relations, prefetches = set(), set()
+
+        for name in selected:
+            field = serializer_fields[name]
+            source = field.source.split(".")[0]
+            if source == "*":
+                continue
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue  # property / method field
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetches.add(source)
+            elif isinstance(model_field, ForeignKey):
+                relations.add(source)
+                columns.add(source)
+                slug_field = getattr(field, "slug_field", None)
+                if isinstance(field, serializers.SlugRelatedField) and slug_field:
+                    columns.add(f"{source}__{slug_field}")
+                else:
+                    columns.add(f"{source}__pk")
+            else:
+                columns.add(source)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset.only(*columns)
@@ -0,0 +1,146 @@
+# catalog/stats.py
+
+"""
+Category er denormalized aggregate: product_count, in_stock_count,
+min_price, max_price (shudhu active product).
+
+Product save/delete e (signals.py) incremental:
+  - count: F() +/- , ek UPDATE
+  - notun product: min/max = Least/Greatest(current, price)
+  - kono product baad/bodle gele (delete, deactivate, category/price
+    change) min/max oi category r subquery theke abar -- tao ek UPDATE
+bulk path (import, stock update) `refresh_category_stats(ids)` dake.
+Drift holeo `reconcile_category_stats` command ek grouped query te thik kore.
+
+Sob path e same UPDATE e Category.updated_at o bump (.update() / bulk_update
+auto_now chalay na) -- category er Last-Modified / ETag stats er sathe bodlay.
+"""
+
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .models import Category, Product
+
+TRACKED_FIELDS = ("category_id", "price", "stock", "is_active")
+
+
+def snapshot(product):
+    """Stats er jonno dorkari field; kono ta deferred hole None."""
+    if any(field not in product.__dict__ for field in TRACKED_FIELDS):
+        return None
+    return {field: getattr(product, field) for field in TRACKED_FIELDS}
+
+
+def _active_products(**filters):
+    return Product.objects.filter(category=OuterRef("pk"), is_active=True, **filters).order_by()
+
+
+def _subquery(aggregate, **filters):
+    return Subquery(
+        _active_products(**filters).values("category").annotate(value=aggregate).values("value")[:1]
+    )
+
+
+def stats_expressions():
+    """Category UPDATE er jonno puro recompute expression (subquery)."""
+    return {
+        "product_count": Coalesce(_subquery(Count("pk")), 0),
+        "in_stock_count": Coalesce(_subquery(Count("pk"), stock__gt=0), 0),
+        "min_price": _subquery(Min("price")),
+        "max_price": _subquery(Max("price")),
+    }
+
+
+def refresh_category_stats(category_ids=None):
+    qs = Category.objects.all()
+    if category_ids is not None:
+        qs = qs.filter(pk__in=category_ids)
+    return qs.update(**stats_expressions(), updated_at=timezone.now())
+
+
+def _contribution(state):
+    if not state or not state["is_active"]:
+        return None
+    # notun instance e string o thakte pare ("10.00")
+    price = Product._meta.get_field("price").to_python(state["price"])
+    return {"count": 1, "in_stock": 1 if int(state["stock"]) > 0 else 0, "price": price}
+
+
+def apply_product_change(old, new):
+    """
+    old/new: snapshot() (ba None: notun / delete). Jekhane jeta bodlay
+    shudhu oi category te ek UPDATE.
+    """
+    before, after = _contribution(old), _contribution(new)
+    if before == after and (old or {}).get("category_id") == (new or {}).get("category_id"):
+        return
+
+    updates = {}  # category_id -> {field: expression}
+    recompute_prices = set()
+
+    if before:
+        cat = old["category_id"]
+        fields = updates.setdefault(cat, {})
+        fields["product_count"] = F("product_count") - before["count"]
+        if before["in_stock"]:
+            fields["in_stock_count"] = F("in_stock_count") - 1
+        recompute_prices.add(cat)
+
+    if after:
+        cat = new["category_id"]
+        fields = updates.setdefault(cat, {})
+        fields["product_count"] = fields.get("product_count", F("product_count")) + after["count"]
+        if after["in_stock"]:
+            fields["in_stock_count"] = fields.get("in_stock_count", F("in_stock_count")) + 1
+        if cat not in recompute_prices:
+            price = Value(after["price"])
+            fields["min_price"] = Least(Coalesce(F("min_price"), price), price)
+            fields["max_price"] = Greatest(Coalesce(F("max_price"), price), price)
+
+    expressions = None
+    for cat in recompute_prices:
+        expressions = expressions or stats_expressions()
+        updates[cat]["min_price"] = expressions["min_price"]
+        updates[cat]["max_price"] = expressions["max_price"]
+
+    now = timezone.now()
+    for cat, fields in updates.items():
+        Category.objects.filter(pk=cat).update(**fields, updated_at=now)
+
+
+def grouped_stats():
+    """{category_id: {...}} -- sob category, ek GROUP BY query."""
+    active = Q(is_active=True)
+    rows = (
+        Product.objects.order_by().values("category_id").annotate(
+            product_count=Count("pk", filter=active),
+            in_stock_count=Count("pk", filter=active & Q(stock__gt=0)),
+            min_price=Min("price", filter=active),
+            max_price=Max("price", filter=active),
+        )
+    )
+    return {row.pop("category_id"): row for row in rows}
+
+
+def reconcile_category_stats(dry_run=False):
+    """
+    Stored value vs ashol; mile na emon category gulo bulk_update.
+    Return: thik kora category list.
+    """
+    actual = grouped_stats()
+    empty = {"product_count": 0, "in_stock_count": 0, "min_price": None, "max_price": None}
+    fields = list(empty)
+
+    drifted = []
+    now = timezone.now()
+    for category in Category.objects.only("pk", *fields):
+        expected = actual.get(category.pk, empty)
+        if any(getattr(category, field) != expected[field] for field in fields):
+            for field in fields:
+                setattr(category, field, expected[field])
+            category.updated_at = now
+            drifted.append(category)
+    if drifted and not dry_run:
+        Category.objects.bulk_update(drifted, [*fields, "updated_at"], batch_size=500)
+    return drifted
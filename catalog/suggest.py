@@ -0,0 +1,238 @@
+# catalog/suggest.py
+
+"""
+Medicine name autocomplete, per-process in-memory trigram index.
+
+  "paracitamol" -> Paracetamol (generic), Napa, Ace ...
+  "omeprazol"   -> Omeprazole, Seclo ...
+
+Index e thake active product er name / generic_name / brand_name.
+Query time e DB hit nai: trigram posting list theke candidate tuli,
+tarpor per-field dice similarity + prefix bonus diye score kori.
+
+Refresh:
+  - Product save/delete -> signal diye incremental upsert/remove (on_commit)
+  - onno process er change dhorte CATALOG_SUGGEST_TTL sec por full rebuild,
+    background thread e; rebuild cholar somoy purono index theke serve kori
+    ar oi somoyer upsert/remove notun index e replay hoy
+  - build ek somoy ekta (_build_lock); cold start e concurrent request gulo
+    prothom build er jonno wait kore, abar build kore na
+"""
+
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+
+MIN_SCORE = 0.3
+CANDIDATE_POOL = 50
+SUGGEST_FIELDS = ("name", "generic_name", "brand_name")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join("".join(c if c.isalnum() else " " for c in text).split())
+
+
+def trigrams(text):
+    # word gulo alada pad kori, jate "napa extend" e "a e" type noise na ashe
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SuggestIndex:
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._entries = {}    # product id -> (payload, [(normalized, grams), ...])
+        self._postings = {}   # trigram -> set(product id)
+        self._built_at = None
+        self._build_lock = threading.Lock()
+        self._pending = []  # cholte thaka build er replay list: [(pk, entry | None), ...]
+        self._rebuild_thread = None
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def _ttl(self):
+        if self.ttl is not None:
+            return self.ttl
+        return getattr(settings, "CATALOG_SUGGEST_TTL", 300)
+
+    def _is_stale(self):
+        if self._built_at is None:
+            return True
+        ttl = self._ttl()
+        return bool(ttl) and time.monotonic() - self._built_at > ttl
+
+    def build(self):
+        with self._build_lock:
+            self._build()
+
+    def _build(self):
+        from .models import Product
+
+        pending = []
+        with self._lock:
+            self._pending.append(pending)
+        rows = (
+            Product.objects.filter(is_active=True)
+            .values("id", "slug", *SUGGEST_FIELDS)
+            .iterator(chunk_size=2000)
+        )
+        entries, postings = {}, {}
+        try:
+            for row in rows:
+                entry = self._make_entry(row)
+                self._add(entries, postings, row["id"], entry)
+        except BaseException:
+            with self._lock:
+                self._detach(pending)
+            raise
+
+        # puro swap ek sathe, query gulo kokhono half-built index dekhbe na
+        with self._lock:
+            self._detach(pending)
+            for pk, entry in pending:
+                self._remove(entries, postings, pk)
+                if entry is not None:
+                    self._add(entries, postings, pk, entry)
+            self._entries, self._postings = entries, postings
+            self._built_at = time.monotonic()
+
+    def _detach(self, pending):
+        # identity diye: khali list gulo == e soman
+        self._pending = [other for other in self._pending if other is not pending]
+
+    def _rebuild(self):
+        from django.db import connection
+
+        try:
+            self.build()
+        finally:
+            connection.close()
+            self._rebuild_thread = None
+
+    def ensure_built(self):
+        if not self._is_stale():
+            return
+        if not self.is_built:
+            # prothom bar: kichu serve korar nai, eikhanei build. Onno request
+            # build korte thakle tar jonno wait, tarpor abar check
+            with self._build_lock:
+                if not self.is_built:
+                    self._build()
+            return
+        with self._lock:
+            if self._rebuild_thread is not None:
+                return
+            self._rebuild_thread = threading.Thread(target=self._rebuild, name="suggest-rebuild", daemon=True)
+            self._rebuild_thread.start()
+
+    def clear(self):
+        with self._lock:
+            self._entries, self._postings = {}, {}
+            self._built_at = None
+
+    @staticmethod
+    def _make_entry(row):
+        payload = {"id": row["id"], "slug": row["slug"]}
+        fields = []
+        for name in SUGGEST_FIELDS:
+            payload[name] = row[name]
+            normalized = normalize(row[name])
+            if normalized:
+                fields.append((normalized, trigrams(normalized)))
+        return payload, fields
+
+    @staticmethod
+    def _entry_grams(entry):
+        grams = set()
+        for _, field_grams in entry[1]:
+            grams |= field_grams
+        return grams
+
+    def upsert(self, product):
+        """
+        Ekta product er entry update kore. Index ekhono build na hole kichu
+        kori na (first query te full build hobe).
+        """
+        if not self.is_built:
+            return
+        if not product.is_active:
+            self.remove(product.pk)
+            return
+
+        row = {"id": product.pk, "slug": product.slug}
+        row.update({name: getattr(product, name) for name in SUGGEST_FIELDS})
+        entry = self._make_entry(row)
+        with self._lock:
+            self._remove(self._entries, self._postings, product.pk)
+            self._add(self._entries, self._postings, product.pk, entry)
+            for pending in self._pending:
+                pending.append((product.pk, entry))
+
+    def remove(self, pk):
+        if not self.is_built:
+            return
+        with self._lock:
+            self._remove(self._entries, self._postings, pk)
+            for pending in self._pending:
+                pending.append((pk, None))
+
+    def _add(self, entries, postings, pk, entry):
+        entries[pk] = entry
+        for gram in self._entry_grams(entry):
+            postings.setdefault(gram, set()).add(pk)
+
+    def _remove(self, entries, postings, pk):
+        old = entries.pop(pk, None)
+        if old is None:
+            return
+        for gram in self._entry_grams(old):
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.discard(pk)
+                if not ids:
+                    del postings[gram]
+
+    def suggest(self, query, limit=10):
+        self.ensure_built()
+
+        q = normalize(query)
+        if not q:
+            return []
+        q_grams = trigrams(q)
+
+        with self._lock:
+            shared = Counter()
+            for gram in q_grams:
+                shared.update(self._postings.get(gram, ()))
+            candidates = [
+                (pk, self._entries[pk])
+                for pk, _ in shared.most_common(CANDIDATE_POOL)
+            ]
+
+        results = []
+        for pk, (payload, fields) in candidates:
+            score = 0.0
+            for normalized, grams in fields:
+                dice = 2.0 * len(q_grams & grams) / (len(q_grams) + len(grams))
+                if normalized.startswith(q) or f" {q}" in normalized:
+                    dice = max(dice, 0.6) + 0.4
+                score = max(score, dice)
+            if score >= MIN_SCORE:
+                results.append((score, payload))
+
+        results.sort(key=lambda r: (-r[0], r[1]["name"] or ""))
+        return [dict(payload, score=round(score, 3)) for score, payload in results[:limit]]
+
+
+suggest_index = SuggestIndex()
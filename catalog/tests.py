@@ -1,3 +1,1145 @@
-from django.test import TestCase
+import threading
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from . import cache as catalog_cache
+from .home_feed import PendingRefresh
+from .importers import ProductImporter, iter_rows
+from .inventory import reserve_stock
+from .models import Category, DisplayedCategories, Product, ProductImage
+from .suggest import SuggestIndex, suggest_index
+
+
+def make_product(category, name, **extra):
+    extra.setdefault("price", Decimal("10.00"))
+    return Product.objects.create(category=category, name=name, **extra)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name="Pain Relief")
+        # duplicate names: id tiebreaker check
+        for i in range(7):
+            make_product(self.category, "Napa" if i % 2 else f"Product {i}")
+
+    def walk(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(p["id"] for p in response.data["results"])
+            url = response.data["next"]
+        return seen
+
+    def test_pages_cover_every_product_once_in_name_id_order(self):
+        expected = list(
+            Product.objects.order_by("name", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(self.walk("/api/catalog/products/?page_size=2"), expected)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get("/api/catalog/products/?page_size=3").data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+        self.assertEqual(
+            [p["id"] for p in back["results"]],
+            [p["id"] for p in first["results"]],
+        )
+
+    def test_page_size_is_bounded(self):
+        response = self.client.get("/api/catalog/products/?page_size=100000")
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(response.data["results"]), 100)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get("/api/catalog/products/?cursor=cD1nYXJiYWdl")
+        self.assertEqual(response.status_code, 404)
+
+
+class ProductQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name="Antacid")
+
+    def add_products(self, count):
+        for i in range(count):
+            product = make_product(self.category, f"Omeprazole {Product.objects.count()}")
+            ProductImage.objects.create(product=product, image=f"product_images/{i}-a.jpg")
+            ProductImage.objects.create(product=product, image=f"product_images/{i}-b.jpg")
+
+    def test_list_query_count_does_not_grow_with_products(self):
+        # ETag aggregate + products (+category join) + images prefetch
+        self.add_products(2)
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/catalog/products/?page_size=50")
+        self.assertEqual(len(response.data["results"]), 2)
+
+        self.add_products(10)
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/catalog/products/?page_size=50")
+        self.assertEqual(len(response.data["results"]), 12)
+        self.assertEqual(len(response.data["results"][0]["images"]), 2)
+
+    def test_image_variant_urls(self):
+        from unittest import mock
+
+        self.add_products(1)
+        Product.objects.update(image="products/napa.jpg")
+        # variant file nai: original er URL
+        item = self.client.get("/api/catalog/products/").data["results"][0]
+        self.assertEqual(item["image_variants"]["thumb"], "http://testserver/media/products/napa.jpg")
+
+        catalog_cache.get_cache().clear()
+        with mock.patch("core.images.variant_exists", return_value=True):
+            item = self.client.get("/api/catalog/products/").data["results"][0]
+        self.assertEqual(
+            item["image_variants"]["thumb"], "http://testserver/media/products/napa.thumb.webp"
+        )
+        self.assertTrue(item["images"][0]["image_variants"]["medium"].endswith("-a.medium.webp"))
+
+    def test_non_image_save_does_not_submit_variant_job(self):
+        from unittest import mock
+
+        self.add_products(1)
+        Product.objects.update(image="products/napa.jpg")
+        product = Product.objects.get()
+        with mock.patch("catalog.signals.generate_variants_on_commit") as submit:
+            product.price = Decimal("12.00")
+            product.save()
+            submit.assert_not_called()
+            product.image = "products/ace.jpg"
+            product.save()
+            submit.assert_called_once()
+
+    def test_detail_loads_images_in_one_query(self):
+        self.add_products(1)
+        product = Product.objects.get()
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/catalog/products/{product.slug}/")
+        self.assertEqual(len(response.data["images"]), 2)
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        category = Category.objects.create(name="Fever")
+        self.napa = make_product(
+            category, "Napa Extend", generic_name="Paracetamol", brand_name="Beximco"
+        )
+        self.ace = make_product(
+            category, "Ace", generic_name="Paracetamol", brand_name="Square"
+        )
+        self.other = make_product(
+            category, "Seclo", generic_name="Omeprazole",
+            description="<p>Take before meals, not with paracetamol.</p>",
+        )
+
+    def search(self, term):
+        response = self.client.get("/api/catalog/products/", {"search": term})
+        self.assertEqual(response.status_code, 200)
+        return [p["slug"] for p in response.data["results"]]
+
+    def test_matches_generic_and_brand_names_with_prefix(self):
+        self.assertEqual(self.search("squ"), [self.ace.slug])
+        self.assertCountEqual(
+            self.search("paraceta"), [self.napa.slug, self.ace.slug, self.other.slug]
+        )
+
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(self.search("paracetamol")[-1], self.other.slug)
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search("napa ext"), [self.napa.slug])
+
+    def test_index_follows_save_and_delete(self):
+        self.ace.brand_name = "Incepta"
+        self.ace.save()
+        self.assertEqual(self.search("incepta"), [self.ace.slug])
+        self.assertEqual(self.search("square"), [])
+
+        self.ace.delete()
+        self.assertEqual(self.search("incepta"), [])
+
+    def test_rebuild_command_keeps_results(self):
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.search("seclo"), [self.other.slug])
+
+    def test_ranked_results_paginate_without_gaps(self):
+        first = self.client.get("/api/catalog/products/", {"search": "paracetamol", "page_size": 2}).data
+        second = self.client.get(first["next"]).data
+        slugs = [p["slug"] for p in first["results"] + second["results"]]
+        self.assertEqual(slugs, self.search("paracetamol"))
+
+
+class SuggestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        suggest_index.clear()
+        category = Category.objects.create(name="Gastric")
+        self.seclo = make_product(category, "Seclo 20", generic_name="Omeprazole")
+        self.napa = make_product(category, "Napa", generic_name="Paracetamol")
+
+    def suggest(self, q):
+        response = self.client.get("/api/catalog/products/suggest/", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [r["slug"] for r in response.data["results"]]
+
+    def test_misspelled_names_are_found(self):
+        self.assertEqual(self.suggest("omeprazol")[0], self.seclo.slug)
+        self.assertEqual(self.suggest("paracitamol")[0], self.napa.slug)
+
+    def test_prefix_matches(self):
+        self.assertEqual(self.suggest("sec")[0], self.seclo.slug)
+
+    def test_suggest_does_not_touch_the_database_once_built(self):
+        suggest_index.build()
+        with self.assertNumQueries(0):
+            self.suggest("napa")
+
+    def test_index_refreshes_on_product_changes(self):
+        suggest_index.build()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.napa.brand_name = "Beximco"
+            self.napa.save()
+        self.assertEqual(self.suggest("beximko"), [self.napa.slug])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.napa.delete()
+        self.assertEqual(self.suggest("beximco"), [])
+
+    def test_stale_index_rebuilds_in_background(self):
+        from unittest import mock
+
+        index = SuggestIndex(ttl=60)
+        index.build()
+        index._built_at -= 120
+        started, release = threading.Event(), threading.Event()
+
+        def slow_build():
+            started.set()
+            release.wait(5)
+
+        with mock.patch.object(index, "build", side_effect=slow_build):
+            # rebuild cholche, kintu request purono index theke sathe sathe
+            self.assertEqual(index.suggest("napa")[0]["slug"], self.napa.slug)
+            self.assertTrue(started.wait(5))
+            thread = index._rebuild_thread
+            release.set()
+            thread.join(5)
+
+    def test_changes_during_rebuild_are_replayed(self):
+        from unittest import mock
+
+        index = SuggestIndex(ttl=0)
+        index.build()
+        make_entry = index._make_entry
+
+        def make_entry_and_remove(row):
+            if row["id"] == self.seclo.pk:
+                index.remove(self.seclo.pk)
+            return make_entry(row)
+
+        with mock.patch.object(index, "_make_entry", side_effect=make_entry_and_remove):
+            index.build()
+        self.assertEqual([r["slug"] for r in index.suggest("seclo")], [])
+
+
+    def test_concurrent_cold_start_waits_for_first_build(self):
+        from unittest import mock
+
+        index = SuggestIndex(ttl=0)
+        make_entry = index._make_entry
+        errors, waiter = [], []
+
+        def ensure_built():
+            try:
+                index.ensure_built()
+            except Exception as exc:
+                errors.append(exc)
+
+        def make_entry_with_second_request(row):
+            if not waiter:
+                # dwitiyo cold-start request prothom build cholar moddhe
+                waiter.append(threading.Thread(target=ensure_built))
+                waiter[0].start()
+                waiter[0].join(0.2)
+                self.assertTrue(waiter[0].is_alive())
+            return make_entry(row)
+
+        with mock.patch.object(index, "_make_entry", side_effect=make_entry_with_second_request):
+            index.ensure_built()
+        waiter[0].join(5)
+        self.assertFalse(waiter[0].is_alive())
+        self.assertEqual(errors, [])
+        self.assertEqual(index.suggest("napa")[0]["slug"], self.napa.slug)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        catalog_cache.get_cache().clear()
+        self.category = Category.objects.create(name="Vitamins")
+        self.product = make_product(self.category, "Ceevit")
+
+    def test_second_get_is_served_from_cache(self):
+        from core.metrics import RESPONSE_CACHE
+
+        # process local counter, onno test er count o thake
+        hits = RESPONSE_CACHE._values.get(("product-list", "hit"), 0)
+        misses = RESPONSE_CACHE._values.get(("product-list", "miss"), 0)
+        first = self.client.get("/api/catalog/products/?page_size=5&category=vitamins")
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/catalog/products/?category=vitamins&page_size=5")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(RESPONSE_CACHE._values[("product-list", "hit")], hits + 1)
+        self.assertEqual(RESPONSE_CACHE._values[("product-list", "miss")], misses + 1)
+
+    def test_model_changes_invalidate(self):
+        url = f"/api/catalog/products/{self.product.slug}/"
+        self.client.get(url)
+        self.product.price = Decimal("99.00")
+        self.product.save()
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["price"], "99.00")
+
+    def test_related_models_invalidate_list(self):
+        self.client.get("/api/catalog/home-categories/")
+        DisplayedCategories.objects.create(category=self.category, position=1)
+        response = self.client.get("/api/catalog/home-categories/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data), 1)
+
+        self.client.get("/api/catalog/products/")
+        ProductImage.objects.create(product=self.product, image="product_images/x.jpg")
+        response = self.client.get("/api/catalog/products/")
+        self.assertEqual(len(response.data["results"][0]["images"]), 1)
+
+    def test_concurrent_bumps_get_distinct_generations(self):
+        from unittest import mock
+
+        # duto process eki generation porle incr e dujon same value likhto
+        cache = catalog_cache.get_cache()
+        start = catalog_cache.current_generation()
+        with mock.patch.object(cache, "incr", side_effect=AssertionError("incr used")):
+            first = catalog_cache.bump_generation()
+            second = catalog_cache.bump_generation()
+        self.assertNotIn(first, (start, second))
+        self.assertEqual(catalog_cache.current_generation(), second)
+
+    def test_locmem_with_several_workers_warns(self):
+        from .checks import check_catalog_cache_workers
+
+        with override_settings(WEB_CONCURRENCY=1):
+            self.assertEqual(check_catalog_cache_workers(None), [])
+        with override_settings(WEB_CONCURRENCY=4):
+            self.assertEqual([w.id for w in check_catalog_cache_workers(None)], ["catalog.W001"])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        catalog_cache.get_cache().clear()
+        self.category = Category.objects.create(name="Allergy")
+        self.product = make_product(self.category, "Alatrol")
+
+    def test_list_and_detail_send_validators(self):
+        for url in ("/api/catalog/products/", f"/api/catalog/products/{self.product.slug}/",
+                    "/api/catalog/categories/"):
+            response = self.client.get(url)
+            self.assertTrue(response.has_header("ETag"), url)
+        detail = self.client.get(f"/api/catalog/products/{self.product.slug}/")
+        self.assertTrue(detail.has_header("Last-Modified"))
+
+    def test_list_ignores_if_modified_since_after_delete(self):
+        # delete e max(updated_at) bodlay na, tai list e Last-Modified nai
+        other = make_product(self.category, "Alatrol Syrup")
+        url = "/api/catalog/products/"
+        first = self.client.get(url)
+        self.assertFalse(first.has_header("Last-Modified"))
+        other.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_if_none_match_returns_304_without_queries(self):
+        url = "/api/catalog/products/?category=allergy"
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since(self):
+        url = f"/api/catalog/products/{self.product.slug}/"
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_validators_change_with_filters_and_data(self):
+        etag = self.client.get("/api/catalog/products/")["ETag"]
+        self.assertNotEqual(self.client.get("/api/catalog/products/?min_price=5")["ETag"], etag)
+
+        ProductImage.objects.create(product=self.product, image="product_images/y.jpg")
+        response = self.client.get("/api/catalog/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_validator_is_a_single_aggregate_query(self):
+        view_qs = Product.objects.filter(is_active=True)
+        with self.assertNumQueries(1):
+            from .conditional import compute_validators
+            compute_validators(view_qs, "updated_at")
+
+
+@override_settings(CATALOG_HOME_FEED_PRODUCTS=2, CATALOG_HOME_FEED_DEBOUNCE=0)
+class HomeFeedTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        catalog_cache.get_cache().clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fever = Category.objects.create(name="Fever")
+            self.cold = Category.objects.create(name="Cold")
+            for name in ("Napa", "Ace", "Fast", "Tusca"):
+                make_product(self.fever, name)
+            make_product(self.cold, "Fexo")
+            self.first = DisplayedCategories.objects.create(category=self.fever, position=1)
+            self.second = DisplayedCategories.objects.create(category=self.cold, position=2)
+
+    def feed(self):
+        response = self.client.get("/api/catalog/home-feed/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_feed_has_categories_in_position_order_with_top_products(self):
+        feed = self.feed()
+        self.assertEqual([e["category"]["slug"] for e in feed], ["fever", "cold"])
+        self.assertEqual([p["name"] for p in feed[0]["products"]], ["Ace", "Fast"])
+        self.assertEqual([p["name"] for p in feed[1]["products"]], ["Fexo"])
+
+    def test_served_from_snapshot_without_queries(self):
+        self.feed()
+        with self.assertNumQueries(0):
+            self.feed()
+
+    def test_reordering_rebuilds_snapshot_once_on_commit(self):
+        self.feed()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.first.position = 3
+            self.first.save()
+            self.second.position = 0
+            self.second.save()
+        self.assertEqual(
+            sum(1 for c in callbacks if isinstance(c, PendingRefresh)), 1
+        )
+        with self.assertNumQueries(0):
+            feed = self.feed()
+        self.assertEqual([e["category"]["slug"] for e in feed], ["cold", "fever"])
+
+    def test_rolled_back_transaction_does_not_block_next_refresh(self):
+        from django.db import transaction
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.first.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with transaction.atomic():
+                self.second.save()
+        self.assertEqual(
+            sum(1 for c in callbacks if isinstance(c, PendingRefresh)), 1
+        )
+        with self.assertNumQueries(0):
+            self.feed()
+
+    def test_snapshot_built_before_a_write_is_not_served(self):
+        from unittest import mock
+        from . import home_feed
+
+        build, writes = home_feed.build_home_feed, []
+
+        def build_then_concurrent_write():
+            feed = build()
+            if not writes:
+                # build purono data theke shesh, set er age onno request er write commit
+                writes.append(1)
+                with self.captureOnCommitCallbacks(execute=True):
+                    make_product(self.fever, "Aaa")
+            return feed
+
+        catalog_cache.bump_generation()
+        with mock.patch.object(home_feed, "build_home_feed", side_effect=build_then_concurrent_write):
+            self.feed()
+        self.assertEqual([p["name"] for p in self.feed()[0]["products"]], ["Aaa", "Ace"])
+
+    def test_commit_rebuilds_are_debounced(self):
+        catalog_cache.get_cache().delete("catalog:home-feed:rebuilt")
+        with override_settings(CATALOG_HOME_FEED_DEBOUNCE=60):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.first.save()
+            with self.assertNumQueries(0):
+                self.feed()
+            # window er moddhe arekta write: rebuild na, snapshot shudhu baad
+            with CaptureQueriesContext(connection) as queries:
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.second.save()
+            self.assertFalse(any("ROW_NUMBER" in q["sql"] for q in queries))
+        self.assertEqual([e["category"]["slug"] for e in self.feed()], ["fever", "cold"])
+
+
+class ProductImportTests(TestCase):
+    CSV = (
+        "name,category,price,stock,generic_name,slug\n"
+        "Napa,fever,1.20,100,Paracetamol,\n"
+        "Napa,fever,1.50,50,Paracetamol,\n"
+        "Broken,nope,1.00,1,,\n"
+        "Ace,fever,abc,1,,\n"
+        "Existing,fever,9.99,7,,existing\n"
+    )
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Fever")
+        self.existing = make_product(self.category, "Old name", slug="existing")
+
+    def run_import(self, text, fmt="csv", chunk_size=2, **kwargs):
+        importer = ProductImporter(chunk_size=chunk_size, **kwargs)
+        return importer.run(iter_rows(StringIO(text), fmt))
+
+    def test_csv_import_creates_updates_and_reports_bad_rows(self):
+        report = self.run_import(self.CSV)
+        self.assertEqual((report.rows, report.created, report.updated), (5, 2, 1))
+        self.assertEqual([line for line, _ in report.errors], [4, 5])
+
+        slugs = set(Product.objects.filter(name="Napa").values_list("slug", flat=True))
+        self.assertEqual(len(slugs), 2)
+        self.existing.refresh_from_db()
+        self.assertEqual((self.existing.name, self.existing.stock), ("Existing", 7))
+
+    def test_jsonl_import(self):
+        text = (
+            '{"name": "Seclo", "category": "fever", "price": 5, "prescription_required": "yes"}\n'
+            "not json\n"
+        )
+        report = self.run_import(text, fmt="jsonl")
+        self.assertEqual((report.created, report.error_count), (1, 1))
+        self.assertTrue(Product.objects.get(name="Seclo").prescription_required)
+
+    def test_database_errors_only_fail_their_row(self):
+        text = (
+            "name,category,price,slug\n"
+            "One,fever,1,dup\n"
+            "Two,fever,1,dup\n"
+            "Three,fever,1,\n"
+        )
+        report = self.run_import(text, chunk_size=10, update_existing=False)
+        self.assertEqual((report.created, report.error_count), (2, 1))
+        self.assertEqual(report.errors[0][0], 3)
+
+    def test_decode_error_mid_stream_still_refreshes_written_rows(self):
+        from io import BytesIO
+        from .importers import open_text
+
+        rows = "".join(f"Bulk {i},fever,1.00,1,,\n" for i in range(600))
+        data = f"name,category,price,stock,generic_name,slug\n{rows}".encode() + b"Bad \xff,fever,1,1,,\n"
+        suggest_index.build()
+        importer = ProductImporter(chunk_size=100)
+        with self.assertRaises(UnicodeDecodeError):
+            importer.run(iter_rows(open_text(BytesIO(data)), "csv"))
+
+        created = importer.report.created
+        self.assertGreater(created, 0)
+        self.assertEqual(Product.objects.filter(name__startswith="Bulk").count(), created)
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.product_count, created + 1)
+        self.assertFalse(suggest_index.is_built)
+
+    def test_api_endpoint_is_staff_only(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from accounts.models import User
+
+        client = APIClient()
+        upload = SimpleUploadedFile("p.csv", self.CSV.encode(), content_type="text/csv")
+        response = client.post("/api/catalog/products/import/", {"file": upload})
+        self.assertIn(response.status_code, (401, 403))
+
+        staff = User.objects.create_user("staff", "staff@example.com", "pw", role="staff")
+        client.force_authenticate(staff)
+        upload.seek(0)
+        response = client.post("/api/catalog/products/import/", {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 2)
+
+
+class StockReservationTests(TestCase):
+    def setUp(self):
+        from accounts.models import User
+
+        self.client = APIClient()
+        self.user = User.objects.create_user("checkout", "checkout@example.com", "pw", role="staff")
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name="Fever")
+        self.napa = make_product(category, "Napa", stock=5)
+        self.ace = make_product(category, "Ace", stock=1)
+
+    def reserve(self, lines, **extra):
+        return self.client.post(
+            "/api/catalog/products/reserve-stock/", {"lines": lines, **extra}, format="json"
+        )
+
+    def test_reserves_and_reports_failed_lines(self):
+        response = self.reserve([
+            {"slug": self.napa.slug, "quantity": 2},
+            {"slug": self.ace.slug, "quantity": 3},
+            {"slug": "missing", "quantity": 1},
+        ])
+        self.assertEqual(response.status_code, 409)
+        errors = {line["slug"]: line["error"] for line in response.data["lines"]}
+        self.assertEqual(errors, {self.napa.slug: None, self.ace.slug: "insufficient_stock",
+                                  "missing": "not_found"})
+        self.napa.refresh_from_db()
+        self.ace.refresh_from_db()
+        self.assertEqual((self.napa.stock, self.ace.stock), (3, 1))
+
+    def test_all_or_nothing_rolls_back(self):
+        response = self.reserve(
+            [{"slug": self.napa.slug, "quantity": 2}, {"slug": self.ace.slug, "quantity": 3}],
+            all_or_nothing=True,
+        )
+        self.assertEqual(response.status_code, 409)
+        self.napa.refresh_from_db()
+        self.assertEqual(self.napa.stock, 5)
+
+    def test_duplicate_lines_are_merged(self):
+        response = self.reserve([
+            {"slug": self.napa.slug, "quantity": 3},
+            {"slug": self.napa.slug, "quantity": 3},
+        ])
+        self.assertEqual(response.status_code, 409)
+        self.napa.refresh_from_db()
+        self.assertEqual(self.napa.stock, 5)
+
+    def test_reserve_and_release_require_staff(self):
+        from accounts.models import User
+
+        self.assertEqual(APIClient().post("/api/catalog/products/reserve-stock/", {}).status_code, 401)
+        customer = APIClient()
+        customer.force_authenticate(User.objects.create_user("buyer", "buyer@example.com", "pw"))
+        for url in ("/api/catalog/products/reserve-stock/", "/api/catalog/products/release-stock/"):
+            response = customer.post(
+                url, {"lines": [{"slug": self.napa.slug, "quantity": 1}]}, format="json"
+            )
+            self.assertEqual(response.status_code, 403, url)
+        self.napa.refresh_from_db()
+        self.assertEqual(self.napa.stock, 5)
+
+    @override_settings(CATALOG_STOCK_MAX_LINE_QUANTITY=3)
+    def test_quantity_is_capped(self):
+        response = self.reserve([{"slug": self.napa.slug, "quantity": 4}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_stock_change_refreshes_detail_without_bumping_generation(self):
+        catalog_cache.get_cache().clear()
+        url = f"/api/catalog/products/{self.napa.slug}/"
+        etag = self.client.get(url)["ETag"]
+        generation = catalog_cache.current_generation()
+
+        self.reserve([{"slug": self.napa.slug, "quantity": 2}])
+        self.assertEqual(catalog_cache.current_generation(), generation)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response["X-Cache"], response.data["stock"]), ("MISS", 3))
+
+        # stock 0 hole in_stock_count bodlay, tokhon puro invalidate
+        self.reserve([{"slug": self.ace.slug, "quantity": 1}])
+        self.assertNotEqual(catalog_cache.current_generation(), generation)
+
+
+class StockReservationConcurrencyTests(TransactionTestCase):
+    THREADS = 16
+    ATTEMPTS_PER_THREAD = 10
+    INITIAL_STOCK = 100
+
+    def test_concurrent_reservations_never_oversell(self):
+        category = Category.objects.create(name="Fever")
+        product = make_product(category, "Napa", stock=self.INITIAL_STOCK)
+        barrier = threading.Barrier(self.THREADS)
+        reserved = []
+        errors = []
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(self.ATTEMPTS_PER_THREAD):
+                    ok, _ = reserve_stock([(product.slug, 1)])
+                    if ok:
+                        reserved.append(1)
+            except Exception as exc:  # pragma: no cover - test e dekhai
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        product.refresh_from_db()
+        # 160 attempt, 100 stock: thik 100 ta pass, stock 0, lost update nai
+        self.assertEqual(len(reserved), self.INITIAL_STOCK)
+        self.assertEqual(product.stock, 0)
+
+
+class ProductImageUploadTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from accounts.models import User
+
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.client = APIClient()
+        self.staff = User.objects.create_user("staff", "staff@example.com", "pw", role="staff")
+        self.product = make_product(Category.objects.create(name="Fever"), "Napa")
+        self.url = f"/api/catalog/products/{self.product.slug}/images/"
+
+    def image(self, name, size=(300, 200), fmt="PNG"):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", size, "blue").save(buffer, fmt)
+        return SimpleUploadedFile(name, buffer.getvalue())
+
+    def test_staff_uploads_many_images_in_one_insert(self):
+        self.client.force_authenticate(self.staff)
+        files = [self.image(f"{i}.png") for i in range(3)]
+        with self.captureOnCommitCallbacks() as callbacks:
+            # product + savepoint + ek INSERT + updated_at + release
+            with self.assertNumQueries(5):
+                response = self.client.post(self.url, {"images": files})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(self.product.images.count(), 3)
+        # variant commit er pore banbe; tar age original er URL
+        self.assertEqual(response.data[0]["image_variants"]["thumb"], response.data[0]["image"])
+
+        from core.images import variant_pool, variant_urls
+
+        for callback in callbacks:
+            callback()
+        variant_pool.wait()
+        image = self.product.images.order_by("id").first().image
+        self.assertTrue(variant_urls(image)["thumb"].endswith(".thumb.webp"))
+
+    def test_accepts_multi_picture_jpeg(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", (300, 200), "blue").save(
+            buffer, "MPO", save_all=True, append_images=[Image.new("RGB", (300, 200), "red")]
+        )
+        self.client.force_authenticate(self.staff)
+        response = self.client.post(self.url, {"images": [SimpleUploadedFile("phone.jpg", buffer.getvalue())]})
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_rejects_bad_files_before_saving(self):
+        import os
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        self.client.force_authenticate(self.staff)
+        files = [
+            self.image("ok.png"),
+            self.image("tiny.png", size=(20, 20)),
+            SimpleUploadedFile("fake.png", b"not an image"),
+        ]
+        response = self.client.post(self.url, {"images": files})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["images"]), 2)
+        self.assertEqual(self.product.images.count(), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.media, "product_images")))
+
+    def test_staff_only(self):
+        response = self.client.post(self.url, {"images": [self.image("a.png")]})
+        self.assertIn(response.status_code, (401, 403))
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def store(self, name, data=b"0123456789" * 10):
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+
+        return default_storage.save(name, ContentFile(data))
+
+    def get(self, name, **headers):
+        return self.client.get(f"/media/{name}", **headers)
+
+    def test_upload_names_are_content_hashed(self):
+        first = self.store("product_images/napa.jpg")
+        second = self.store("product_images/napa.jpg")
+        other = self.store("product_images/napa.jpg", b"different")
+        self.assertRegex(first, r"^product_images/napa\.[0-9a-f]{12}\.jpg$")
+        self.assertNotEqual(first, second)  # same content, notun nam; file share hoy na
+        self.assertNotEqual(first.split(".")[1], other.split(".")[1])
+        self.assertEqual(self.store("misc/readme.txt"), "misc/readme.txt")
+
+    def test_variants_of_unhashed_original_keep_derived_names(self):
+        from io import BytesIO
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import FileSystemStorage, default_storage
+        from PIL import Image
+        from core.images import generate_variants, variant_urls
+
+        buffer = BytesIO()
+        Image.new("RGB", (300, 200), "blue").save(buffer, "JPEG")
+        # series er age upload: nam e hash nai
+        FileSystemStorage(location=self.media).save("products/legacy.jpg", ContentFile(buffer.getvalue()))
+
+        created = generate_variants(default_storage, "products/legacy.jpg")
+        self.assertEqual(sorted(created), ["products/legacy.medium.webp", "products/legacy.thumb.webp"])
+        self.assertEqual(generate_variants(default_storage, "products/legacy.jpg"), [])
+        image = Product(image="products/legacy.jpg").image
+        self.assertTrue(variant_urls(image)["thumb"].endswith("/products/legacy.thumb.webp"))
+
+    def test_hashed_file_is_immutable(self):
+        name = self.store("products/napa.jpg")
+        response = self.get(name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789" * 10)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        response = self.get(name, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        plain = self.store("misc/readme.txt")
+        self.assertNotIn("immutable", self.get(plain)["Cache-Control"])
+
+    def test_range_requests(self):
+        name = self.store("products/napa.jpg")
+        response = self.get(name, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 10-19/100")
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+
+        response = self.get(name, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), b"56789")
+        self.assertEqual(self.get(name, HTTP_RANGE="bytes=500-").status_code, 416)
+
+    @override_settings(MEDIA_SERVE_MODE="accel")
+    def test_accel_redirect(self):
+        name = self.store("products/napa.jpg")
+        response = self.get(name)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{name}")
+        self.assertEqual(response.content, b"")
+
+    def test_traversal_and_missing(self):
+        self.assertEqual(self.get("../settings.py").status_code, 404)
+        self.assertEqual(self.get("products/nope.jpg").status_code, 404)
+
+
+class CategoryStatsTests(TestCase):
+    def setUp(self):
+        self.fever = Category.objects.create(name="Fever")
+        self.cold = Category.objects.create(name="Cold")
+
+    def stats(self, category):
+        category.refresh_from_db()
+        return (category.product_count, category.in_stock_count, category.min_price, category.max_price)
+
+    def test_incremental_updates(self):
+        napa = make_product(self.fever, "Napa", price=Decimal("12.00"), stock=5)
+        ace = make_product(self.fever, "Ace", price=Decimal("8.50"), stock=0)
+        self.assertEqual(self.stats(self.fever), (2, 1, Decimal("8.50"), Decimal("12.00")))
+
+        # price change, stock shesh
+        ace = Product.objects.get(pk=ace.pk)
+        ace.price, ace.stock = Decimal("20.00"), 3
+        ace.save()
+        self.assertEqual(self.stats(self.fever), (2, 2, Decimal("12.00"), Decimal("20.00")))
+
+        # category change
+        napa = Product.objects.get(pk=napa.pk)
+        napa.category = self.cold
+        napa.save()
+        self.assertEqual(self.stats(self.fever), (1, 1, Decimal("20.00"), Decimal("20.00")))
+        self.assertEqual(self.stats(self.cold), (1, 1, Decimal("12.00"), Decimal("12.00")))
+
+        # deactivate + delete
+        ace.is_active = False
+        ace.save()
+        self.assertEqual(self.stats(self.fever), (0, 0, None, None))
+        napa.delete()
+        self.assertEqual(self.stats(self.cold), (0, 0, None, None))
+
+    def test_unchanged_save_does_not_touch_category(self):
+        product = Product.objects.get(pk=make_product(self.fever, "Napa").pk)
+        product.description = "new"
+        with CaptureQueriesContext(connection) as ctx:
+            product.save()
+        self.assertFalse([q for q in ctx.captured_queries if 'UPDATE "catalog_category"' in q["sql"]])
+
+    def test_stats_update_bumps_category_updated_at(self):
+        before = Category.objects.get(pk=self.fever.pk).updated_at
+        make_product(self.fever, "Napa", price=Decimal("5.00"))
+        self.assertGreater(Category.objects.get(pk=self.fever.pk).updated_at, before)
+
+    def test_save_without_snapshot_refreshes_only_affected_categories(self):
+        other = Category.objects.create(name="Allergy")
+        napa = make_product(self.fever, "Napa", price=Decimal("5.00"), stock=1)
+        # deferred instance: snapshot nai
+        deferred = Product.objects.only("pk", "category").get(pk=napa.pk)
+        deferred.category = self.cold
+        untouched = Category.objects.get(pk=other.pk).updated_at
+        deferred.save()
+        self.assertEqual(self.stats(self.fever), (0, 0, None, None))
+        self.assertEqual(self.stats(self.cold), (1, 1, Decimal("5.00"), Decimal("5.00")))
+        self.assertEqual(Category.objects.get(pk=other.pk).updated_at, untouched)
+
+    def test_stock_reservation_updates_in_stock_count(self):
+        make_product(self.fever, "Napa", stock=2)
+        reserve_stock([("napa", 2)])
+        self.assertEqual(self.stats(self.fever)[:2], (1, 0))
+
+    def test_reconcile_command(self):
+        make_product(self.fever, "Napa", price=Decimal("5.00"), stock=1)
+        Category.objects.update(product_count=99, min_price=None)
+        out = StringIO()
+        call_command("reconcile_category_stats", stdout=out)
+        self.assertIn("2 categories fixed", out.getvalue())  # cold: 99 -> 0
+        self.assertEqual(self.stats(self.fever), (1, 1, Decimal("5.00"), Decimal("5.00")))
+        self.assertEqual(self.stats(self.cold), (0, 0, None, None))
+
+    def test_exposed_on_category_api(self):
+        make_product(self.fever, "Napa", price=Decimal("5.00"), stock=1)
+        data = APIClient().get(f"/api/catalog/categories/{self.fever.slug}/").data
+        self.assertEqual((data["product_count"], data["min_price"]), (1, "5.00"))
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        category = Category.objects.create(name="Fever")
+        for i in range(3):
+            product = make_product(category, f"Napa {i}", description="<p>long html</p>" * 50)
+            ProductImage.objects.create(product=product, image=f"product_images/{i}.jpg")
+
+    def get(self, query):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/catalog/products/?{query}")
+        self.assertEqual(response.status_code, 200, response.data)
+        selects = [q["sql"] for q in ctx.captured_queries if '"catalog_product"."id"' in q["sql"]]
+        return response, selects, ctx.captured_queries
+
+    def test_fields_narrow_output_and_sql(self):
+        response, selects, queries = self.get("fields=name,price")
+        self.assertEqual(set(response.data["results"][0]), {"name", "price"})
+        self.assertNotIn("description", selects[0])
+        self.assertNotIn("catalog_category", selects[0])
+        self.assertFalse([q for q in queries if "catalog_productimage" in q["sql"]])
+        # next page cursor o kaj kore
+        response = self.client.get("/api/catalog/products/?fields=name&page_size=2")
+        self.assertEqual(len(self.client.get(response.data["next"]).data["results"]), 1)
+
+    def test_omit(self):
+        response, selects, _ = self.get("omit=description,images")
+        item = response.data["results"][0]
+        self.assertNotIn("description", item)
+        self.assertIn("category", item)
+        self.assertEqual(item["category"], "fever")
+        self.assertNotIn('"catalog_product"."description"', selects[0])
+
+    def test_compact_view(self):
+        full, _, full_queries = self.get("")
+        compact, selects, queries = self.get("view=compact")
+        item = compact.data["results"][0]
+        self.assertEqual(item["category"], "fever")
+        self.assertIn("image_variants", item)
+        self.assertNotIn("images", item)
+        self.assertLess(len(queries), len(full_queries))
+        self.assertLess(len(str(compact.data)) * 3, len(str(full.data)))
+
+    def test_unknown_field_rejected(self):
+        response = self.client.get("/api/catalog/products/?fields=name,secret")
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncReadTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Fever")
+        DisplayedCategories.objects.create(category=self.category, position=1)
+        for i in range(3):
+            product = make_product(self.category, f"Napa {i}")
+            ProductImage.objects.create(product=product, image=f"product_images/{i}.jpg")
+
+    async def test_payloads_match_sync_path(self):
+        from django.test import AsyncClient
+
+        client = AsyncClient()
+        for sync_url, async_url in [
+            ("/api/catalog/products/?page_size=2", "/api/catalog/async/products/?page_size=2"),
+            ("/api/catalog/products/?view=compact&search=napa", "/api/catalog/async/products/?view=compact&search=napa"),
+            ("/api/catalog/products/napa-1/?fields=name,images", "/api/catalog/async/products/napa-1/?fields=name,images"),
+            ("/api/catalog/categories/", "/api/catalog/async/categories/"),
+            ("/api/catalog/home-categories/", "/api/catalog/async/home-categories/"),
+        ]:
+            expected = await client.get(sync_url)
+            response = await client.get(async_url)
+            self.assertEqual(response.status_code, 200, async_url)
+            data = response.json()
+            if "next" in data:
+                # cursor link e path alada
+                self.assertEqual(data["results"], expected.json()["results"], async_url)
+                self.assertEqual(bool(data["next"]), bool(expected.json()["next"]))
+            else:
+                self.assertEqual(data, expected.json(), async_url)
+
+    async def test_variant_urls_resolved_off_the_event_loop(self):
+        from unittest import mock
+        from django.test import AsyncClient
+        from core import serializers as core_serializers
+
+        loop_thread, threads = threading.get_ident(), []
+        real = core_serializers.variant_urls
+
+        def record(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return real(*args, **kwargs)
+
+        with mock.patch.object(core_serializers, "variant_urls", side_effect=record):
+            response = await AsyncClient().get("/api/catalog/async/products/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(threads)
+        self.assertNotIn(loop_thread, threads)
+
+    async def test_next_page_and_errors(self):
+        from django.test import AsyncClient
+
+        client = AsyncClient()
+        first = (await client.get("/api/catalog/async/products/?page_size=2")).json()
+        self.assertIn("/api/catalog/async/products/", first["next"])
+        second = (await client.get(first["next"])).json()
+        self.assertEqual([p["name"] for p in second["results"]], ["Napa 2"])
+
+        self.assertEqual((await client.get("/api/catalog/async/products/nope/")).status_code, 404)
+        self.assertEqual((await client.get("/api/catalog/async/products/?fields=bad")).status_code, 400)
+        self.assertEqual((await client.post("/api/catalog/async/products/")).status_code, 405)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(TestCase):
+    # "replica" test e default er mirror, kintu alada connection: TestCase er
+    # uncommitted row replica te dekha jay na -- replication lag er moto
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        from accounts.models import User
+
+        catalog_cache.get_cache().clear()
+        cache.clear()
+        self.category = Category.objects.create(name="Fever")
+        self.product = make_product(self.category, "Napa")
+        self.staff = User.objects.create_user("staff", "staff@example.com", "pw", role="staff")
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections["replica"]) as replica:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(primary), len(replica)
+
+    def test_reads_go_to_replica(self):
+        response, primary, replica = self.get(APIClient(), "/api/catalog/products/?_=1")
+        self.assertEqual((primary, response.data["results"]), (0, []))
+        self.assertGreater(replica, 0)
+        _, primary, replica = self.get(APIClient(), "/api/catalog/home-categories/")
+        self.assertEqual(primary, 0)
+
+    async def test_async_reads_go_to_replica_unless_pinned(self):
+        from asgiref.sync import sync_to_async
+        from django.test import AsyncClient
+        from accounts.tokens import RefreshToken
+        from core.db import pin_to_primary
+
+        response = await AsyncClient().get("/api/catalog/async/products/")
+        # replica te TestCase er uncommitted row nai
+        self.assertEqual(response.json()["results"], [])
+
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.staff).access_token))()
+        await sync_to_async(pin_to_primary)(self.staff.pk)
+        response = await AsyncClient().get(
+            "/api/catalog/async/products/", headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual([p["name"] for p in response.json()["results"]], ["Napa"])
+
+    def test_user_reads_primary_after_own_write(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        response = client.patch(f"/api/catalog/products/{self.product.slug}/", {"price": "12.00"})
+        self.assertEqual(response.status_code, 200)
+
+        response, primary, replica = self.get(client, "/api/catalog/products/?_=2")
+        self.assertEqual([p["price"] for p in response.data["results"]], ["12.00"])
+        self.assertEqual(replica, 0)
+        # onno user er kono pin nai
+        _, primary, replica = self.get(APIClient(), "/api/catalog/products/?_=3")
+        self.assertEqual(primary, 0)
+
+    def test_replica_reads_not_cached_within_lag_window(self):
+        # setUp er product save e generation bump hoyeche; replica purono
+        url = "/api/catalog/products/?_=6"
+        client = APIClient()
+        first, _, _ = self.get(client, url)
+        second, _, replica = self.get(client, url)
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "MISS"))
+        self.assertGreater(replica, 0)
+
+        with override_settings(DATABASE_REPLICA_LAG_SECONDS=0):
+            self.get(client, url)
+        third, primary, replica = self.get(client, url)
+        self.assertEqual((third["X-Cache"], primary, replica), ("HIT", 0, 0))
+
+    def test_primary_reads_are_cached_right_after_a_change(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        client.patch(f"/api/catalog/products/{self.product.slug}/", {"price": "13.00"})
+        self.get(client, "/api/catalog/products/?_=7")  # pinned: primary
+        response, _, _ = self.get(client, "/api/catalog/products/?_=7")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_primary(self):
+        response, primary, replica = self.get(APIClient(), "/api/catalog/products/?_=4")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(replica, 0)
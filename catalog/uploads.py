@@ -0,0 +1,104 @@
+# catalog/uploads.py
+
+"""
+Product image upload (products/<slug>/images/).
+
+  - upload handler shudhu TemporaryFileUploadHandler: file 64 KB chunk e
+    disk e lekha hoy, memory te puro file thake na; FileSystemStorage
+    temp file ta rename kore niye ney (copy na)
+  - validation shudhu header pore (Image.open lazy, pixel decode kore na)
+  - sob image ek bulk_create e
+"""
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+from rest_framework.exceptions import ValidationError
+
+from accounts.files import file_cleanup
+from core.images import generate_variants_on_commit
+
+from .models import Product, ProductImage
+from .signals import notify_catalog_changed
+
+# MPO: phone camera r multi-picture JPEG, Pillow alada format bole
+ALLOWED_FORMATS = {"JPEG", "MPO", "PNG", "WEBP", "GIF"}
+
+
+def use_streaming_upload(request):
+    # request.data / FILES access er age call korte hobe
+    request.upload_handlers = [TemporaryFileUploadHandler(request)]
+
+
+def validate_image_header(upload):
+    """
+    (width, height) -- header theke, puro file decode na kore.
+    """
+    max_bytes = getattr(settings, "CATALOG_IMAGE_MAX_BYTES", 15 * 1024 * 1024)
+    max_side = getattr(settings, "CATALOG_IMAGE_MAX_SIDE", 8000)
+    min_side = getattr(settings, "CATALOG_IMAGE_MIN_SIDE", 1)
+
+    if upload.size > max_bytes:
+        raise ValidationError(f"{upload.name}: larger than {max_bytes} bytes.")
+    upload.seek(0)
+    try:
+        with Image.open(upload) as image:
+            fmt, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise ValidationError(f"{upload.name}: not a valid image.")
+    finally:
+        upload.seek(0)
+
+    if fmt not in ALLOWED_FORMATS:
+        raise ValidationError(f"{upload.name}: {fmt} images are not allowed.")
+    if max(width, height) > max_side or min(width, height) < min_side:
+        raise ValidationError(
+            f"{upload.name}: {width}x{height} outside {min_side}-{max_side} px."
+        )
+    return width, height
+
+
+def save_product_images(product, uploads):
+    """
+    Sob file validate, storage e save, tarpor ek bulk_create.
+    DB write fail korle save kora file gulo muche fela hoy.
+    """
+    max_files = getattr(settings, "CATALOG_IMAGE_MAX_FILES", 20)
+    if not uploads:
+        raise ValidationError({"images": "At least one file is required."})
+    if len(uploads) > max_files:
+        raise ValidationError({"images": f"At most {max_files} files per request."})
+
+    errors = []
+    for upload in uploads:
+        try:
+            validate_image_header(upload)
+        except ValidationError as exc:
+            errors.extend(exc.detail)
+    if errors:
+        raise ValidationError({"images": errors})
+
+    field = ProductImage._meta.get_field("image")
+    images, stored = [], []
+    try:
+        for upload in uploads:
+            image = ProductImage(product=product)
+            name = field.generate_filename(image, upload.name)
+            image.image = field.storage.save(name, upload, max_length=field.max_length)
+            stored.append(image.image.name)
+            images.append(image)
+
+        with transaction.atomic():
+            ProductImage.objects.bulk_create(images)
+            # bulk_create signal pathay na -- post_save er kaj gulo ekhane
+            Product.objects.filter(pk=product.pk).update(updated_at=timezone.now())
+            notify_catalog_changed()
+            for image in images:
+                generate_variants_on_commit(image.image)
+    except Exception:
+        for name in stored:
+            file_cleanup.put(name, field.storage)
+        raise
+    return images
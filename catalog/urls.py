@@ -1,11 +1,23 @@
 # catalog/urls.py
 
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import CategoryViewSet, ProductViewSet, DisplayedCategoryViewSet
+from . import async_views
+from .views import CategoryViewSet, ProductViewSet, DisplayedCategoryViewSet, HomeFeedView
 
 router = DefaultRouter()
 router.register("categories", CategoryViewSet, basename="category")
 router.register("products", ProductViewSet, basename="product")
 router.register("home-categories", DisplayedCategoryViewSet, basename="home-category")
 
-urlpatterns = router.urls
+# ASGI native read path (async_views.py)
+async_urlpatterns = [
+    path("async/products/", async_views.product_list, name="async-product-list"),
+    path("async/products/<slug:slug>/", async_views.product_detail, name="async-product-detail"),
+    path("async/categories/", async_views.category_list, name="async-category-list"),
+    path("async/home-categories/", async_views.home_category_list, name="async-home-category-list"),
+]
+
+urlpatterns = [
+    path("home-feed/", HomeFeedView.as_view(), name="home-feed"),
+] + async_urlpatterns + router.urls
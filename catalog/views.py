@@ -1,13 +1,32 @@
 # catalog/views.py
 
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Category, Product, DisplayedCategories
 from .serializers import (
     CategorySerializer,
+    ProductImageSerializer,
+    ProductListSerializer,
     ProductSerializer,
     DisplayedCategorySerializer,
+    StockAdjustmentSerializer,
 )
+from .cache import CachedResponseMixin
+from .conditional import ConditionalGetMixin
+from .home_feed import get_home_feed
+from .importers import ProductImporter, detect_format, iter_rows, open_text
+from .inventory import release_stock, reserve_stock
+from .pagination import KeysetCursorPagination
+from .search import search_products
+from .sparse import SparseFieldsViewMixin
+from .suggest import suggest_index
+from .uploads import save_product_images, use_streaming_upload
 from accounts.constants import ROLE_STAFF
+from core.db import ReplicaReadMixin
 
 
 class IsStaffOrReadOnly(permissions.BasePermission):
@@ -27,7 +46,32 @@ class IsStaffOrReadOnly(permissions.BasePermission):
         )
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+def filter_products(qs, params):
+    """
+    ?search / ?category / ?min_price / ?max_price -- sync ar async
+    (async_views.py) dui path e same filter.
+    Return: (queryset, cursor_ordering ba None)
+    """
+    cursor_ordering = None
+    search = params.get("search")
+    category_slug = params.get("category")
+    min_price = params.get("min_price")
+    max_price = params.get("max_price")
+
+    if search:
+        qs = search_products(qs, search)
+        # search hole relevance order e page kori
+        cursor_ordering = ("-search_rank", "id")
+    if category_slug:
+        qs = qs.filter(category__slug=category_slug)
+    if min_price:
+        qs = qs.filter(price__gte=min_price)
+    if max_price:
+        qs = qs.filter(price__lte=max_price)
+    return qs, cursor_ordering
+
+
+class CategoryViewSet(ReplicaReadMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     /api/catalog/categories/
     /api/catalog/categories/<slug>/
@@ -36,6 +80,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [IsStaffOrReadOnly]
     lookup_field = "slug"  # slug diye retrieve/update/delete
+    pagination_class = KeysetCursorPagination
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -45,42 +90,160 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return qs
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, CachedResponseMixin, SparseFieldsViewMixin,
+    viewsets.ModelViewSet,
+):
     """
     /api/catalog/products/
     /api/catalog/products/<slug>/
     Filters:
-      ?search=para
+      ?search=para        full-text (name, generic, brand, description), rank order
       ?category=pain-relief
       ?min_price=10&max_price=100
+    Pagination (keyset, name + id):
+      ?page_size=10
+      ?cursor=<next/previous link theke>
+    Shape:
+      ?view=compact                  chhoto list representation
+      ?fields=name,price,image_variants / ?omit=description,images
     """
-    queryset = Product.objects.filter(is_active=True).select_related("category")
+    # category join + images ek batch query te (N+1 na)
+    queryset = (
+        Product.objects.filter(is_active=True)
+        .select_related("category")
+        .prefetch_related("images")
+    )
     serializer_class = ProductSerializer
     permission_classes = [IsStaffOrReadOnly]
     lookup_field = "slug"
+    pagination_class = KeysetCursorPagination
 
     def get_queryset(self):
-        qs = super().get_queryset()
-        request = self.request
+        qs, cursor_ordering = filter_products(super().get_queryset(), self.request.query_params)
+        if cursor_ordering:
+            self.cursor_ordering = cursor_ordering
+
+        # dorkari column/join/prefetch chara baki baad
+        selected = self.get_sparse_fields()
+        if selected is None and self.is_compact():
+            selected = list(ProductListSerializer().fields)
+        if selected is not None:
+            qs = self.narrow_queryset(qs, selected)
+        return qs
 
-        search = request.query_params.get("search")
-        category_slug = request.query_params.get("category")
-        min_price = request.query_params.get("min_price")
-        max_price = request.query_params.get("max_price")
+    def is_compact(self):
+        return (
+            self.action in ("list", "retrieve")
+            and self.request.query_params.get("view") == "compact"
+        )
 
-        if search:
-            qs = qs.filter(name__icontains=search)
-        if category_slug:
-            qs = qs.filter(category__slug=category_slug)
-        if min_price:
-            qs = qs.filter(price__gte=min_price)
-        if max_price:
-            qs = qs.filter(price__lte=max_price)
+    def get_serializer_class(self):
+        if self.is_compact():
+            return ProductListSerializer
+        return super().get_serializer_class()
 
-        return qs
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        POST /api/catalog/products/import/   (staff only, multipart)
+          file=<products.csv | products.jsonl>
+          ?kind=csv|jsonl  (default: file extension theke)
+          ?chunk_size=500
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "file is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.query_params.get("kind") or detect_format(upload.name)
+        try:
+            chunk_size = int(request.query_params.get("chunk_size", 500))
+        except ValueError:
+            chunk_size = 500
+        importer = ProductImporter(chunk_size=chunk_size)
+        try:
+            report = importer.run(iter_rows(open_text(upload.file), fmt))
+        except ValueError as exc:
+            data = {"detail": str(exc)}
+            if importer.report is not None:
+                # error er age commit hoye jaoa row gulo
+                data.update(importer.report.as_dict())
+            return Response(data, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.as_dict())
 
+    @action(detail=True, methods=["post"], url_path="images", parser_classes=[MultiPartParser])
+    def upload_images(self, request, slug=None):
+        """
+        POST /api/catalog/products/<slug>/images/   (staff only, multipart)
+          images=<file> images=<file> ...
+        File disk e stream hoy, header theke dimension check, ek bulk_create.
+        """
+        use_streaming_upload(request._request)
+        # images prefetch lage na
+        product = get_object_or_404(Product.objects.filter(is_active=True), slug=slug)
+        self.check_object_permissions(request, product)
+        images = save_product_images(product, request.FILES.getlist("images"))
+        serializer = ProductImageSerializer(images, many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class DisplayedCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+    def _stock_lines(self, request):
+        serializer = StockAdjustmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        return [(line["slug"], line["quantity"]) for line in data["lines"]], data["all_or_nothing"]
+
+    @action(detail=False, methods=["post"], url_path="reserve-stock")
+    def reserve_stock(self, request):
+        """
+        POST /api/catalog/products/reserve-stock/   (staff only)
+        {"lines": [{"slug": "napa", "quantity": 2}], "all_or_nothing": false}
+        Sob line ek transaction e; kon line fail korlo response e bole dei.
+        Reservation er owner / expiry nai, tai customer na -- staff ba
+        trusted checkout code (reserve_stock() sorasori); line e
+        CATALOG_STOCK_MAX_LINE_QUANTITY porjonto.
+        """
+        lines, all_or_nothing = self._stock_lines(request)
+        ok, results = reserve_stock(lines, all_or_nothing=all_or_nothing)
+        return Response(
+            {"ok": ok, "lines": results},
+            status=status.HTTP_200_OK if ok else status.HTTP_409_CONFLICT,
+        )
+
+    @action(detail=False, methods=["post"], url_path="release-stock")
+    def release_stock(self, request):
+        """
+        POST /api/catalog/products/release-stock/   (staff only)
+        Reserve kora stock ferot, same body.
+        """
+        lines, _ = self._stock_lines(request)
+        ok, results = release_stock(lines)
+        return Response(
+            {"ok": ok, "lines": results},
+            status=status.HTTP_200_OK if ok else status.HTTP_409_CONFLICT,
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.AllowAny],
+        authentication_classes=[],  # token thakleo user load kori na, DB hit nai
+    )
+    def suggest(self, request):
+        """
+        GET /api/catalog/products/suggest/?q=paracitamol&limit=10
+        Typo-tolerant autocomplete, in-memory trigram index theke.
+        """
+        query = request.query_params.get("q", "")
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 20))
+        except ValueError:
+            limit = 10
+        return Response({"query": query, "results": suggest_index.suggest(query, limit)})
+
+
+class DisplayedCategoryViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet
+):
     """
     Home page e kon category gulo dekhabo + order.
     /api/catalog/home-categories/
@@ -88,3 +251,22 @@ class DisplayedCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = DisplayedCategories.objects.select_related("category")
     serializer_class = DisplayedCategorySerializer
     permission_classes = [permissions.AllowAny]
+    # position change e category.updated_at bodlay na, tai ETag (generation) e bhorsha
+    last_modified_field = None
+
+
+class HomeFeedView(APIView):
+    """
+    GET /api/catalog/home-feed/?limit=4
+    Home page er sob category + tader top product, ek response e.
+    Precomputed snapshot theke (home_feed.py), request e DB hit nai.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request, *args, **kwargs):
+        feed = get_home_feed()
+        limit = request.query_params.get("limit")
+        if limit and limit.isdigit():
+            feed = [dict(entry, products=entry["products"][:int(limit)]) for entry in feed]
+        return Response(feed)
@@ -0,0 +1,51 @@
+# core/admin.py
+
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at", "method", "path", "route", "status_code", "duration_ms",
+        "sample_count", "trigger", "user", "download",
+    )
+    list_filter = ("trigger", "route", "method")
+    search_fields = ("path", "route")
+    date_hierarchy = "created_at"
+    # stacks onek boro, list e na; detail view-only
+    readonly_fields = ("download",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/collapsed/",
+                self.admin_site.admin_view(self.collapsed_view),
+                name="core_requestprofile_collapsed",
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description="Flamegraph")
+    def download(self, obj):
+        url = reverse("admin:core_requestprofile_collapsed", args=[obj.pk])
+        return format_html('<a href="{}">profile-{}.folded</a>', url, obj.pk)
+
+    def collapsed_view(self, request, pk):
+        # flamegraph.pl / speedscope / inferno e sorasori
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            return HttpResponse(status=403)
+        response = HttpResponse(profile.stacks + "\n", content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="profile-{pk}.folded"'
+        return response
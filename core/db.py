@@ -0,0 +1,142 @@
+# core/db.py
+
+"""
+Read replica routing.
+
+Shudhu ReplicaReadMixin wala view er GET/HEAD body te read replica te jay
+(settings.DATABASE_REPLICAS); baki sob read/write primary ("default") e.
+Context var diye, tai thread / async request e alada thake.
+
+Read-your-writes: user er successful write (POST/PUT/PATCH/DELETE) er por
+DATABASE_PIN_SECONDS sec tar read primary te (PrimaryPinMiddleware). Pin
+DATABASE_PIN_CACHE e thake -- onek worker process hole shared cache lagbe.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY = "default"
+PIN_KEY = "db:pin:%s"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+def reading_replica():
+    """Ei request er read ekhon replica te jacche?"""
+    return _replica_reads.get() and bool(replica_aliases())
+
+
+def _pin_cache():
+    return caches[getattr(settings, "DATABASE_PIN_CACHE", "default")]
+
+
+def pin_to_primary(user_id):
+    _pin_cache().set(PIN_KEY % user_id, 1, timeout=getattr(settings, "DATABASE_PIN_SECONDS", 10))
+
+
+def is_pinned(user):
+    if user is None or not user.is_authenticated:
+        return False
+    return _pin_cache().get(PIN_KEY % user.pk) is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            replicas = replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica primary er copy, tai ek database dhora
+        aliases = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+def use_replica(request):
+    """DRF request er read replica te jabe? (GET/HEAD, pinned user na)"""
+    return request.method in SAFE_METHODS and bool(replica_aliases()) and not is_pinned(request.user)
+
+
+def start_replica_reads():
+    """Context var on; token diye `stop_replica_reads`."""
+    return _replica_reads.set(True)
+
+
+def stop_replica_reads(token):
+    _replica_reads.reset(token)
+
+
+class ReplicaReadMixin:
+    """
+    DRF view: GET/HEAD er view body replica theke (authentication er pore,
+    jate pinned user primary te thake). Response render er age off.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if use_replica(request):
+            self._replica_token = start_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            stop_replica_reads(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class PrimaryPinMiddleware:
+    """
+    Authenticated user er successful write er por take primary te pin.
+    request.user DRF authentication er pore set hoy (JWT user o).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _pin(self, request, response):
+        if response.status_code >= 400 or not replica_aliases():
+            return
+        # session user lazy, tai async e eta thread e
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            self._pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            await sync_to_async(self._pin)(request, response)
+        return response
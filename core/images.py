@@ -0,0 +1,185 @@
+# core/images.py
+
+"""
+Upload kora image er resized WebP variant.
+
+    products/napa.jpg -> products/napa.thumb.webp, products/napa.medium.webp
+
+Variant er nam original theke ashe, tai DB column lage na -- serializer
+nam theke URL banay. Generate hoy commit er pore, bounded thread pool e
+(Pillow decode/resize/encode GIL chere dey), request thread e na.
+
+Variant file na thakle (job pending / fail) URL original er. Ache kina
+process er `_existing` set e mone rakhi (variant ekbar banle delete
+porjonto thake), tai list e protita image e storage stat lage na --
+shudhu ekhono na bana gulo check hoy.
+
+Memory: JPEG e `draft()` decode e i chhoto kore, tarpor `thumbnail()`;
+puro resolution bitmap memory te ase na.
+"""
+
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from accounts.files import delete_on_commit
+
+logger = logging.getLogger(__name__)
+
+VARIANT_FORMAT = "webp"
+
+_existing = set()  # variant name
+_existing_lock = threading.Lock()
+
+
+def variant_exists(storage, name):
+    if name in _existing:
+        return True
+    if storage.exists(name):
+        with _existing_lock:
+            _existing.add(name)
+        return True
+    return False
+
+
+def _forget(names):
+    with _existing_lock:
+        _existing.difference_update(names)
+
+
+def variant_sizes():
+    # {"thumb": 200, "medium": 800} -- lomba dik er max px
+    return getattr(settings, "IMAGE_VARIANTS", {"thumb": 200, "medium": 800})
+
+
+def variant_name(name, variant):
+    stem, _ = os.path.splitext(name)
+    return f"{stem}.{variant}.{VARIANT_FORMAT}"
+
+
+def is_variant_name(name):
+    stem, ext = os.path.splitext(name)
+    return ext == f".{VARIANT_FORMAT}" and os.path.splitext(stem)[1][1:] in variant_sizes()
+
+
+def variant_names(name):
+    return {variant: variant_name(name, variant) for variant in variant_sizes()}
+
+
+def _render(source, max_side):
+    image = source.copy()
+    image.thumbnail((max_side, max_side), Image.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=getattr(settings, "IMAGE_VARIANT_QUALITY", 80), method=4)
+    return buffer.getvalue()
+
+
+def generate_variants(storage, name, force=False):
+    """
+    `name` er sob variant banay (age theke thakle skip, force chara).
+    Return: banano variant er nam list.
+    """
+    targets = {
+        variant: target for variant, target in variant_names(name).items()
+        if force or not storage.exists(target)
+    }
+    if not targets:
+        return []
+
+    largest = max(variant_sizes()[variant] for variant in targets)
+    created = []
+    with storage.open(name, "rb") as fh:
+        with Image.open(fh) as source:
+            # JPEG: dorkar er kachakachi scale e decode
+            source.draft("RGB", (largest, largest))
+            source = ImageOps.exif_transpose(source)
+            for variant, target in targets.items():
+                data = _render(source, variant_sizes()[variant])
+                if storage.exists(target):
+                    storage.delete(target)
+                created.append(storage.save(target, ContentFile(data)))
+    with _existing_lock:
+        _existing.update(created)
+    return created
+
+
+class VariantPool:
+    def __init__(self):
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self):
+        return getattr(settings, "IMAGE_WORKERS", 0) or os.cpu_count() or 1
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="imgvariant"
+                    )
+        return self._executor
+
+    def _run(self, storage, name, force):
+        try:
+            return generate_variants(storage, name, force=force)
+        except Exception:
+            logger.exception("Could not generate variants for %s", name)
+            return []
+
+    def submit(self, storage, name, force=False):
+        future = self._get_executor().submit(self._run, storage, name, force)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def wait(self):
+        """Pending sob job shesh howa porjonto (test / command)."""
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending)
+
+
+variant_pool = VariantPool()
+
+
+def generate_variants_on_commit(fieldfile):
+    if fieldfile:
+        storage, name = fieldfile.storage, fieldfile.name
+        transaction.on_commit(lambda: variant_pool.submit(storage, name))
+
+
+def delete_with_variants_on_commit(name, storage=None):
+    delete_on_commit(name, storage)
+    targets = list(variant_names(name).values())
+    for target in targets:
+        delete_on_commit(target, storage)
+    transaction.on_commit(lambda: _forget(targets))
+
+
+def variant_urls(fieldfile, request=None):
+    if not fieldfile:
+        return None
+    storage = fieldfile.storage
+    urls = {}
+    for variant, target in variant_names(fieldfile.name).items():
+        # variant ekhono na banle original
+        url = storage.url(target if variant_exists(storage, target) else fieldfile.name)
+        urls[variant] = request.build_absolute_uri(url) if request is not None else url
+    return urls
@@ -0,0 +1,82 @@
+# core/management/commands/generate_image_variants.py
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+
+from core.images import generate_variants
+from accounts.models import UserProfile
+from catalog.models import Product, ProductImage
+
+SOURCES = {
+    "product": (Product, "image"),
+    "product-image": (ProductImage, "image"),
+    "profile": (UserProfile, "profile_picture"),
+}
+
+
+class Command(BaseCommand):
+    help = "Generate thumb/medium WebP variants for existing product images and profile pictures."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source", action="append", choices=list(SOURCES),
+            help="Repeatable; default all.",
+        )
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--force", action="store_true", help="Regenerate existing variants.")
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        # ek sathe workers*2 er beshi image memory te na
+        max_in_flight = workers * 2
+        done = created = failed = 0
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            for name, storage in self._iter_files(options["source"] or list(SOURCES)):
+                if len(in_flight) >= max_in_flight:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    c, f = self._collect(finished)
+                    created, failed = created + c, failed + f
+                    done += len(finished)
+                in_flight.add(pool.submit(self._process, storage, name, options["force"]))
+            c, f = self._collect(wait(in_flight).done)
+            created, failed = created + c, failed + f
+            done += len(in_flight)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{done} images checked, {created} variants written, {failed} failed "
+            f"({elapsed:.2f}s)."
+        ))
+
+    def _iter_files(self, sources):
+        for source in sources:
+            model, field_name = SOURCES[source]
+            storage = model._meta.get_field(field_name).storage
+            names = (
+                model.objects.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True).order_by("pk")
+            )
+            # iterator: puro list memory te na
+            for name in names.iterator(chunk_size=500):
+                yield name, storage
+
+    def _process(self, storage, name, force):
+        try:
+            return len(generate_variants(storage, name, force=force)), None
+        except Exception as exc:
+            return 0, f"{name}: {exc}"
+
+    def _collect(self, futures):
+        created = failed = 0
+        for future in futures:
+            count, error = future.result()
+            created += count
+            if error:
+                failed += 1
+                self.stderr.write(error)
+        return created, failed
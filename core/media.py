@@ -0,0 +1,149 @@
+# core/media.py
+
+"""
+MEDIA_URL serve, DEBUG chara o.
+
+MEDIA_SERVE_MODE:
+  python   -- FileResponse; server er wsgi.file_wrapper thakle (gunicorn,
+              uwsgi) puro file sendfile() e jay, Python buffer e na.
+              Range request nije handle kori (partial ta Python diye pore).
+  sendfile -- X-Sendfile header (Apache mod_xsendfile, lighttpd); file
+              server pathay, Range o server handle kore.
+  accel    -- X-Accel-Redirect (nginx internal location MEDIA_ACCEL_PREFIX).
+
+Content-hashed nam (core/storage.py) hole `immutable`, 1 bochhor cache;
+purono nam gulo chhoto max-age + Last-Modified/ETag.
+"""
+
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .storage import is_hashed_name
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+class RangeFile:
+    """File er ekta byte range, read() limit er beshi dey na."""
+
+    def __init__(self, fh, start, length):
+        self.fh = fh
+        self.remaining = length
+        fh.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(min(size, CHUNK_SIZE))
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fh.close()
+
+
+def parse_range(header, size):
+    """
+    Single range "bytes=a-b" -> (start, end) inclusive; na bujhle None,
+    satisfiable na hole ValueError.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # "bytes=-500": shesher 500
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+def _cache_headers(response, path, stat):
+    if is_hashed_name(path):
+        patch_cache_control(
+            response, public=True, immutable=True,
+            max_age=getattr(settings, "MEDIA_IMMUTABLE_MAX_AGE", 31536000),
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=getattr(settings, "MEDIA_MAX_AGE", 3600))
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["ETag"] = '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+    response["Accept-Ranges"] = "bytes"
+
+
+@require_safe
+def serve_media(request, path):
+    path = posixpath.normpath(path).lstrip("/")
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Not found.")
+    if not os.path.isfile(fullpath):
+        raise Http404("Not found.")
+
+    stat = os.stat(fullpath)
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or "application/octet-stream"
+
+    probe = HttpResponse()
+    _cache_headers(probe, path, stat)
+    # 304 / 412 hole notun response, na hole probe ferot ase
+    conditional = get_conditional_response(
+        request, etag=probe["ETag"], last_modified=int(stat.st_mtime), response=probe
+    )
+    if conditional is not probe:
+        return conditional
+
+    mode = getattr(settings, "MEDIA_SERVE_MODE", "python")
+    if mode in ("sendfile", "accel"):
+        response = HttpResponse(content_type=content_type)
+        if mode == "sendfile":
+            response["X-Sendfile"] = fullpath
+        else:
+            prefix = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/")
+            response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + path
+        _cache_headers(response, path, stat)
+        return response
+
+    byte_range = None
+    range_header = request.META.get("HTTP_RANGE")
+    # If-Range mile na gele puro file
+    if range_header and request.META.get("HTTP_IF_RANGE", probe["ETag"]) == probe["ETag"]:
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+
+    fh = open(fullpath, "rb")
+    if byte_range is None:
+        response = FileResponse(fh, content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(RangeFile(fh, start, length), content_type=content_type, status=206)
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    if encoding:
+        response["Content-Encoding"] = encoding
+    _cache_headers(response, path, stat)
+    return response
@@ -0,0 +1,260 @@
+# core/metrics.py
+
+"""
+Per-route request metrics, Prometheus text format e /api/metrics/ (staff).
+
+Route = URL er view_name (product-list, profile_me, login, admin:index ...).
+Protita request e:
+  - latency, response size
+  - SQL query count + time: sob connection e ekbar execute wrapper boshe
+    (connection_created), request er context var e jog kore; async view er
+    ORM thread e o context copy hoy, tai dhora pore
+  - serializer time: TimedSerializerMixin wala serializer er top-level
+    to_representation (nested / list item double count hoy na). Lazy
+    relation er query o er moddhe pore.
+  - catalog response cache hit / miss (catalog/cache.py)
+
+Process local: prottek worker nijer count rakhe, Prometheus protita worker
+scrape kore (ba sum). Observe e ek lock + bisect, production e on rakha jay.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from accounts.constants import ROLE_STAFF
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+_current = ContextVar("request_metrics", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames):
+        self.name, self.documentation, self.labelnames = name, documentation, labelnames
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets, labelnames=("route", "method")):
+        self.name, self.documentation, self.labelnames = name, documentation, labelnames
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> [bucket count ... +Inf count, sum]; cumulative render e
+        self._series = {}
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "Requests by route, method and status.",
+                   ("route", "method", "status"))
+LATENCY = Histogram("http_request_duration_seconds", "Request latency.", LATENCY_BUCKETS)
+DB_QUERIES = Histogram("http_request_db_queries", "SQL queries per request.", QUERY_BUCKETS)
+DB_TIME = Histogram("http_request_db_duration_seconds", "SQL time per request.", LATENCY_BUCKETS)
+SERIALIZER_TIME = Histogram("http_request_serializer_duration_seconds",
+                            "Serializer to_representation time per request.", LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size.", SIZE_BUCKETS)
+# catalog response cache (catalog/cache.py), result = hit | miss
+RESPONSE_CACHE = Counter("http_response_cache_total", "Response cache lookups by route and result.",
+                         ("route", "result"))
+METRICS = (REQUESTS, LATENCY, DB_QUERIES, DB_TIME, SERIALIZER_TIME, RESPONSE_SIZE, RESPONSE_CACHE)
+
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "serializer_time", "serializer_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += perf_counter() - started
+
+
+def install_query_wrapper(connection, **kwargs):
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+connection_created.connect(install_query_wrapper)
+
+
+class TimedSerializerMixin:
+    def to_representation(self, instance):
+        stats = _current.get()
+        if stats is None or stats.serializer_depth:
+            return super().to_representation(instance)
+        stats.serializer_depth += 1
+        started = perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            stats.serializer_time += perf_counter() - started
+            stats.serializer_depth -= 1
+
+
+def _response_size(response):
+    if not response.streaming:
+        return len(response.content)
+    length = response.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+class MetricsMiddleware:
+    """MIDDLEWARE er prothome, jate baki middleware er somoy o dhora pore."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # signal er age khola connection (startup check)
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, stats, perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, stats, perf_counter() - started)
+        return response
+
+    def _record(self, request, response, stats, elapsed):
+        match = request.resolver_match
+        route = match.view_name if match else "unmatched"
+        method = request.method if request.method in METHODS else "other"
+        labels = (route, method)
+
+        REQUESTS.inc((route, method, str(response.status_code)))
+        LATENCY.observe(labels, elapsed)
+        DB_QUERIES.observe(labels, stats.queries)
+        DB_TIME.observe(labels, stats.db_time)
+        if stats.serializer_time:
+            SERIALIZER_TIME.observe(labels, stats.serializer_time)
+        size = _response_size(response)
+        if size is not None:
+            RESPONSE_SIZE.observe(labels, size)
+
+
+class IsStaffUser(permissions.BasePermission):
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (
+            getattr(user, "role", None) == ROLE_STAFF or getattr(user, "is_staff", False)
+        ))
+
+
+class MetricsView(APIView):
+    """GET /api/metrics/ -- Prometheus scrape (staff JWT / admin session)."""
+    # default shudhu JWT; admin e login kora staff browser theke o dekhe
+    authentication_classes = [*api_settings.DEFAULT_AUTHENTICATION_CLASSES, SessionAuthentication]
+    permission_classes = [IsStaffUser]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
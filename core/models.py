@@ -0,0 +1,38 @@
+# core/models.py
+
+from django.conf import settings
+from django.db import models
+
+TRIGGER_FLAG = "flag"
+TRIGGER_SAMPLE = "sample"
+
+
+class RequestProfile(models.Model):
+    """
+    Ek request er sampled stack (core/profiling.py), collapsed format:
+    "frame;frame;frame count" protita line -- flamegraph.pl / speedscope
+    sorasori pore.
+    """
+    TRIGGER_CHOICES = (
+        (TRIGGER_FLAG, "Staff flag"),
+        (TRIGGER_SAMPLE, "Background sample"),
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    route = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    sample_count = models.PositiveIntegerField(default=0)
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    stacks = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
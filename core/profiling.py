@@ -0,0 +1,248 @@
+# core/profiling.py
+
+"""
+Request profiler: sampling, collapsed stack (flamegraph) output.
+
+Kon request:
+  - staff user `X-Profile: 1` header ba `?_profile=1` dile (JWT claim /
+    admin session diye check, view er age; tai middleware
+    AuthenticationMiddleware er pore)
+  - PROFILING_SAMPLE_RATE (0..1) bhag request random e, background e
+
+Ek process e ekta sampler thread, PROFILING_INTERVAL sec por por
+profiled request er thread er stack (sys._current_frames) tule ney;
+kono profiled request na thakle ghumay. cProfile er moto protita
+function call e hook nai, tai overhead interval er upor.
+Result RequestProfile e (admin e list + .folded download); flag request
+er response e X-Profile-Id.
+
+ASGI te sync view (DRF viewset) event loop e na, asgiref er executor
+thread e chole: process_view (oi thread ei chole) sampling ta sekhane
+soriye ney. Async view e shudhu event loop thread er stack; ORM query er
+thread (sync_to_async) dhora pore na.
+"""
+
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from time import perf_counter, sleep
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.constants import ROLE_STAFF
+
+from .models import TRIGGER_FLAG, TRIGGER_SAMPLE, RequestProfile
+
+MAX_DEPTH = 128
+SITE_PACKAGES = "site-packages" + os.sep
+
+_labels = {}  # code object -> frame label
+
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        base = str(settings.BASE_DIR) + os.sep
+        if SITE_PACKAGES in filename:
+            filename = filename.rsplit(SITE_PACKAGES, 1)[1]
+        elif filename.startswith(base):
+            filename = filename[len(base):]
+        else:
+            filename = os.path.basename(filename)
+        name = getattr(code, "co_qualname", code.co_name)
+        # collapsed format e ";" frame separator
+        label = _labels[code] = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+    return label
+
+
+def collapse(frame):
+    """Leaf frame -> "root;...;leaf"."""
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._targets = {}  # thread id -> [Counter, ...] (event loop e eksathe onek request)
+        self._active = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id=None):
+        thread_id = thread_id or threading.get_ident()
+        samples = Counter()
+        with self._lock:
+            self._targets.setdefault(thread_id, []).append(samples)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+            self._active.set()
+        return thread_id, samples
+
+    def _detach(self, thread_id, samples):
+        # identity diye: khali Counter gulo == e soman
+        sessions = [other for other in self._targets.get(thread_id, []) if other is not samples]
+        if sessions:
+            self._targets[thread_id] = sessions
+        else:
+            self._targets.pop(thread_id, None)
+
+    def move(self, session, thread_id=None):
+        """Session er samples ekhon theke onno thread theke (default: current)."""
+        old_id, samples = session
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            self._detach(old_id, samples)
+            self._targets.setdefault(thread_id, []).append(samples)
+        return thread_id, samples
+
+    def stop(self, session):
+        thread_id, samples = session
+        with self._lock:
+            self._detach(thread_id, samples)
+            if not self._targets:
+                self._active.clear()
+        return samples
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            sleep(self.interval)
+            with self._lock:
+                targets = {tid: list(sessions) for tid, sessions in self._targets.items()}
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for thread_id, sessions in targets.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = collapse(frame)
+                for samples in sessions:
+                    samples[stack] += 1
+
+
+sampler = StackSampler()
+
+
+def _is_staff(user):
+    return bool(user and user.is_authenticated and (
+        getattr(user, "role", None) == ROLE_STAFF or getattr(user, "is_staff", False)
+    ))
+
+
+def staff_user(request):
+    """Flag request er user, staff hole; JWT (claim, DB chara) ba admin session."""
+    try:
+        result = ClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    user = result[0] if result else getattr(request, "user", None)
+    return user if _is_staff(user) else None
+
+
+def _flagged(request):
+    header = getattr(settings, "PROFILING_HEADER", "X-Profile")
+    param = getattr(settings, "PROFILING_QUERY_PARAM", "_profile")
+    return request.headers.get(header) == "1" or request.GET.get(param) == "1"
+
+
+def save_profile(request, response, trigger, samples, elapsed, user=None):
+    user = user or getattr(request, "user", None)
+    match = request.resolver_match
+    profile = RequestProfile.objects.create(
+        method=request.method,
+        path=request.get_full_path()[:500],
+        route=match.view_name if match else "",
+        status_code=response.status_code,
+        duration_ms=elapsed * 1000,
+        sample_count=sum(samples.values()),
+        trigger=trigger,
+        user_id=user.pk if user is not None and user.is_authenticated else None,
+        stacks="\n".join(f"{stack} {count}" for stack, count in samples.most_common()),
+    )
+    keep = getattr(settings, "PROFILING_KEEP", 500)
+    # protita 100 ta por por purono gulo kete PROFILING_KEEP e
+    if keep and profile.pk % 100 == 0:
+        cutoff = list(RequestProfile.objects.order_by("-pk").values_list("pk", flat=True)[keep:keep + 1])
+        if cutoff:
+            RequestProfile.objects.filter(pk__lte=cutoff[0]).delete()
+    return profile
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        sampler.interval = getattr(settings, "PROFILING_INTERVAL", sampler.interval)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _trigger(self, request, user):
+        if user is not None:
+            return TRIGGER_FLAG
+        rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0)
+        if rate and random.random() < rate:
+            return TRIGGER_SAMPLE
+        return None
+
+    def _finish(self, request, response, trigger, samples, elapsed, user):
+        profile = save_profile(request, response, trigger, samples, elapsed, user)
+        if trigger == TRIGGER_FLAG:
+            response["X-Profile-Id"] = str(profile.pk)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # ASGI: Django sync process_view sync view er thread ei chalay
+        session = getattr(request, "_profile_session", None)
+        if session is not None and not iscoroutinefunction(view_func):
+            request._profile_session = sampler.move(session)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user = staff_user(request) if _flagged(request) else None
+        trigger = self._trigger(request, user)
+        if trigger is None:
+            return self.get_response(request)
+
+        session = sampler.start()
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            samples = sampler.stop(session)
+        self._finish(request, response, trigger, samples, perf_counter() - started, user)
+        return response
+
+    async def __acall__(self, request):
+        # JWT user cache miss / session user lookup e DB lagte pare, tai flag thaklei thread e
+        user = await sync_to_async(staff_user)(request) if _flagged(request) else None
+        trigger = self._trigger(request, user)
+        if trigger is None:
+            return await self.get_response(request)
+
+        request._profile_session = sampler.start()
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            samples = sampler.stop(request._profile_session)
+        await sync_to_async(self._finish)(
+            request, response, trigger, samples, perf_counter() - started, user
+        )
+        return response
@@ -0,0 +1,19 @@
+# core/serializers.py
+
+from rest_framework import serializers
+
+from .images import variant_urls
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Image field er resized WebP variant URL: {"thumb": ..., "medium": ...}
+    (image na thakle null). Variant ekhono na banle original er URL.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return variant_urls(value, self.context.get("request"))
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -30,10 +31,14 @@ INSTALLED_APPS = [
     # Local apps
     'accounts',
     'catalog',
+    # request profile (core/profiling.py)
+    'core',
 ]
 
 # --- Middleware ---
 MIDDLEWARE = [
+    # per-route latency / query / serializer metrics (core/metrics.py), sobar age
+    "core.metrics.MetricsMiddleware",
     'django.middleware.security.SecurityMiddleware',
 
     # CORS on top
@@ -43,8 +48,13 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # staff flag / sample rate e request profile (core/profiling.py);
+    # Authentication er por, jate admin session er request.user thake
+    "core.profiling.ProfilingMiddleware",
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # write er por user er read primary te (core/db.py)
+    "core.db.PrimaryPinMiddleware",
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -68,24 +78,210 @@ TEMPLATES = [
 WSGI_APPLICATION = 'core.wsgi.application'
 
 # --- Database ---
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DATABASE_BACKEND = sqlite (default) | postgres
+DATABASE_BACKEND = os.environ.get("DATABASE_BACKEND", "sqlite")
+
+if DATABASE_BACKEND == "postgres":
+    _PRIMARY = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get("DB_NAME", "desh_medicine"),
+        'USER': os.environ.get("DB_USER", "postgres"),
+        'PASSWORD': os.environ.get("DB_PASSWORD", ""),
+        'HOST': os.environ.get("DB_HOST", "localhost"),
+        'PORT': os.environ.get("DB_PORT", "5432"),
+        # reuse er age connection ta beche ache kina dekhe (restart / failover)
+        'CONN_HEALTH_CHECKS': True,
     }
-}
+    if os.environ.get("DB_POOL", "1") == "1":
+        # Django 5.2 built-in pool (psycopg[pool] lage); pool e persistent
+        # connection (CONN_MAX_AGE) chole na
+        _PRIMARY["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            },
+        }
+        _PRIMARY["CONN_MAX_AGE"] = 0
+    else:
+        _PRIMARY["CONN_MAX_AGE"] = int(os.environ.get("DB_CONN_MAX_AGE", 60))
+
+    DATABASES = {'default': _PRIMARY}
+    # DB_REPLICA_HOSTS=replica1:5432,replica2 -> replica1, replica2 alias
+    for _i, _host in enumerate(filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(",")), 1):
+        _name, _, _port = _host.strip().partition(":")
+        DATABASES[f"replica{_i}"] = dict(
+            _PRIMARY, HOST=_name, PORT=_port or _PRIMARY["PORT"], TEST={"MIRROR": "default"},
+        )
+    DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+else:
+    # SQLITE_TUNING = tuned (WAL: reader writer ke atkay na) | off (rollback journal)
+    # journal_mode file e theke jay, tai "off" o explicitly DELETE set kore
+    SQLITE_TUNING = os.environ.get("SQLITE_TUNING", "tuned")
+    _SQLITE_PRAGMAS = {
+        "off": {"journal_mode": "DELETE"},
+        "tuned": {
+            "journal_mode": "WAL",
+            # WAL e NORMAL: power cut e shesh commit harate pare, corrupt hoy na
+            "synchronous": "NORMAL",
+            "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+            # negative = KiB
+            "cache_size": -int(os.environ.get("SQLITE_CACHE_KB", 64 * 1024)),
+            "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+            "temp_store": "MEMORY",
+        },
+    }
+    SQLITE_PRAGMAS = _SQLITE_PRAGMAS[SQLITE_TUNING]
+    SQLITE_PATH = os.environ.get("SQLITE_PATH", BASE_DIR / 'db.sqlite3')
+
+    def _sqlite_init(pragmas):
+        # Django protita notun connection e init_command chalay
+        return ";".join(f"PRAGMA {name} = {value}" for name, value in pragmas.items())
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SQLITE_PATH,
+            'OPTIONS': {
+                # write transaction shurutei write lock ney; deferred BEGIN e
+                # concurrent stock reservation "database is locked" e fail kore
+                # (read lock -> write lock upgrade e SQLite busy-wait kore na)
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': _sqlite_init(SQLITE_PRAGMAS),
+            },
+            # test DB o file e: in-memory shared-cache SQLite e concurrent writer
+            # busy-wait na kore sathe sathe "locked" error dey
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        },
+        # replica stand-in: eki file, alada read-only connection. Routing
+        # local e chalate SQLITE_REPLICA=1
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SQLITE_PATH,
+            'OPTIONS': {
+                'init_command': _sqlite_init({
+                    **{k: v for k, v in SQLITE_PRAGMAS.items() if k != "journal_mode"},
+                    "query_only": "ON",
+                }),
+            },
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+    DATABASE_REPLICAS = ["replica"] if os.environ.get("SQLITE_REPLICA") == "1" else []
+
+# GET read replica te (core/db.py); user er write er por eto sec primary te
+DATABASE_ROUTERS = ["core.db.ReplicaRouter"]
+DATABASE_PIN_SECONDS = 10
+# replica koto sec pichone thakte pare; bump er por eto sec replica read
+# catalog cache e store hoy na
+DATABASE_REPLICA_LAG_SECONDS = 10
+# pin kothay thake; multi-process deploy e shared cache alias dao
+DATABASE_PIN_CACHE = "default"
 
 AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # token claim theke user, request e User query nai
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
 }
 
+# --- Cache ---
+# catalog response cache: locmem (per process) ba file (sob worker share kore).
+# locmem shudhu ek worker e thik; WEB_CONCURRENCY (gunicorn o eta pore) > 1
+# hole catalog.W001 warning.
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "1"))
+CATALOG_CACHE_BACKEND = os.environ.get("CATALOG_CACHE_BACKEND", "locmem")
+
+_CATALOG_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "catalog",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CATALOG_CACHE_DIR", str(BASE_DIR / ".cache" / "catalog")),
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "catalog": _CATALOG_CACHE_BACKENDS[CATALOG_CACHE_BACKEND],
+}
+
+
+# --- Metrics ---
+# /api/metrics/ (staff) Prometheus text; off korle middleware o bad
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+
+# staff `X-Profile: 1` / `?_profile=1` request sampled profile (admin e)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "1") == "1"
+PROFILING_HEADER = "X-Profile"
+PROFILING_QUERY_PARAM = "_profile"
+# always-on background sampling: eto bhag request (0 = off)
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+# stack sample interval (sec)
+PROFILING_INTERVAL = 0.005
+# sob theke notun eto ta RequestProfile rakhi
+PROFILING_KEEP = 500
+
+
+# --- Catalog ---
+# /products/suggest/ er in-memory index koto sec por full rebuild hobe
+# (onno worker process er change dhorar jonno). 0 = kokhono na.
+CATALOG_SUGGEST_TTL = 300
+
+# /home-feed/: protita displayed category te koyta product, snapshot koto sec
+CATALOG_HOME_FEED_PRODUCTS = 8
+CATALOG_HOME_FEED_TTL = 300
+# commit e snapshot rebuild eto sec e ekbar (baki gula porer request e lazy)
+CATALOG_HOME_FEED_DEBOUNCE = 2
+# products/<slug>/images/ upload limit
+CATALOG_IMAGE_MAX_FILES = 20
+CATALOG_IMAGE_MAX_BYTES = 15 * 1024 * 1024
+CATALOG_IMAGE_MIN_SIDE = 100
+CATALOG_IMAGE_MAX_SIDE = 8000
+# reserve/release-stock e ek line er max quantity
+CATALOG_STOCK_MAX_LINE_QUANTITY = 100
+
+
+# --- Password hashing ---
+# PASSWORD_HASHER = scrypt | argon2 (argon2-cffi lage) | pbkdf2
+# Preferred hasher ba cost bodlale purono hash login e upgrade hoy.
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "scrypt")
+PASSWORD_HASHING = {
+    # scrypt N=2^14, r=8, p=1 (Django default): hash protite 16 MiB, 1 core e
+    # ~0.08 s -- purono PBKDF2 1M (~0.6 s) er ~7x kom CPU per login
+    # (bench_hashing). N=2^15/p=3 (~0.4 s) PBKDF2 er soman CPU khay, login/s
+    # bare na. Memory-hard bole GPU guess PBKDF2 er cheye dami.
+    "scrypt": {"work_factor": 2 ** 14, "block_size": 8, "parallelism": 1},
+    "argon2": {"time_cost": 2, "memory_cost": 64 * 1024, "parallelism": 2},
+    "pbkdf2": {"iterations": 1_000_000},
+    # hashing thread pool size, 0 = CPU count
+    "workers": int(os.environ.get("PASSWORD_HASHING_WORKERS", 0)),
+}
+
+_TUNED_HASHERS = {
+    "scrypt": "accounts.hashers.TunedScryptPasswordHasher",
+    "argon2": "accounts.hashers.TunedArgon2PasswordHasher",
+    "pbkdf2": "accounts.hashers.TunedPBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [_TUNED_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _TUNED_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    # purono / Django default hasher er hash: verify hoy, login e upgrade
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
 
 # --- Password validation ---
 AUTH_PASSWORD_VALIDATORS = [
@@ -114,6 +310,26 @@ STATICFILES_DIRS = [
 # user-uploaded files (images, etc.)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# upload nam e content hash (core/storage.py) -> media immutable cache
+STORAGES = {
+    "default": {"BACKEND": "core.storage.HashedMediaStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+MEDIA_HASHED_PREFIXES = ("products/", "product_images/", "profile_pics/")
+# MEDIA_URL Django theke serve (core/media.py); front server nije serve korle False
+MEDIA_SERVE = os.environ.get("MEDIA_SERVE", "1") == "1"
+# python (FileResponse/sendfile) | sendfile (X-Sendfile) | accel (nginx X-Accel-Redirect)
+MEDIA_SERVE_MODE = os.environ.get("MEDIA_SERVE_MODE", "python")
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+MEDIA_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MEDIA_MAX_AGE = 60 * 60
+# purono file background e delete, ek batch e koyta (accounts/files.py)
+FILE_CLEANUP_BATCH = 100
+# upload e resized WebP variant (lomba dik max px), core/images.py
+IMAGE_VARIANTS = {"thumb": 200, "medium": 800}
+IMAGE_VARIANT_QUALITY = 80
+# variant generate pool, 0 = CPU count
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", 0))
 
 # --- Default primary key ---
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -125,4 +341,21 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=180),
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": True,
-}
\ No newline at end of file
+    # blacklist check in-memory set e, notun access e fresh claim
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.CustomTokenRefreshSerializer",
+}
+
+# onno process er logout koto second por por dhora pore
+ACCOUNTS_BLACKLIST_SYNC_SECONDS = 5
+# delta sync e last_id er age eto id abar pori (deri te commit hoya row),
+# ar eto sec por por puro reload
+ACCOUNTS_BLACKLIST_SYNC_OVERLAP = 1000
+ACCOUNTS_BLACKLIST_RELOAD_SECONDS = 600
+# purge_expired_tokens: ek delete e koyta row
+ACCOUNTS_TOKEN_PURGE_CHUNK = 5000
+
+# token er role/is_active claim iat er por koto sec bhorsha, tar por user cache
+ACCOUNTS_CLAIMS_TRUST_SECONDS = 300
+# Claim chara / purono claim er token, puro User lagle: per-process user cache
+ACCOUNTS_USER_CACHE_TTL = 60
+ACCOUNTS_USER_CACHE_SIZE = 1024
\ No newline at end of file
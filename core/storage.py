@@ -0,0 +1,61 @@
+# core/storage.py
+
+"""
+Content-hashed media file name.
+
+    products/napa.jpg -> products/napa.3f2a9c1b0d4e.jpg
+
+MEDIA_HASHED_PREFIXES er niche upload er nam e content er sha256 er
+prothom 12 hex. Ek nam e content kokhono bodlay na, tai media view
+`immutable` cache header dite pare (core/media.py).
+
+Nam e already hash thakle (e.g. napa.3f2a9c1b0d4e.jpg) ba WebP variant
+hole (core/images.py) nam bodlai na -- variant er nam original theke
+ashe, hash dile `variant_urls` khuje pay na (hash chara purono upload e).
+"""
+
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from .images import is_variant_name
+
+HASH_LENGTH = 12
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{%d}(\.|$)" % HASH_LENGTH)
+
+
+def hashed_prefixes():
+    return tuple(getattr(settings, "MEDIA_HASHED_PREFIXES", ()))
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.search(os.path.basename(name)))
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+class HashedMediaStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if (
+            name and name.startswith(hashed_prefixes())
+            and not is_hashed_name(name) and not is_variant_name(name)
+        ):
+            if not hasattr(content, "chunks"):
+                content = File(content, name)
+            root, ext = os.path.splitext(name)
+            # max_length er jonno stem kata lagle get_available_name e hoy
+            name = f"{root}.{content_hash(content)}{ext}"
+        return super().save(name, content, max_length=max_length)
@@ -0,0 +1,169 @@
+from time import sleep
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from catalog import cache as catalog_cache
+from catalog.models import Category
+from catalog.tests import make_product
+
+from . import metrics
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        catalog_cache.get_cache().clear()
+        self.category = Category.objects.create(name="Fever")
+        for i in range(3):
+            make_product(self.category, f"Napa {i}")
+        self.staff = User.objects.create_user("staff", "staff@example.com", "pw", role="staff")
+        self.customer = User.objects.create_user("buyer", "buyer@example.com", "pw")
+
+    def series(self, histogram, route):
+        # [bucket counts..., sum]; test er age o onno test er count thakte pare
+        return list(histogram._series.get((route, "GET"), [0] * (len(histogram.buckets) + 2)))
+
+    def test_records_queries_serializer_time_and_size_per_route(self):
+        before = self.series(metrics.DB_QUERIES, "product-list")
+        before_serializer = self.series(metrics.SERIALIZER_TIME, "product-list")
+        with CaptureQueriesContext(connection) as ctx:
+            response = APIClient().get("/api/catalog/products/?_=metrics")
+        after = self.series(metrics.DB_QUERIES, "product-list")
+
+        self.assertEqual(after[-1] - before[-1], len(ctx.captured_queries))
+        self.assertEqual(sum(after[:-1]) - sum(before[:-1]), 1)
+        self.assertGreater(self.series(metrics.SERIALIZER_TIME, "product-list")[-1], before_serializer[-1])
+        self.assertGreater(len(response.content), 0)
+
+    def test_endpoint_is_staff_only_prometheus_text(self):
+        client = APIClient()
+        client.get("/api/catalog/products/")
+        self.assertEqual(client.get("/api/metrics/").status_code, 401)
+        client.force_authenticate(self.customer)
+        self.assertEqual(client.get("/api/metrics/").status_code, 403)
+
+        client.force_authenticate(self.staff)
+        response = client.get("/api/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn('http_request_duration_seconds_bucket{route="product-list",method="GET",le="+Inf"}', body)
+        self.assertIn('http_requests_total{route="metrics",method="GET",status="403"}', body)
+        self.assertIn('http_response_size_bytes_count{route="product-list",method="GET"}', body)
+
+    def test_admin_session_can_scrape(self):
+        admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin)
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 200)
+
+
+@override_settings(PROFILING_INTERVAL=0.001, PROFILING_SAMPLE_RATE=0)
+class ProfilingTests(TestCase):
+    def setUp(self):
+        catalog_cache.get_cache().clear()
+        self.category = Category.objects.create(name="Fever")
+        for i in range(5):
+            make_product(self.category, f"Napa {i}")
+        self.staff = User.objects.create_user("staff", "staff@example.com", "pw", role="staff")
+        self.customer = User.objects.create_user("buyer", "buyer@example.com", "pw")
+
+    def token_client(self, user):
+        from accounts.tokens import RefreshToken
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        return client
+
+    def test_staff_flag_records_collapsed_stacks(self):
+        from unittest import mock
+        from catalog.views import ProductViewSet
+        from core.models import RequestProfile
+
+        original = ProductViewSet.list
+
+        def slow_list(view, request, *args, **kwargs):
+            # sampler thread tick paoar age request shesh na hoy
+            sleep(0.05)
+            return original(view, request, *args, **kwargs)
+
+        with mock.patch.object(ProductViewSet, "list", slow_list):
+            response = self.token_client(self.staff).get("/api/catalog/products/", HTTP_X_PROFILE="1")
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual((profile.route, profile.trigger, profile.user_id), ("product-list", "flag", self.staff.pk))
+        self.assertGreater(profile.sample_count, 0)
+        lines = profile.stacks.splitlines()
+        self.assertEqual(sum(int(line.rsplit(" ", 1)[1]) for line in lines), profile.sample_count)
+        self.assertTrue(all(";" in line.rsplit(" ", 1)[0] for line in lines))
+
+    async def test_asgi_sync_view_frames_are_sampled(self):
+        from asgiref.sync import sync_to_async
+        from unittest import mock
+        from accounts.tokens import RefreshToken
+        from catalog.views import ProductViewSet
+        from core.models import RequestProfile
+
+        original = ProductViewSet.list
+
+        def slow_list(view, request, *args, **kwargs):
+            sleep(0.05)
+            return original(view, request, *args, **kwargs)
+
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.staff).access_token))()
+        with mock.patch.object(ProductViewSet, "list", slow_list):
+            response = await self.async_client.get(
+                "/api/catalog/products/", headers={"Authorization": f"Bearer {token}", "X-Profile": "1"}
+            )
+        profile = await RequestProfile.objects.aget(pk=response["X-Profile-Id"])
+        # event loop er select na, sync view er thread er stack
+        self.assertIn("APIView.dispatch (rest_framework/views.py:", profile.stacks)
+        self.assertIn("slow_list (core/tests.py:", profile.stacks)
+
+    def test_admin_session_staff_flag(self):
+        from core.models import RequestProfile
+
+        self.client.force_login(self.staff)
+        response = self.client.get("/api/catalog/products/?_profile=1")
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual((profile.trigger, profile.user_id), ("flag", self.staff.pk))
+
+    def test_flag_from_non_staff_is_ignored(self):
+        from core.models import RequestProfile
+
+        response = self.token_client(self.customer).get("/api/catalog/products/?_profile=1")
+        self.assertNotIn("X-Profile-Id", response)
+        APIClient().get("/api/catalog/products/", HTTP_X_PROFILE="1")
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_sample_rate_profiles_anonymous_requests(self):
+        from core.models import RequestProfile
+
+        with override_settings(PROFILING_SAMPLE_RATE=1.0):
+            response = APIClient().get("/api/catalog/products/")
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(RequestProfile.objects.get().trigger, "sample")
+
+    def test_collapse_is_root_to_leaf(self):
+        import sys
+        from core.profiling import collapse
+
+        stack = collapse(sys._getframe()).split(";")
+        self.assertTrue(stack[-1].startswith("ProfilingTests.test_collapse_is_root_to_leaf (core/tests.py:"))
+
+    def test_admin_lists_and_downloads_profile(self):
+        from core.models import RequestProfile
+
+        profile = RequestProfile.objects.create(
+            method="GET", path="/api/catalog/products/", route="product-list", status_code=200,
+            duration_ms=12.5, sample_count=3, trigger="flag", stacks="a;b;c 2\na;d 1",
+        )
+        admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin)
+        listing = self.client.get("/core/requestprofile/")
+        self.assertContains(listing, f"profile-{profile.pk}.folded")
+        response = self.client.get(f"/core/requestprofile/{profile.pk}/collapsed/")
+        self.assertEqual(response.content, b"a;b;c 2\na;d 1\n")
+        self.assertIn("attachment", response["Content-Disposition"])
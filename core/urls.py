@@ -1,14 +1,21 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 
-urlpatterns = [
-    path('', admin.site.urls),
+from .media import serve_media
+from .metrics import MetricsView
+
+# media: content-hash nam e immutable cache, Range, X-Sendfile/X-Accel (core/media.py)
+media_urlpatterns = [
+    re_path(r"^%s(?P<path>.+)$" % re.escape(settings.MEDIA_URL.lstrip("/")), serve_media, name="media"),
+] if settings.MEDIA_SERVE else []
+
+urlpatterns = media_urlpatterns + [
     path('api/accounts/', include('accounts.urls')),  
     path("api/catalog/", include("catalog.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
+    # admin sobar sheshe: er catch-all view age thakle /api/ route gulo dhaka pore
+    path('', admin.site.urls),
 ]
-
-# dev mode: serve media files
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)